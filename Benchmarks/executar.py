@@ -0,0 +1,337 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmarks do Gerenciador de Pinturas
+Mede as funções CRUD, os detalhes, as buscas, as pastas e (com --gui) o
+preenchimento das tabelas da janela principal sobre catálogos sintéticos de
+vários tamanhos, e grava os tempos em JSON para comparar versões
+
+Uso:
+    python -m Benchmarks.executar --tamanhos 1000 10000 --saida resultados.json
+    python -m Benchmarks.executar --tamanhos 1000 --gui --comparar anterior.json
+
+Os catálogos ficam em Benchmarks/catalogos/<tamanho> e são gerados na
+primeira execução (mesma semente = mesmo catálogo entre versões).
+"""
+
+import json
+import os
+import platform
+import random
+import sqlite3 as sql
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from Benchmarks.gerar_catalogo import gerar_catalogo
+
+PASTA_CATALOGOS = Path(__file__).parent / "catalogos"
+
+TAMANHOS_PADRAO = (1000, 10000)
+REPETICOES_PADRAO = 5
+
+
+class _Desfazer(Exception):
+    """Levantada no fim dos casos de escrita para desfazer a transação"""
+
+
+def _medir(funcao, repeticoes, preparar=None):
+    """Tempos (s) de `repeticoes` chamadas, depois de uma chamada de aquecimento"""
+    if preparar:
+        preparar()
+    funcao()
+    tempos = []
+    for _ in range(repeticoes):
+        if preparar:
+            preparar()
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append(time.perf_counter() - inicio)
+    return tempos
+
+
+def _resumo(tempos):
+    ordenados = sorted(tempos)
+    p95 = ordenados[min(int(round(0.95 * (len(ordenados) - 1))), len(ordenados) - 1)]
+    return {
+        "repeticoes": len(tempos),
+        "min_ms": round(ordenados[0] * 1000, 3),
+        "mediana_ms": round(statistics.median(ordenados) * 1000, 3),
+        "media_ms": round(statistics.fmean(ordenados) * 1000, 3),
+        "p95_ms": round(p95 * 1000, 3)
+    }
+
+
+def _preparar_catalogo(tamanho, semente):
+    """Catálogo do tamanho pedido (gerado se ainda não existir)"""
+    pasta = PASTA_CATALOGOS / str(tamanho)
+    if not (pasta / "Data.db").exists():
+        print(f"🏗️ Gerando catálogo de {tamanho} pinturas...")
+        gerar_catalogo(pasta, tamanho, semente, progresso=False)
+    return pasta
+
+
+def _configurar(pasta):
+    """Apontar o pool de conexões e o gerenciador de pastas para o catálogo"""
+    from Funções import gerenciador_pastas as modulo_pastas
+    from Funções.cache_detalhes import cache_detalhes
+    from Funções.conexao import gerenciador_conexoes
+
+    db_path = str(pasta / "Data.db")
+    gerenciador_conexoes.fechar_todas()
+    gerenciador_conexoes.configurar(db_path)
+    modulo_pastas.gerenciador_pastas = modulo_pastas.GerenciadorPastas(pasta / "Bibliotecas")
+    cache_detalhes.limpar()
+    return db_path
+
+
+def _casos(db_path, aleatorio):
+    """(nome, função) de cada caso de leitura"""
+    from Funções import crud_exp, crud_locais, crud_pint, crud_precos, crud_series, gerenciador_pastas, indice_fotos
+    from Funções.cache_detalhes import cache_detalhes
+    from Funções.detalhes_pintura import carregar_detalhes, mostrar_detalhes
+
+    with sql.connect(db_path) as conn:
+        total = conn.execute("SELECT COUNT(*) FROM pinturas").fetchone()[0]
+        palavra = conn.execute("SELECT titulo FROM pinturas WHERE id = 1").fetchone()[0].split()[0]
+        local = conn.execute("SELECT local FROM locais LIMIT 1").fetchone()[0]
+        serie_id = conn.execute("SELECT MIN(id) FROM series").fetchone()[0]
+        local_id = conn.execute("SELECT id FROM locais LIMIT 1").fetchone()[0]
+
+    def qualquer():
+        return aleatorio.randint(1, total)
+
+    def sem_cache(funcao):
+        """Detalhes medidos sem o cache (primeira abertura)"""
+        def executar():
+            cache_detalhes.limpar()
+            return funcao()
+        return executar
+
+    return [
+        ("crud_pint.listar_pinturas", lambda: crud_pint.listar_pinturas(db_path)),
+        ("crud_pint.contar_pinturas", lambda: crud_pint.contar_pinturas(db_path)),
+        ("crud_pint.listar_pinturas_pagina[meio]",
+         lambda: crud_pint.listar_pinturas_pagina(total // 2, 200, db_path=db_path)),
+        ("crud_pint.listar_pinturas_pagina[titulo desc]",
+         lambda: crud_pint.listar_pinturas_pagina(0, 200, 1, True, db_path=db_path)),
+        ("crud_pint.buscar_pintura", lambda: crud_pint.buscar_pintura(qualquer(), db_path)),
+        ("crud_pint.buscar_pinturas[500]",
+         lambda: crud_pint.buscar_pinturas([qualquer() for _ in range(500)], db_path)),
+        ("crud_pint.busca_filtros[titulo]", lambda: crud_pint.busca_filtros(titulo=palavra)),
+        ("crud_pint.busca_filtros[tamanho]", lambda: crud_pint.busca_filtros(tamanho="50x70")),
+        ("crud_pint.busca_avancada[titulo]",
+         lambda: crud_pint.busca_avancada(titulo=palavra, limite=1000, db_path=db_path)),
+        ("crud_pint.busca_avancada[preco]",
+         lambda: crud_pint.busca_avancada(preco_min=5000, preco_max=10000, limite=1000, db_path=db_path)),
+        ("crud_pint.busca_avancada[serie]",
+         lambda: crud_pint.busca_avancada(serie="Série", limite=1000, db_path=db_path)),
+        ("detalhes_pintura.mostrar_detalhes", sem_cache(lambda: mostrar_detalhes(qualquer(), db_path))),
+        ("detalhes_pintura.carregar_detalhes[50]",
+         sem_cache(lambda: carregar_detalhes([qualquer() for _ in range(50)], db_path))),
+        ("crud_series.listar_series", lambda: crud_series.listar_series(db_path)),
+        ("crud_series.listar_series_pagina", lambda: crud_series.listar_series_pagina(0, 200, db_path=db_path)),
+        ("crud_series.buscar_serie", lambda: crud_series.buscar_serie(serie_id, db_path)),
+        ("crud_series.listar_pinturas_da_serie", lambda: crud_series.listar_pinturas_da_serie(serie_id, db_path)),
+        ("crud_exp.listar_exposicoes_pagina", lambda: crud_exp.listar_exposicoes_pagina(0, 200, db_path=db_path)),
+        ("crud_exp.buscar_exposicoes_filtros", lambda: crud_exp.buscar_exposicoes_filtros(nome="Exposição",
+                                                                                          db_path=db_path)),
+        ("crud_precos.buscar_preco_atual", lambda: crud_precos.buscar_preco_atual(qualquer(), db_path)),
+        ("crud_precos.historico_precos", lambda: crud_precos.historico_precos(qualquer(), db_path=db_path)),
+        ("crud_precos.listar_pinturas_por_faixa_preco",
+         lambda: crud_precos.listar_pinturas_por_faixa_preco(5000, 10000, db_path)),
+        ("crud_precos.estatisticas_precos", lambda: crud_precos.estatisticas_precos(qualquer(), db_path)),
+        ("crud_locais.buscar_local_atual", lambda: crud_locais.buscar_local_atual(qualquer(), db_path)),
+        ("crud_locais.historico_localizacao", lambda: crud_locais.historico_localizacao(qualquer(), db_path=db_path)),
+        ("crud_locais.pinturas_por_local[atuais]",
+         lambda: crud_locais.pinturas_por_local(local, apenas_atuais=True, db_path=db_path)),
+        ("crud_locais.listar_todos_locais", lambda: crud_locais.listar_todos_locais(db_path)),
+        ("crud_locais.tempo_no_local", lambda: crud_locais.tempo_no_local(1, local_id, db_path)),
+        ("gerenciador_pastas.obter_pasta_pintura",
+         lambda: gerenciador_pastas.gerenciador_pastas.obter_pasta_pintura(qualquer())),
+        ("gerenciador_pastas.listar_pastas_pinturas",
+         lambda: gerenciador_pastas.gerenciador_pastas.listar_pastas_pinturas()),
+        ("indice_fotos.fotos", lambda: indice_fotos.indice_fotos.fotos(qualquer())),
+    ]
+
+
+def _casos_escrita(db_path, aleatorio):
+    """Casos de escrita: executados dentro de uma transação desfeita ao final"""
+    from Funções import crud_locais, crud_pint, crud_precos, crud_series
+    from Funções.conexao import gerenciador_conexoes
+
+    with sql.connect(db_path) as conn:
+        total = conn.execute("SELECT COUNT(*) FROM pinturas").fetchone()[0]
+        serie_id = conn.execute("SELECT MIN(id) FROM series").fetchone()[0]
+
+    def desfeito(funcao):
+        def executar():
+            try:
+                with gerenciador_conexoes.transacao(db_path):
+                    funcao()
+                    raise _Desfazer()
+            except _Desfazer:
+                pass
+        return executar
+
+    def qualquer():
+        return aleatorio.randint(1, total)
+
+    return [
+        ("crud_pint.atualizar_pintura", desfeito(
+            lambda: crud_pint.atualizar_pintura(qualquer(), "Título", "Óleo sobre tela", "50x70", "2020", "Ateliê"))),
+        ("crud_pint.remover_pinturas[500]", desfeito(
+            lambda: crud_pint.remover_pinturas([qualquer() for _ in range(500)], db_path))),
+        ("crud_precos.adicionar_preco", desfeito(
+            lambda: crud_precos.adicionar_preco(qualquer(), 1234.5, "2025-01-01", db_path=db_path))),
+        ("crud_locais.adicionar_local", desfeito(
+            lambda: crud_locais.adicionar_local(qualquer(), "Galeria Central", "2025-01-01", db_path=db_path))),
+        ("crud_series.associar_pinturas_series[100]", desfeito(
+            lambda: crud_series.associar_pinturas_series([qualquer() for _ in range(100)], [serie_id],
+                                                         db_path=db_path))),
+    ]
+
+
+def _casos_gui(db_path, aleatorio):
+    """Preenchimento das tabelas da janela principal (Qt offscreen)"""
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PyQt5.QtWidgets import QApplication
+
+    import Main
+    from Funções.crud_pint import busca_avancada
+
+    Main.DB_PATH = Path(db_path)
+    app = QApplication.instance() or QApplication([])
+
+    janela = {}
+
+    def criar_janela():
+        janela["atual"] = Main.MainWindow()
+        app.processEvents()
+
+    def recriar_tabela(tabela, preencher):
+        def executar():
+            getattr(janela["atual"], tabela).setModel(None)
+            getattr(janela["atual"], preencher)()
+            app.processEvents()
+        return executar
+
+    resultados_busca = busca_avancada(titulo="Mar", limite=1000, db_path=db_path)
+
+    def preencher_busca():
+        janela["atual"].preencher_tabela(resultados_busca)
+        app.processEvents()
+
+    def selecionar_pintura():
+        tabela = janela["atual"].tableView
+        tabela.selectRow(aleatorio.randrange(min(tabela.model().rowCount(), 200)))
+        app.processEvents()
+
+    def rolar_tabela():
+        tabela = janela["atual"].tableView
+        tabela.scrollToBottom()
+        app.processEvents()
+        tabela.scrollToTop()
+        app.processEvents()
+
+    criar_janela()
+    return [
+        ("MainWindow.__init__", criar_janela),
+        ("MainWindow.tabelar_pinturas", recriar_tabela("tableView", "tabelar_pinturas")),
+        ("MainWindow.tabelar_exposicoes", recriar_tabela("tableView_3", "tabelar_exposicoes")),
+        ("MainWindow.tabelar_series", recriar_tabela("tableView_series", "tabelar_series")),
+        ("MainWindow.preencher_tabela[busca]", preencher_busca),
+        ("MainWindow.on_pintura_selected", selecionar_pintura),
+        ("MainWindow.rolar_tabela", rolar_tabela),
+    ]
+
+
+def _versao_codigo():
+    try:
+        return subprocess.run(["git", "describe", "--always", "--dirty"], capture_output=True, text=True,
+                              cwd=Path(__file__).parent.parent, timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def executar(tamanhos=TAMANHOS_PADRAO, repeticoes=REPETICOES_PADRAO, gui=False, semente=42, filtro=None):
+    """
+    Executar os benchmarks
+
+    Returns:
+        dict pronto para gravar em JSON (ambiente + lista de resultados)
+    """
+    resultados = []
+    for tamanho in tamanhos:
+        pasta = _preparar_catalogo(tamanho, semente)
+        db_path = _configurar(pasta)
+        aleatorio = random.Random(semente)
+
+        grupos = [("leitura", _casos(db_path, aleatorio)), ("escrita", _casos_escrita(db_path, aleatorio))]
+        if gui:
+            grupos.append(("interface", _casos_gui(db_path, aleatorio)))
+
+        for grupo, casos in grupos:
+            for nome, funcao in casos:
+                if filtro and filtro not in nome:
+                    continue
+                try:
+                    resumo = _resumo(_medir(funcao, repeticoes))
+                except Exception as e:
+                    print(f"❌ {nome} ({tamanho}): {e}")
+                    resumo = {"erro": str(e)}
+                resultados.append({"tamanho": tamanho, "grupo": grupo, "caso": nome, **resumo})
+                if "erro" not in resumo:
+                    print(f"⏱️ {tamanho:>8} {nome:<50} mediana {resumo['mediana_ms']:10.3f} ms")
+
+    return {
+        "versao": _versao_codigo(),
+        "data": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "sqlite": sql.sqlite_version,
+        "plataforma": platform.platform(),
+        "semente": semente,
+        "resultados": resultados
+    }
+
+
+def comparar(atual, anterior):
+    """Imprimir a variação da mediana de cada caso em relação a um resultado anterior"""
+    referencia = {(r["tamanho"], r["caso"]): r for r in anterior["resultados"] if "mediana_ms" in r}
+    print(f"\n📊 Comparação com {anterior.get('versao')} ({anterior.get('data')})")
+    for resultado in atual["resultados"]:
+        base = referencia.get((resultado["tamanho"], resultado["caso"]))
+        if not base or "mediana_ms" not in resultado or not base["mediana_ms"]:
+            continue
+        razao = resultado["mediana_ms"] / base["mediana_ms"]
+        marca = "🔺" if razao > 1.2 else "🔻" if razao < 0.8 else "  "
+        print(f"{marca} {resultado['tamanho']:>8} {resultado['caso']:<50} "
+              f"{base['mediana_ms']:10.3f} -> {resultado['mediana_ms']:10.3f} ms ({razao:.2f}x)")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Benchmarks do Gerenciador de Pinturas")
+    parser.add_argument("--tamanhos", type=int, nargs="+", default=list(TAMANHOS_PADRAO),
+                        help="quantidades de pinturas (ex.: 1000 10000 100000 1000000)")
+    parser.add_argument("--repeticoes", type=int, default=REPETICOES_PADRAO)
+    parser.add_argument("--gui", action="store_true", help="medir também a janela principal (Qt offscreen)")
+    parser.add_argument("--filtro", help="executar só os casos cujo nome contém este texto")
+    parser.add_argument("--semente", type=int, default=42)
+    parser.add_argument("--saida", help="arquivo JSON com os resultados")
+    parser.add_argument("--comparar", help="JSON de uma execução anterior para comparar")
+    args = parser.parse_args()
+
+    resultado = executar(args.tamanhos, args.repeticoes, args.gui, args.semente, args.filtro)
+    if args.saida:
+        with open(args.saida, "w", encoding="utf-8") as arquivo:
+            json.dump(resultado, arquivo, indent=2, ensure_ascii=False)
+        print(f"💾 Resultados gravados em {args.saida}")
+    if args.comparar:
+        with open(args.comparar, encoding="utf-8") as arquivo:
+            comparar(resultado, json.load(arquivo))
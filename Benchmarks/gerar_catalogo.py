@@ -0,0 +1,204 @@
+# -*- coding: utf-8 -*-
+"""
+Gerador de Catálogo Sintético
+Cria um Data.db (esquema das migrações) e uma árvore Bibliotecas com N
+pinturas, histórico de preços e locais, séries, exposições e fotos, com
+distribuições parecidas com as de um acervo real, para os benchmarks
+
+Uso:
+    python -m Benchmarks.gerar_catalogo 10000 Benchmarks/catalogos/10000
+    python -m Benchmarks.gerar_catalogo 1000000 destino --fotos registros
+"""
+
+import random
+import sqlite3 as sql
+import sys
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from Funções.migracoes import aplicar_migracoes
+
+# Linhas inseridas por executemany
+LOTE = 10000
+
+# Acima deste tamanho as fotos viram só registros no banco (sem arquivos)
+LIMITE_ARQUIVOS_FOTOS = 20000
+
+PALAVRAS = (
+    "Mar", "Rio", "Céu", "Azul", "Noite", "Jardim", "Retrato", "Casa", "Janela", "Luz",
+    "Sombra", "Outono", "Cidade", "Porto", "Flores", "Montanha", "Silêncio", "Figura",
+    "Estudo", "Paisagem", "Vermelho", "Dourado", "Manhã", "Chuva", "Ponte", "Barco",
+    "Menina", "Campo", "Horizonte", "Memória", "Vento", "Areia", "Bosque", "Lago"
+)
+TECNICAS = (
+    ("Óleo sobre tela", 40), ("Acrílica sobre tela", 25), ("Aquarela", 15),
+    ("Técnica mista", 8), ("Guache", 5), ("Pastel", 4), ("Óleo sobre madeira", 3)
+)
+TAMANHOS = ("30x40", "40x50", "50x70", "60x80", "70x100", "80x120", "100x150", "20x30")
+LOCAIS = (
+    "Ateliê", "Reserva Técnica", "Galeria Central", "Coleção Particular", "Museu de Arte",
+    "Depósito", "Galeria Norte", "Centro Cultural", "Leilão", "Restauração"
+)
+
+INICIO_ACERVO = date(1985, 1, 1)
+FIM_ACERVO = date(2025, 12, 31)
+
+
+def _escolher_tecnica(aleatorio):
+    return aleatorio.choices([t for t, _ in TECNICAS], weights=[p for _, p in TECNICAS])[0]
+
+
+def _data_aleatoria(aleatorio, inicio=INICIO_ACERVO, fim=FIM_ACERVO):
+    return inicio + timedelta(days=aleatorio.randrange(max((fim - inicio).days, 1)))
+
+
+def _quantidade_fotos(aleatorio):
+    """Fotos por obra: muitas com 1-3, algumas sem foto, cauda longa até 20"""
+    sorteio = aleatorio.random()
+    if sorteio < 0.15:
+        return 0
+    if sorteio < 0.85:
+        return aleatorio.randint(1, 3)
+    return min(int(aleatorio.paretovariate(1.5)) + 3, 20)
+
+
+def gerar_catalogo(destino, n_pinturas, semente=42, fotos=None, progresso=True):
+    """
+    Gerar catálogo sintético em `destino` (Data.db e Bibliotecas/)
+
+    Args:
+        n_pinturas: quantidade de pinturas
+        semente: semente do gerador (mesma semente = mesmo catálogo)
+        fotos: "arquivos" (cria os arquivos), "registros" (só a tabela fotos)
+               ou "nenhuma"; padrão: arquivos até LIMITE_ARQUIVOS_FOTOS pinturas
+
+    Returns:
+        dict com as quantidades geradas de cada tabela
+    """
+    destino = Path(destino)
+    destino.mkdir(parents=True, exist_ok=True)
+    db_path = destino / "Data.db"
+    if db_path.exists():
+        db_path.unlink()
+    if fotos is None:
+        fotos = "arquivos" if n_pinturas <= LIMITE_ARQUIVOS_FOTOS else "registros"
+
+    aleatorio = random.Random(semente)
+    inicio = time.perf_counter()
+    conn = sql.connect(str(db_path))
+    aplicar_migracoes(conn)
+    # Geração descartável: sem journal e sem fsync
+    conn.execute("PRAGMA journal_mode = OFF")
+    conn.execute("PRAGMA synchronous = OFF")
+
+    n_series = max(n_pinturas // 50, 1)
+    n_exposicoes = max(n_pinturas // 20, 1)
+    conn.executemany(
+        "INSERT INTO series (id, nome, descricao, data_inicio, data_fim) VALUES (?, ?, ?, ?, ?)",
+        [(i, f"Série {aleatorio.choice(PALAVRAS)} {i}", "Série sintética",
+          str(1985 + i % 35), str(1987 + i % 35)) for i in range(1, n_series + 1)]
+    )
+    conn.executemany(
+        "INSERT INTO exposicoes (id, nome, tema, tipo, artistas, data, local, curadoria, organizador, periodo)"
+        " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        [(i, f"Exposição {aleatorio.choice(PALAVRAS)} {i}", aleatorio.choice(PALAVRAS),
+          aleatorio.choice(("Individual", "Coletiva")), "Artista", _data_aleatoria(aleatorio).isoformat(),
+          aleatorio.choice(LOCAIS), "Curadoria", "Organização", None) for i in range(1, n_exposicoes + 1)]
+    )
+
+    pasta_pinturas = destino / "Bibliotecas" / "Pinturas"
+    (destino / "Bibliotecas" / "Exposições").mkdir(parents=True, exist_ok=True)
+    pasta_pinturas.mkdir(parents=True, exist_ok=True)
+
+    totais = {"pinturas": n_pinturas, "series": n_series, "exposicoes": n_exposicoes,
+              "precos": 0, "locais": 0, "pintura_serie": 0, "pintura_exposicao": 0, "fotos": 0}
+
+    for primeiro in range(1, n_pinturas + 1, LOTE):
+        pinturas, precos, locais, series, exposicoes, lista_fotos = [], [], [], [], [], []
+
+        for pintura_id in range(primeiro, min(primeiro + LOTE, n_pinturas + 1)):
+            titulo = " ".join(aleatorio.sample(PALAVRAS, aleatorio.randint(1, 3)))
+            criada = _data_aleatoria(aleatorio)
+            pinturas.append((pintura_id, titulo, _escolher_tecnica(aleatorio), aleatorio.choice(TAMANHOS),
+                             str(criada.year), aleatorio.choice(LOCAIS)))
+
+            # Preços: 0 a ~8 avaliações, valorização com ruído (passeio lognormal)
+            preco = round(aleatorio.lognormvariate(8.5, 1.0), 2)
+            data_preco = criada
+            for _ in range(min(int(aleatorio.expovariate(0.5)), 8)):
+                data_preco = _data_aleatoria(aleatorio, data_preco, min(data_preco + timedelta(days=1500), FIM_ACERVO))
+                precos.append((pintura_id, preco, data_preco.isoformat(), None))
+                preco = round(preco * aleatorio.lognormvariate(0.05, 0.15), 2)
+
+            # Locais: períodos em sequência, o último em aberto
+            entrada = criada
+            quantidade = aleatorio.randint(1, 5)
+            for indice in range(quantidade):
+                saida = None
+                if indice < quantidade - 1:
+                    saida = _data_aleatoria(aleatorio, entrada, min(entrada + timedelta(days=2000), FIM_ACERVO))
+                locais.append((pintura_id, aleatorio.choice(LOCAIS), entrada.isoformat(),
+                               saida.isoformat() if saida else None, None))
+                entrada = saida or entrada
+
+            if aleatorio.random() < 0.6:
+                series.append((pintura_id, aleatorio.randint(1, n_series)))
+            for exposicao_id in set(aleatorio.randint(1, n_exposicoes)
+                                    for _ in range(min(int(aleatorio.expovariate(0.8)), 4))):
+                exposicoes.append((pintura_id, exposicao_id))
+
+            n_fotos = _quantidade_fotos(aleatorio) if fotos != "nenhuma" else 0
+            if n_fotos:
+                pasta_fotos = pasta_pinturas / f"{pintura_id:04d}_{titulo.replace(' ', '_')}" / "Fotos"
+                if fotos == "arquivos":
+                    pasta_fotos.mkdir(parents=True, exist_ok=True)
+                for numero in range(n_fotos):
+                    caminho = pasta_fotos / f"foto_{numero + 1}.jpg"
+                    if fotos == "arquivos":
+                        # Conteúdo pequeno e distinto (o tamanho não importa para os tempos medidos)
+                        caminho.write_bytes(f"{pintura_id}:{numero}".encode("ascii"))
+                    lista_fotos.append((pintura_id, str(caminho), None))
+
+        conn.executemany("INSERT INTO pinturas (id, titulo, tecnica, tamanho, data, local) VALUES (?, ?, ?, ?, ?, ?)",
+                         pinturas)
+        conn.executemany("INSERT INTO precos (pintura_id, preco, data, observacoes) VALUES (?, ?, ?, ?)", precos)
+        conn.executemany("INSERT INTO locais (pintura_id, local, data_entrada, data_saida, observacoes)"
+                         " VALUES (?, ?, ?, ?, ?)", locais)
+        conn.executemany("INSERT OR IGNORE INTO pintura_serie (pintura_id, serie_id) VALUES (?, ?)", series)
+        conn.executemany("INSERT OR IGNORE INTO pintura_exposicao (pintura_id, exposicao_id) VALUES (?, ?)",
+                         exposicoes)
+        conn.executemany("INSERT INTO fotos (pintura_id, caminho, descricao) VALUES (?, ?, ?)", lista_fotos)
+        conn.commit()
+
+        totais["precos"] += len(precos)
+        totais["locais"] += len(locais)
+        totais["pintura_serie"] += len(series)
+        totais["pintura_exposicao"] += len(exposicoes)
+        totais["fotos"] += len(lista_fotos)
+        if progresso:
+            print(f"🏗️ {min(primeiro + LOTE - 1, n_pinturas)}/{n_pinturas} pinturas geradas")
+
+    conn.execute("ANALYZE")
+    conn.commit()
+    conn.close()
+
+    totais["segundos"] = round(time.perf_counter() - inicio, 1)
+    if progresso:
+        print(f"✅ Catálogo sintético em {destino}: {totais}")
+    return totais
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Gerar catálogo sintético para os benchmarks")
+    parser.add_argument("pinturas", type=int, help="quantidade de pinturas")
+    parser.add_argument("destino", help="pasta onde criar Data.db e Bibliotecas/")
+    parser.add_argument("--semente", type=int, default=42)
+    parser.add_argument("--fotos", choices=["arquivos", "registros", "nenhuma"])
+    args = parser.parse_args()
+
+    gerar_catalogo(args.destino, args.pinturas, args.semente, args.fotos)
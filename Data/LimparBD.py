@@ -5,6 +5,12 @@ Remove tabelas antigas e mantém apenas a estrutura padronizada
 """
 
 import sqlite3
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from Funções.migracoes import aplicar_migracoes
 
 def limpar_base_dados():
     """Limpar tabelas duplicadas e manter estrutura consistente"""
@@ -42,9 +48,10 @@ def limpar_base_dados():
         # 2. Remover tabelas duplicadas/antigas
         print("\n🗑️ Removendo tabelas duplicadas...")
         
+        # Nomes de tabelas no SQLite não diferenciam maiúsculas: "Pintura_serie"
+        # seria a própria pintura_serie e não pode estar nesta lista
         tabelas_para_remover = [
             '"Série"',
-            '"Pintura_serie"', 
             '"Local_armazenado"',
             '"Pintura_Locais"',
             '"Pintura_preço"',
@@ -55,61 +62,20 @@ def limpar_base_dados():
         
         for tabela in tabelas_para_remover:
             try:
+                # Só a tabela antiga com este nome exato, nunca uma atual com outra grafia
+                cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?",
+                               (tabela.strip('"'),))
+                if cursor.fetchone() is None:
+                    continue
                 cursor.execute(f"DROP TABLE IF EXISTS {tabela}")
                 print(f"   ✅ Removida: {tabela}")
             except Exception as e:
                 print(f"   ⚠️ Erro ao remover {tabela}: {e}")
         
-        # 3. Criar tabelas de relacionamento necessárias
-        print("\n🔗 Criando tabelas de relacionamento...")
-        
-        # Tabela pintura_serie (padronizada)
-        cursor.execute("""
-        CREATE TABLE IF NOT EXISTS pintura_serie (
-            pintura_id INTEGER,
-            serie_id INTEGER,
-            PRIMARY KEY (pintura_id, serie_id),
-            FOREIGN KEY (pintura_id) REFERENCES pinturas(id),
-            FOREIGN KEY (serie_id) REFERENCES series(id)
-        )
-        """)
-        print("   ✅ pintura_serie criada")
-        
-        # Tabela pintura_exposicao (sem acento)
-        cursor.execute("""
-        CREATE TABLE IF NOT EXISTS pintura_exposicao (
-            pintura_id INTEGER,
-            exposicao_id INTEGER,
-            PRIMARY KEY (pintura_id, exposicao_id),
-            FOREIGN KEY (pintura_id) REFERENCES pinturas(id),
-            FOREIGN KEY (exposicao_id) REFERENCES exposicoes(id)
-        )
-        """)
-        print("   ✅ pintura_exposicao criada")
-        
-        # Tabela exposicoes (padronizada)
-        cursor.execute("""
-        CREATE TABLE IF NOT EXISTS exposicoes (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            nome TEXT NOT NULL,
-            tema TEXT,
-            tipo TEXT,
-            artistas TEXT,
-            data TEXT,
-            local TEXT,
-            curadoria TEXT,
-            organizador TEXT,
-            periodo TEXT
-        )
-        """)
-        print("   ✅ exposicoes criada")
-        
-        # Renomear tabela precos se necessário
-        try:
-            cursor.execute("ALTER TABLE precos RENAME COLUMN valor TO preco")
-            print("   ✅ Coluna 'valor' renomeada para 'preco'")
-        except:
-            pass  # Coluna já pode ter o nome correto
+        # 3. Criar/ajustar tabelas pelo esquema canônico (migrações versionadas)
+        print("\n🔗 Aplicando migrações do esquema...")
+        versao = aplicar_migracoes(conn)
+        print(f"   ✅ Esquema na versão {versao}")
             
         # 4. Commit das mudanças
         conn.commit()
@@ -0,0 +1,314 @@
+# -*- coding: utf-8 -*-
+"""
+Módulo de Análise de Preços
+Análise do acervo inteiro a partir do histórico da tabela precos, carregado
+de uma só vez em arrays NumPy (valorização, CAGR, medianas móveis e
+avaliação do acervo em qualquer data)
+"""
+
+import threading
+
+try:
+    import numpy as np
+except ImportError:
+    # NumPy é opcional: só este módulo depende dele
+    np = None
+
+from .conexao import gerenciador_conexoes
+
+# Dias por ano usados no CAGR
+DIAS_POR_ANO = 365.25
+
+# Histórico inteiro, com a data normalizada para AAAA-MM-DD
+# (aceita AAAA, AAAA-MM, AAAA-MM-DD... e DD/MM/AAAA)
+QUERY_HISTORICO = """
+SELECT pr.pintura_id,
+       CASE
+           WHEN length(pr.data) = 4 THEN pr.data || '-01-01'
+           WHEN length(pr.data) = 7 THEN pr.data || '-01'
+           WHEN substr(pr.data, 3, 1) = '/' THEN
+               substr(pr.data, 7, 4) || '-' || substr(pr.data, 4, 2) || '-' || substr(pr.data, 1, 2)
+           ELSE substr(pr.data, 1, 10)
+       END AS data,
+       pr.preco,
+       p.tecnica
+FROM precos pr
+JOIN pinturas p ON p.id = pr.pintura_id
+WHERE pr.preco IS NOT NULL AND pr.data IS NOT NULL
+ORDER BY pr.pintura_id, data, pr.id
+"""
+
+# Último histórico carregado por banco: {arquivo: (versao_dados, HistoricoPrecos)}
+# (a marca do pool vale entre conexões de threads diferentes)
+_historicos = {}
+_lock = threading.Lock()
+
+
+def _exigir_numpy():
+    if np is None:
+        raise ImportError("A análise de preços precisa do NumPy (pip install numpy)")
+
+
+def _converter_datas(textos):
+    """Converter datas AAAA-MM-DD em datetime64[D] (inválidas viram NaT)"""
+    try:
+        return np.array(textos, dtype="datetime64[D]")
+    except ValueError:
+        datas = np.empty(len(textos), dtype="datetime64[D]")
+        for i, texto in enumerate(textos):
+            try:
+                datas[i] = np.datetime64(texto, "D")
+            except ValueError:
+                datas[i] = np.datetime64("NaT")
+        return datas
+
+
+def _como_data(data):
+    """Aceitar str, date/datetime ou datetime64 (uma data ou uma lista)"""
+    if isinstance(data, (list, tuple, np.ndarray)):
+        return np.array([np.datetime64(str(d)[:10], "D") for d in data], dtype="datetime64[D]")
+    return np.datetime64(str(data)[:10], "D")
+
+
+class HistoricoPrecos:
+    """
+    Histórico de preços em colunas, ordenado por (pintura, data)
+
+        pinturas        ids das pinturas com preço (ordem crescente)
+        grupo           posição de cada registro em `pinturas`
+        datas, precos   colunas do histórico
+        inicio, fim     fatia [inicio, fim) dos registros de cada pintura
+    """
+
+    def __init__(self, pintura_ids, datas, precos, tecnicas, series):
+        validos = ~np.isnat(datas)
+        pintura_ids, datas, precos = pintura_ids[validos], datas[validos], precos[validos]
+        tecnicas = [t for t, v in zip(tecnicas, validos) if v]
+
+        self.pinturas, self.inicio, self.grupo = np.unique(pintura_ids, return_index=True, return_inverse=True)
+        # Sem preços, np.append deixaria um fim [0] sem início correspondente
+        self.fim = np.append(self.inicio[1:], len(pintura_ids)) if len(self.inicio) else self.inicio.copy()
+        self.datas = datas
+        self.precos = precos
+        self.dias = datas.astype("int64")
+        self.tecnicas = [tecnicas[i] or "" for i in self.inicio]
+        self.series = series  # {serie: array de ids de pinturas}
+
+        # Chave (pintura, dia) crescente: permite searchsorted em todas as pinturas de uma vez
+        self._deslocamento = int(self.dias.max() - self.dias.min() + 2) if len(self.dias) else 1
+        self._base = int(self.dias.min()) - 1 if len(self.dias) else 0
+        self._chave = self.grupo * self._deslocamento + (self.dias - self._base)
+
+    def __len__(self):
+        return len(self.precos)
+
+    # ---- Valorização ----
+
+    def valorizacao(self):
+        """
+        Valorização de cada pintura entre o primeiro e o último preço
+
+        Returns:
+            dict de arrays alinhados com `pintura_id`: preco_inicial, preco_final,
+            data_inicial, data_final, anos, valorizacao (fração) e cagr
+        """
+        ultimo = self.fim - 1
+        inicial, final = self.precos[self.inicio], self.precos[ultimo]
+        anos = (self.dias[ultimo] - self.dias[self.inicio]) / DIAS_POR_ANO
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            razao = np.where(inicial > 0, final / inicial, np.nan)
+            cagr = np.where(anos > 0, np.power(razao, 1.0 / np.where(anos > 0, anos, 1.0)) - 1.0, np.nan)
+
+        return {
+            "pintura_id": self.pinturas,
+            "preco_inicial": inicial,
+            "preco_final": final,
+            "data_inicial": self.datas[self.inicio],
+            "data_final": self.datas[ultimo],
+            "anos": anos,
+            "valorizacao": razao - 1.0,
+            "cagr": cagr
+        }
+
+    def valorizacao_por_grupo(self, grupos):
+        """
+        Valorização agregada de grupos de pinturas
+
+        Cada grupo é tratado como uma carteira: soma dos preços finais sobre a
+        soma dos iniciais, e o CAGR usa o tempo médio de posse ponderado pelo
+        preço inicial.
+
+        Args:
+            grupos: {nome: lista/array de ids de pinturas}
+        """
+        base = self.valorizacao()
+        resultado = {}
+        for nome, ids in grupos.items():
+            # Pinturas do grupo que têm preço
+            posicoes = np.intersect1d(self.pinturas, np.asarray(ids, dtype="int64"), return_indices=True)[1]
+            if len(posicoes) == 0:
+                continue
+
+            inicial = base["preco_inicial"][posicoes].sum()
+            final = base["preco_final"][posicoes].sum()
+            anos = np.average(base["anos"][posicoes], weights=base["preco_inicial"][posicoes]) \
+                if inicial > 0 else 0.0
+            razao = final / inicial if inicial > 0 else np.nan
+            resultado[nome] = {
+                "pinturas": int(len(posicoes)),
+                "preco_inicial": float(inicial),
+                "preco_final": float(final),
+                "valorizacao": float(razao - 1.0),
+                "cagr": float(razao ** (1.0 / anos) - 1.0) if anos > 0 and inicial > 0 else float("nan")
+            }
+        return resultado
+
+    def valorizacao_por_tecnica(self):
+        """Valorização agregada por técnica"""
+        tecnicas = np.array(self.tecnicas, dtype=object)
+        grupos = {t: self.pinturas[tecnicas == t] for t in sorted(set(self.tecnicas))}
+        return self.valorizacao_por_grupo(grupos)
+
+    def valorizacao_por_serie(self):
+        """Valorização agregada por série"""
+        return self.valorizacao_por_grupo(self.series)
+
+    # ---- Medianas móveis ----
+
+    def medianas_moveis(self, janela=3):
+        """
+        Mediana dos últimos `janela` preços de cada registro (sem misturar pinturas)
+
+        Returns:
+            array alinhado com `precos` (os primeiros registros de cada pintura
+            usam a janela parcial disponível)
+        """
+        janela = max(int(janela), 1)
+        indices = np.arange(len(self.precos))[:, None] - np.arange(janela)[None, :]
+        fora = indices < self.inicio[self.grupo][:, None]
+        valores = self.precos[np.clip(indices, 0, None)]
+        valores = np.where(fora, np.nan, valores)
+        return np.nanmedian(valores, axis=1)
+
+    # ---- Avaliação em datas ----
+
+    def valores_em(self, datas):
+        """
+        Preço vigente de cada pintura em cada data (último preço até a data)
+
+        Returns:
+            matriz (pinturas × datas), NaN onde a pintura ainda não tinha preço
+        """
+        dias = np.atleast_1d(_como_data(datas)).astype("int64") - self._base
+        dias = np.clip(dias, 0, self._deslocamento - 1)
+        alvos = np.arange(len(self.pinturas))[:, None] * self._deslocamento + dias[None, :]
+
+        posicoes = np.searchsorted(self._chave, alvos, side="right") - 1
+        validos = posicoes >= self.inicio[:, None]
+        return np.where(validos, self.precos[np.clip(posicoes, 0, None)], np.nan)
+
+    def avaliar(self, datas):
+        """Valor total do acervo em cada data (soma dos preços vigentes)"""
+        return np.nansum(self.valores_em(datas), axis=0)
+
+
+def carregar_historico(db_path=None):
+    """
+    Histórico de preços em colunas (memoizado até o banco mudar)
+
+    A memória é conferida com Conexao.versao_dados(), que avança a cada
+    commit feito por qualquer conexão do pool (de qualquer thread).
+
+    Returns:
+        HistoricoPrecos
+    """
+    _exigir_numpy()
+
+    with gerenciador_conexoes.conexao(db_path) as conn:
+        arquivo = conn.execute("PRAGMA database_list").fetchone()[2]
+        versao = conn.versao_dados()
+        with _lock:
+            memorizado = _historicos.get(arquivo)
+        if memorizado and memorizado[0] == versao:
+            return memorizado[1]
+
+        cursor = conn.cursor()
+        cursor.execute(QUERY_HISTORICO)
+        linhas = cursor.fetchall()
+
+        cursor.execute("SELECT serie_id, pintura_id FROM pintura_serie ORDER BY serie_id")
+        associacoes = cursor.fetchall()
+        cursor.execute("SELECT id, nome FROM series")
+        nomes_series = dict(cursor.fetchall())
+
+    if linhas:
+        pintura_ids, datas, precos, tecnicas = zip(*linhas)
+    else:
+        pintura_ids, datas, precos, tecnicas = (), (), (), ()
+
+    series = {}
+    for serie_id, pintura_id in associacoes:
+        series.setdefault(nomes_series.get(serie_id, serie_id), []).append(pintura_id)
+
+    historico = HistoricoPrecos(
+        np.array(pintura_ids, dtype="int64"),
+        _converter_datas(list(datas)),
+        np.array(precos, dtype="float64"),
+        list(tecnicas),
+        {nome: np.array(ids, dtype="int64") for nome, ids in series.items()}
+    )
+
+    with _lock:
+        _historicos[arquivo] = (versao, historico)
+    return historico
+
+
+def limpar_memoria():
+    """Descartar históricos memorizados"""
+    with _lock:
+        _historicos.clear()
+
+
+def valorizacao_pinturas(db_path=None):
+    """Valorização e CAGR de cada pintura (colunas alinhadas com 'pintura_id')"""
+    return carregar_historico(db_path).valorizacao()
+
+
+def valorizacao_por_serie(db_path=None):
+    """Valorização e CAGR agregados por série"""
+    return carregar_historico(db_path).valorizacao_por_serie()
+
+
+def valorizacao_por_tecnica(db_path=None):
+    """Valorização e CAGR agregados por técnica"""
+    return carregar_historico(db_path).valorizacao_por_tecnica()
+
+
+def medianas_moveis(janela=3, db_path=None):
+    """Mediana móvel dos preços de cada pintura"""
+    historico = carregar_historico(db_path)
+    return {
+        "pintura_id": historico.pinturas[historico.grupo],
+        "data": historico.datas,
+        "preco": historico.precos,
+        "mediana": historico.medianas_moveis(janela)
+    }
+
+
+def avaliar_acervo(datas, db_path=None):
+    """
+    Avaliação do acervo em uma ou mais datas
+
+    Returns:
+        dict: pintura_id, datas, valores (pinturas × datas) e total por data
+    """
+    historico = carregar_historico(db_path)
+    datas = np.atleast_1d(_como_data(datas))
+    valores = historico.valores_em(datas)
+    return {
+        "pintura_id": historico.pinturas,
+        "datas": datas,
+        "valores": valores,
+        "total": np.nansum(valores, axis=0)
+    }
@@ -0,0 +1,284 @@
+# -*- coding: utf-8 -*-
+"""
+Módulo de Armazenamento de Fotos
+Guarda cada imagem uma única vez em <biblioteca>/Objetos, pelo hash do
+conteúdo, e coloca na pasta Fotos de cada pintura um reflink para ela: a
+mesma imagem anexada a várias obras não ocupa espaço nem tempo de cópia de
+novo. Sem reflink (NTFS, ext4...) não há como economizar: cada pasta precisa
+da própria cópia (nunca um hardlink, que faria a edição da foto de uma obra
+alterar a de todas as outras), então o armazém avisa e não mantém Objetos.
+
+Opcional: só é usado com "photo_store_enabled" ligado na configuração
+(desligado por padrão, as fotos são copiadas para a pasta da pintura).
+"""
+
+import hashlib
+import os
+import shutil
+import tempfile
+import threading
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:
+    # Windows: sem reflink, usa cópia comum
+    fcntl = None
+
+# ioctl FICLONE do Linux (Btrfs, XFS...): cópia instantânea que só duplica blocos alterados
+FICLONE = 0x40049409
+
+# Bloco de leitura para o hash
+BLOCO_HASH = 1024 * 1024
+
+PASTA_OBJETOS = "Objetos"
+
+
+def hash_arquivo(caminho):
+    """SHA-256 do conteúdo do arquivo, lido em blocos"""
+    resumo = hashlib.sha256()
+    with open(caminho, "rb") as arquivo:
+        for bloco in iter(lambda: arquivo.read(BLOCO_HASH), b""):
+            resumo.update(bloco)
+    return resumo.hexdigest()
+
+
+def _nome_livre(pasta, nome_arquivo):
+    """Caminho em `pasta` que ainda não existe (nome, nome_1, nome_2...)"""
+    destino = os.path.join(pasta, nome_arquivo)
+    nome_base, extensao = os.path.splitext(nome_arquivo)
+    contador = 1
+    while os.path.exists(destino):
+        destino = os.path.join(pasta, f"{nome_base}_{contador}{extensao}")
+        contador += 1
+    return destino
+
+
+def _clonar(origem, destino):
+    """
+    Criar `destino` com o conteúdo de `origem` sem copiar os dados quando possível
+
+    O reflink tem os próprios blocos depois de alterado; um hardlink seria o
+    mesmo arquivo em todas as pastas, por isso a alternativa é a cópia.
+
+    Returns:
+        str: "reflink" ou "copia"
+    """
+    if fcntl is not None:
+        try:
+            with open(origem, "rb") as entrada, open(destino, "xb") as saida:
+                fcntl.ioctl(saida.fileno(), FICLONE, entrada.fileno())
+            return "reflink"
+        except OSError:
+            # Sistema de arquivos sem reflink
+            if os.path.exists(destino):
+                os.remove(destino)
+
+    shutil.copy2(origem, destino)
+    return "copia"
+
+
+def _testar_reflink(pasta):
+    """Tentar um reflink entre dois arquivos temporários em `pasta`"""
+    if fcntl is None:
+        return False
+    os.makedirs(pasta, exist_ok=True)
+    descritor, origem = tempfile.mkstemp(dir=pasta, suffix=".tmp")
+    destino = origem + ".reflink"
+    try:
+        with os.fdopen(descritor, "wb") as arquivo:
+            arquivo.write(b"reflink")
+        return _clonar(origem, destino) == "reflink"
+    finally:
+        for caminho in (origem, destino):
+            if os.path.exists(caminho):
+                os.remove(caminho)
+
+
+class ArmazemFotos:
+    """Objetos endereçados por conteúdo dentro da biblioteca"""
+
+    def __init__(self, pasta_base=None):
+        """Inicializar armazém (padrão: biblioteca do gerenciador de pastas)"""
+        self._pasta_base = Path(pasta_base) if pasta_base is not None else None
+        self._lock = threading.Lock()
+        self._locks_objetos = {}  # hash -> lock da cópia em andamento
+        self._reflink = {}  # st_dev -> sistema de arquivos aceita reflink
+        self._avisado = False
+        self.objetos_novos = 0
+        self.duplicados = 0
+
+    @property
+    def pasta_base(self):
+        if self._pasta_base is None:
+            from .gerenciador_pastas import gerenciador_pastas
+            return Path(gerenciador_pastas.pasta_base)
+        return self._pasta_base
+
+    @property
+    def pasta_objetos(self):
+        return self.pasta_base / PASTA_OBJETOS
+
+    @property
+    def ativo(self):
+        """Armazenamento por conteúdo ligado na configuração (desligado por padrão)"""
+        try:
+            from config import config_manager
+            return config_manager.get("photo_store_enabled", False)
+        except ImportError:
+            return False
+
+    def economiza_espaco(self, pasta_destino=None):
+        """
+        Reflink disponível entre o armazém e `pasta_destino`
+
+        Testado uma vez por sistema de arquivos; sem reflink o armazém só
+        duplicaria os dados e as fotos seguem pela cópia comum.
+        """
+        pasta_base = self.pasta_base
+        pasta_base.mkdir(parents=True, exist_ok=True)
+        dispositivo = os.stat(pasta_base).st_dev
+        if pasta_destino is not None:
+            os.makedirs(pasta_destino, exist_ok=True)
+            if os.stat(pasta_destino).st_dev != dispositivo:
+                return False
+
+        with self._lock:
+            suporta = self._reflink.get(dispositivo)
+        if suporta is None:
+            try:
+                suporta = _testar_reflink(pasta_base)
+            except OSError:
+                suporta = False
+            with self._lock:
+                self._reflink[dispositivo] = suporta
+        return suporta
+
+    def _avisar_sem_reflink(self):
+        with self._lock:
+            if self._avisado:
+                return
+            self._avisado = True
+        print("⚠️ Armazém de fotos sem efeito: o sistema de arquivos não tem reflink, "
+              "as fotos são copiadas normalmente")
+
+    def caminho_objeto(self, resumo, extensao=""):
+        return self.pasta_objetos / resumo[:2] / f"{resumo}{extensao.lower()}"
+
+    def guardar(self, origem, resumo=None):
+        """
+        Guardar o conteúdo de `origem` no armazém (se ainda não estiver lá)
+
+        Returns:
+            (hash, caminho do objeto, True se o objeto foi criado agora)
+        """
+        resumo = resumo or hash_arquivo(origem)
+        objeto = self.caminho_objeto(resumo, os.path.splitext(str(origem))[1])
+
+        # Um lock por conteúdo: cópias de imagens diferentes seguem em paralelo,
+        # e o mesmo conteúdo enviado por duas threads é copiado uma vez só
+        with self._lock:
+            lock_objeto = self._locks_objetos.setdefault(resumo, threading.Lock())
+        try:
+            with lock_objeto:
+                if objeto.exists():
+                    with self._lock:
+                        self.duplicados += 1
+                    return resumo, objeto, False
+
+                objeto.parent.mkdir(parents=True, exist_ok=True)
+                # Reflink ou cópia real: um hardlink para o original mudaria junto com ele
+                temporario = objeto.with_name(objeto.name + ".tmp")
+                if temporario.exists():
+                    temporario.unlink()
+                _clonar(origem, temporario)
+                os.replace(temporario, objeto)
+                with self._lock:
+                    self.objetos_novos += 1
+                return resumo, objeto, True
+        finally:
+            with self._lock:
+                if not lock_objeto.locked():
+                    self._locks_objetos.pop(resumo, None)
+
+    def vincular(self, origem, pasta_destino, resumo=None, existente=None):
+        """
+        Colocar a imagem em `pasta_destino` apontando para o objeto do armazém
+
+        Sem reflink a imagem é copiada direto para a pasta, sem objeto.
+
+        Args:
+            existente: foto já cadastrada com o mesmo hash (em qualquer
+                pintura); sem objeto no armazém, é clonada no lugar de `origem`
+
+        Returns:
+            (caminho na pasta, hash)
+        """
+        resumo = resumo or hash_arquivo(origem)
+        os.makedirs(pasta_destino, exist_ok=True)
+        destino = _nome_livre(pasta_destino, os.path.basename(str(origem)))
+
+        if not self.economiza_espaco(pasta_destino):
+            self._avisar_sem_reflink()
+            shutil.copy2(origem, destino)
+            return destino, resumo
+
+        # A foto que já está na biblioteca vira o objeto sem copiar dados
+        # (a origem pode estar em outro disco)
+        fonte = origem
+        if existente and os.path.isfile(existente) and hash_arquivo(existente) == resumo:
+            fonte = existente
+
+        resumo, objeto, _ = self.guardar(fonte, resumo)
+        _clonar(objeto, destino)
+        return destino, resumo
+
+    def copiar_para_pasta(self, origem, pasta_destino, resumo=None, existente=None):
+        """
+        Copiar uma foto para a pasta de uma pintura (pelo armazém, se ativo)
+
+        Returns:
+            (caminho na pasta, hash ou None se o armazém estiver desligado)
+        """
+        if self.ativo:
+            return self.vincular(origem, pasta_destino, resumo, existente)
+
+        os.makedirs(pasta_destino, exist_ok=True)
+        destino = _nome_livre(pasta_destino, os.path.basename(str(origem)))
+        shutil.copy2(origem, destino)
+        return destino, resumo
+
+    def registrar_hashes(self, db_path=None):
+        """
+        Calcular o hash das fotos cadastradas antes do armazém
+
+        Returns:
+            int: quantidade de fotos atualizadas
+        """
+        from .conexao import gerenciador_conexoes
+
+        with gerenciador_conexoes.conexao(db_path) as conn:
+            pendentes = conn.execute("SELECT id, caminho FROM fotos WHERE hash IS NULL").fetchall()
+
+        hashes = []
+        for foto_id, caminho in pendentes:
+            try:
+                hashes.append((hash_arquivo(caminho), foto_id))
+            except OSError:
+                # Arquivo ausente: fica sem hash
+                continue
+
+        if hashes:
+            with gerenciador_conexoes.transacao(db_path) as conn:
+                conn.executemany("UPDATE fotos SET hash = ? WHERE id = ?", hashes)
+        print(f"#️⃣ Hash registrado para {len(hashes)} de {len(pendentes)} foto(s)")
+        return len(hashes)
+
+    def estatisticas(self):
+        """Objetos criados e envios duplicados desde o início do processo"""
+        return {"objetos_novos": self.objetos_novos, "duplicados": self.duplicados,
+                "economiza_espaco": self.economiza_espaco()}
+
+
+# Instância global para uso em todo o projeto
+armazem_fotos = ArmazemFotos()
@@ -0,0 +1,388 @@
+# -*- coding: utf-8 -*-
+"""
+Módulo de Backup
+Cópias de segurança do banco e da biblioteca de fotos feitas em segundo plano
+
+    Backups/
+        2024-05-01_120000/Data.db           cópia do banco (API de backup do SQLite)
+        2024-05-01_120000/manifesto.json    {arquivo da biblioteca: hash, tamanho, mtime}
+        Objetos/ab/abcdef...                conteúdo dos arquivos, guardado pelo hash
+
+Cada arquivo da biblioteca é guardado uma única vez em Objetos: um backup
+novo só copia as fotos que mudaram. Os backups mais antigos que o limite de
+retenção são apagados junto com os objetos que ninguém mais usa.
+
+Uso pela linha de comando:
+    python -m Funções.backup criar | listar | restaurar NOME
+"""
+
+import json
+import os
+import shutil
+import sqlite3 as sql
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+from .armazem_fotos import hash_arquivo
+from .conexao import gerenciador_conexoes
+
+# Páginas copiadas por passo da API de backup (entre os passos a escrita fica liberada)
+PAGINAS_POR_PASSO = 256
+
+# Pausa entre os passos (s)
+PAUSA_ENTRE_PASSOS = 0.005
+
+# Backups mantidos por padrão
+RETENCAO_PADRAO = 7
+
+# Intervalo padrão entre backups automáticos (horas)
+INTERVALO_PADRAO_HORAS = 24
+
+# Pastas da biblioteca que não entram no backup (regeneráveis):
+# cache de miniaturas de UI_Dialogs/cache_miniaturas.py
+PASTAS_IGNORADAS = {".miniaturas"}
+
+FORMATO_NOME = "%Y-%m-%d_%H%M%S"
+ARQUIVO_MANIFESTO = "manifesto.json"
+
+
+def _config(chave, padrao):
+    try:
+        from config import config_manager
+        return config_manager.get(chave, padrao)
+    except ImportError:
+        return padrao
+
+
+class GerenciadorBackup:
+    """Criação, rotação e restauração de backups"""
+
+    def __init__(self, pasta_backups=None, db_path=None, pasta_biblioteca=None, retencao=None):
+        """
+        Args:
+            pasta_backups: destino dos backups (padrão: config "backup_path" ou Backups/)
+            db_path: banco copiado (padrão: banco do pool de conexões)
+            pasta_biblioteca: biblioteca de fotos (padrão: a do gerenciador de pastas)
+            retencao: quantidade de backups mantidos (padrão: config "backup_keep")
+        """
+        if pasta_backups is None:
+            pasta_backups = _config("backup_path", None) or Path(__file__).parent.parent / "Backups"
+        self.pasta_backups = Path(pasta_backups)
+        self.pasta_objetos = self.pasta_backups / "Objetos"
+        self._db_path = db_path
+        self._pasta_biblioteca = pasta_biblioteca
+        self.retencao = max(int(retencao or _config("backup_keep", RETENCAO_PADRAO)), 1)
+        self._lock = threading.Lock()
+
+    @property
+    def db_path(self):
+        return str(self._db_path or gerenciador_conexoes.db_path)
+
+    @property
+    def pasta_biblioteca(self):
+        if self._pasta_biblioteca is None:
+            from .gerenciador_pastas import gerenciador_pastas
+            return Path(gerenciador_pastas.pasta_base)
+        return Path(self._pasta_biblioteca)
+
+    # ---- Consulta ----
+
+    def listar_backups(self):
+        """Nomes dos backups completos, do mais antigo ao mais recente"""
+        if not self.pasta_backups.exists():
+            return []
+        return sorted(
+            pasta.name for pasta in self.pasta_backups.iterdir()
+            if pasta.is_dir() and (pasta / ARQUIVO_MANIFESTO).exists()
+        )
+
+    def ultimo_backup(self):
+        """Data do backup mais recente (ou None)"""
+        backups = self.listar_backups()
+        if not backups:
+            return None
+        return datetime.strptime(backups[-1][:17], FORMATO_NOME)
+
+    def _ler_manifesto(self, nome):
+        with open(self.pasta_backups / nome / ARQUIVO_MANIFESTO, encoding="utf-8") as arquivo:
+            return json.load(arquivo)
+
+    # ---- Criação ----
+
+    def _copiar_banco(self, destino, progresso=None):
+        """Copiar o banco em passos, sem bloquear quem estiver gravando"""
+        temporario = destino.with_suffix(".tmp")
+        origem = sql.connect(self.db_path)
+        copia = sql.connect(str(temporario))
+        try:
+            def passo(status, restantes, total):
+                if progresso:
+                    progresso("banco", total - restantes, total)
+
+            origem.backup(copia, pages=PAGINAS_POR_PASSO, progress=passo, sleep=PAUSA_ENTRE_PASSOS)
+        finally:
+            copia.close()
+            origem.close()
+        os.replace(temporario, destino)
+
+    def _guardar_biblioteca(self, anterior, progresso=None):
+        """
+        Guardar os arquivos da biblioteca em Objetos
+
+        Arquivos com o mesmo tamanho e data de modificação do backup anterior
+        não são lidos de novo; só conteúdos que ainda não estão em Objetos são copiados.
+
+        Returns:
+            (manifesto, arquivos copiados)
+        """
+        manifesto = {}
+        copiados = 0
+        biblioteca = self.pasta_biblioteca
+        if not biblioteca.exists():
+            return manifesto, copiados
+
+        for raiz, pastas, arquivos in os.walk(biblioteca):
+            pastas[:] = [pasta for pasta in pastas if pasta not in PASTAS_IGNORADAS]
+            for nome in arquivos:
+                caminho = Path(raiz) / nome
+                relativo = caminho.relative_to(biblioteca).as_posix()
+                try:
+                    estado = caminho.stat()
+                    entrada = anterior.get(relativo)
+                    if entrada and entrada["tamanho"] == estado.st_size and entrada["mtime"] == estado.st_mtime_ns:
+                        resumo = entrada["hash"]
+                    else:
+                        resumo = hash_arquivo(caminho)
+
+                    objeto = self.pasta_objetos / resumo[:2] / resumo
+                    if not objeto.exists():
+                        objeto.parent.mkdir(parents=True, exist_ok=True)
+                        shutil.copy2(caminho, objeto.with_suffix(".tmp"))
+                        os.replace(objeto.with_suffix(".tmp"), objeto)
+                        copiados += 1
+                except OSError as e:
+                    print(f"⚠️ Arquivo não copiado no backup: {caminho}: {e}")
+                    continue
+
+                manifesto[relativo] = {"hash": resumo, "tamanho": estado.st_size, "mtime": estado.st_mtime_ns}
+                if progresso:
+                    progresso("fotos", len(manifesto), None)
+
+        return manifesto, copiados
+
+    def criar_backup(self, progresso=None):
+        """
+        Criar um backup do banco e da biblioteca
+
+        Args:
+            progresso: função (etapa, feito, total) chamada durante a cópia
+
+        Returns:
+            str: nome do backup criado
+        """
+        with self._lock:
+            inicio = time.perf_counter()
+            backups = self.listar_backups()
+            anterior = self._ler_manifesto(backups[-1])["arquivos"] if backups else {}
+
+            nome = datetime.now().strftime(FORMATO_NOME)
+            if nome in backups:
+                # Dois backups no mesmo segundo
+                nome += f"_{sum(1 for b in backups if b.startswith(nome)) + 1}"
+            pasta = self.pasta_backups / nome
+            pasta.mkdir(parents=True, exist_ok=True)
+
+            self._copiar_banco(pasta / Path(self.db_path).name, progresso)
+            arquivos, copiados = self._guardar_biblioteca(anterior, progresso)
+
+            # Manifesto por último: backup sem manifesto é considerado incompleto
+            with open(pasta / ARQUIVO_MANIFESTO, "w", encoding="utf-8") as arquivo:
+                json.dump({
+                    "criado_em": datetime.now().isoformat(timespec="seconds"),
+                    "banco": Path(self.db_path).name,
+                    "arquivos": arquivos
+                }, arquivo, ensure_ascii=False)
+
+            removidos = self.rotacionar()
+            print(f"💾 Backup {nome} criado: {len(arquivos)} arquivo(s), {copiados} novo(s), "
+                  f"{removidos} backup(s) antigo(s) removido(s) em {time.perf_counter() - inicio:.1f} s")
+            return nome
+
+    def rotacionar(self):
+        """Apagar backups além da retenção e objetos sem referência"""
+        backups = self.listar_backups()
+        antigos = backups[:-self.retencao]
+        for nome in antigos:
+            shutil.rmtree(self.pasta_backups / nome, ignore_errors=True)
+
+        # Pastas sem manifesto são backups interrompidos
+        if self.pasta_backups.exists():
+            for pasta in self.pasta_backups.iterdir():
+                if pasta.is_dir() and pasta != self.pasta_objetos and not (pasta / ARQUIVO_MANIFESTO).exists():
+                    shutil.rmtree(pasta, ignore_errors=True)
+
+        if antigos and self.pasta_objetos.exists():
+            usados = set()
+            for nome in self.listar_backups():
+                usados.update(entrada["hash"] for entrada in self._ler_manifesto(nome)["arquivos"].values())
+            for objeto in self.pasta_objetos.glob("*/*"):
+                if objeto.name not in usados:
+                    objeto.unlink(missing_ok=True)
+            for subpasta in self.pasta_objetos.iterdir():
+                if subpasta.is_dir() and not any(subpasta.iterdir()):
+                    subpasta.rmdir()
+        return len(antigos)
+
+    # ---- Restauração ----
+
+    def restaurar(self, nome=None, restaurar_fotos=True):
+        """
+        Restaurar o banco (e as fotos) de um backup
+
+        O banco é sobrescrito pela API de backup, então as conexões abertas
+        passam a ver o conteúdo restaurado; as migrações pendentes são
+        aplicadas (o backup pode ser de uma versão anterior do esquema) e os
+        caches em memória são descartados. Fotos ausentes ou alteradas voltam
+        ao conteúdo do backup; arquivos criados depois dele são mantidos.
+
+        Args:
+            nome: backup a restaurar (padrão: o mais recente)
+
+        Returns:
+            int: quantidade de fotos restauradas
+        """
+        with self._lock:
+            backups = self.listar_backups()
+            if nome is None:
+                if not backups:
+                    raise FileNotFoundError("Nenhum backup encontrado")
+                nome = backups[-1]
+            if nome not in backups:
+                raise FileNotFoundError(f"Backup não encontrado: {nome}")
+
+            manifesto = self._ler_manifesto(nome)
+            origem = sql.connect(str(self.pasta_backups / nome / manifesto["banco"]))
+            destino = sql.connect(self.db_path)
+            try:
+                origem.backup(destino, pages=PAGINAS_POR_PASSO, sleep=PAUSA_ENTRE_PASSOS)
+            finally:
+                destino.close()
+                origem.close()
+
+            from .migracoes import migrar_banco
+            migrar_banco(self.db_path)
+
+            restauradas = 0
+            if restaurar_fotos:
+                biblioteca = self.pasta_biblioteca
+                for relativo, entrada in manifesto["arquivos"].items():
+                    caminho = biblioteca / relativo
+                    try:
+                        if caminho.exists() and caminho.stat().st_size == entrada["tamanho"] \
+                                and hash_arquivo(caminho) == entrada["hash"]:
+                            continue
+                        caminho.parent.mkdir(parents=True, exist_ok=True)
+                        shutil.copy2(self.pasta_objetos / entrada["hash"][:2] / entrada["hash"], caminho)
+                        restauradas += 1
+                    except OSError as e:
+                        print(f"❌ Erro ao restaurar {relativo}: {e}")
+
+            self._descartar_caches()
+            print(f"♻️ Backup {nome} restaurado ({restauradas} arquivo(s) recuperado(s))")
+            return restauradas
+
+
+    @staticmethod
+    def _descartar_caches():
+        """Esquecer o que foi lido do banco e das pastas antes da restauração"""
+        from .cache_detalhes import cache_detalhes
+        from .gerenciador_pastas import gerenciador_pastas
+        from .indice_fotos import indice_fotos
+
+        cache_detalhes.limpar()
+        indice_fotos.descartar()
+        gerenciador_pastas.invalidar_indices()
+
+
+class ServicoBackup:
+    """
+    Backups automáticos em uma thread de fundo
+
+    Enquanto "backup_enabled" estiver ligado na configuração, cria um backup
+    sempre que o último tiver mais de "backup_interval_hours" horas.
+    """
+
+    def __init__(self, gerenciador=None):
+        self.gerenciador = gerenciador or GerenciadorBackup()
+        self._parar = threading.Event()
+        self._agora = threading.Event()
+        self._thread = None
+
+    @property
+    def ativo(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def iniciar(self):
+        """Iniciar o serviço (nada acontece se o backup estiver desligado)"""
+        if not _config("backup_enabled", True) or self.ativo:
+            return
+        self._parar.clear()
+        self._thread = threading.Thread(target=self._executar, name="servico-backup", daemon=True)
+        self._thread.start()
+
+    def executar_agora(self):
+        """Pedir um backup imediato ao serviço (iniciando-o se preciso)"""
+        self._agora.set()
+        if not self.ativo:
+            self._parar.clear()
+            self._thread = threading.Thread(target=self._executar, name="servico-backup", daemon=True)
+            self._thread.start()
+
+    def parar(self, espera=5.0):
+        """Encerrar o serviço (um backup em andamento termina antes)"""
+        self._parar.set()
+        self._agora.set()
+        if self._thread is not None:
+            self._thread.join(espera)
+
+    def _backup_vencido(self):
+        intervalo = float(_config("backup_interval_hours", INTERVALO_PADRAO_HORAS)) * 3600
+        ultimo = self.gerenciador.ultimo_backup()
+        return ultimo is None or (datetime.now() - ultimo).total_seconds() >= intervalo
+
+    def _executar(self):
+        while not self._parar.is_set():
+            pedido = self._agora.is_set()
+            self._agora.clear()
+            if pedido or (_config("backup_enabled", True) and self._backup_vencido()):
+                try:
+                    self.gerenciador.criar_backup()
+                except Exception as e:
+                    print(f"❌ Erro no backup automático: {e}")
+            # Verificar de novo a cada minuto (ou quando houver um pedido)
+            self._agora.wait(60)
+
+
+# Instância global para uso em todo o projeto
+servico_backup = ServicoBackup()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Backups do banco e da biblioteca de fotos")
+    parser.add_argument("comando", choices=["criar", "listar", "restaurar"])
+    parser.add_argument("nome", nargs="?", help="backup a restaurar (padrão: o mais recente)")
+    parser.add_argument("--sem-fotos", action="store_true", help="restaurar só o banco")
+    args = parser.parse_args()
+
+    gerenciador = servico_backup.gerenciador
+    if args.comando == "criar":
+        gerenciador.criar_backup()
+    elif args.comando == "listar":
+        for nome in gerenciador.listar_backups():
+            print(nome)
+    else:
+        gerenciador.restaurar(args.nome, restaurar_fotos=not args.sem_fotos)
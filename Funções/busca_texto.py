@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+"""
+Módulo de Busca Textual
+Índices FTS5 para pinturas, exposições e séries, com busca por prefixo,
+ordenação por relevância e sem diferenciar acentos
+"""
+
+import re
+
+# indice: (tabela de origem, colunas indexadas)
+INDICES_BUSCA = {
+    "busca_pinturas": ("pinturas", ("titulo", "tecnica", "local")),
+    "busca_exposicoes": ("exposicoes", ("nome", "tema", "artistas")),
+    "busca_series": ("series", ("nome", "descricao")),
+}
+
+# Cache por arquivo de banco: índice disponível ou não
+_indices_verificados = {}
+
+
+def _sql_indice(indice, tabela, colunas):
+    """Gerar os comandos da tabela virtual e dos triggers de sincronização"""
+    cols = ", ".join(colunas)
+    novos = ", ".join(f"new.{c}" for c in colunas)
+    antigos = ", ".join(f"old.{c}" for c in colunas)
+    return [
+        f"""
+        CREATE VIRTUAL TABLE IF NOT EXISTS {indice} USING fts5(
+            {cols},
+            content='{tabela}',
+            content_rowid='id',
+            tokenize='unicode61 remove_diacritics 2',
+            prefix='2 3'
+        )""",
+        f"""
+        CREATE TRIGGER IF NOT EXISTS {indice}_ai AFTER INSERT ON {tabela} BEGIN
+            INSERT INTO {indice}(rowid, {cols}) VALUES (new.id, {novos});
+        END""",
+        f"""
+        CREATE TRIGGER IF NOT EXISTS {indice}_ad AFTER DELETE ON {tabela} BEGIN
+            INSERT INTO {indice}({indice}, rowid, {cols}) VALUES ('delete', old.id, {antigos});
+        END""",
+        f"""
+        CREATE TRIGGER IF NOT EXISTS {indice}_au AFTER UPDATE ON {tabela} BEGIN
+            INSERT INTO {indice}({indice}, rowid, {cols}) VALUES ('delete', old.id, {antigos});
+            INSERT INTO {indice}(rowid, {cols}) VALUES (new.id, {novos});
+        END""",
+    ]
+
+
+def criar_indices_busca(conn):
+    """
+    Criar (ou completar) os índices FTS5 e reconstruí-los a partir das
+    tabelas, na transação de quem chama (usado pela migração 3)
+    """
+    cursor = conn.cursor()
+    for indice, (tabela, colunas) in INDICES_BUSCA.items():
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (indice,))
+        existia = cursor.fetchone() is not None
+
+        for comando in _sql_indice(indice, tabela, colunas):
+            cursor.execute(comando)
+
+        # Índice novo: popular com os dados já existentes
+        if not existia:
+            cursor.execute(f"INSERT INTO {indice}({indice}) VALUES ('rebuild')")
+
+
+def indices_disponiveis(conn):
+    """Verificar se os índices FTS5 (criados pela migração 3) existem no banco"""
+    arquivo = conn.execute("PRAGMA database_list").fetchone()[2]
+    if arquivo in _indices_verificados:
+        return _indices_verificados[arquivo]
+
+    marcadores = ", ".join("?" for _ in INDICES_BUSCA)
+    existentes = conn.execute(
+        f"SELECT COUNT(*) FROM sqlite_master WHERE type = 'table' AND name IN ({marcadores})",
+        tuple(INDICES_BUSCA)
+    ).fetchone()[0]
+    disponivel = existentes == len(INDICES_BUSCA)
+    if not disponivel:
+        # SQLite sem FTS5: usar LIKE
+        print("Busca textual indisponível, usando LIKE")
+
+    _indices_verificados[arquivo] = disponivel
+    return disponivel
+
+
+def montar_expressao(filtros):
+    """
+    Montar expressão MATCH a partir de {coluna: texto}
+
+    Cada palavra vira um prefixo ("pal"*) restrito à sua coluna, e todas
+    precisam ocorrer. Colunas sem palavras válidas são ignoradas.
+
+    Returns:
+        tuple: (expressão ou None, colunas atendidas pela expressão)
+    """
+    partes = []
+    atendidas = []
+    for coluna, texto in filtros.items():
+        if not texto:
+            continue
+        termos = re.findall(r"\w+", str(texto))
+        if not termos:
+            continue
+        for termo in termos:
+            partes.append(f'{coluna} : "{termo}"*')
+        atendidas.append(coluna)
+
+    if not partes:
+        return None, []
+    return " AND ".join(partes), atendidas
@@ -0,0 +1,197 @@
+# -*- coding: utf-8 -*-
+"""
+Módulo de Cache de Detalhes
+Cache LRU em memória dos detalhes de pinturas, exposições e séries exibidos
+nos painéis, invalidado pelas funções CRUD que alteram esses registros
+"""
+
+import copy
+import threading
+from collections import OrderedDict
+
+# Quantidade padrão de registros mantidos em memória (todos os tipos juntos)
+LIMITE_PADRAO = 500
+
+# Tipos de registro guardados no cache
+TIPOS = ("pintura", "exposicao", "serie")
+
+
+class CacheDetalhes:
+    """
+    Cache LRU de detalhes por (tipo, id), compartilhado por todo o processo
+
+        detalhes = cache_detalhes.obter("serie", serie_id,
+                                        lambda: buscar_serie(serie_id, db_path), db_path)
+
+    As funções de escrita chamam invalidar() com os ids afetados. Uma leitura
+    que começou antes de uma invalidação não é guardada ao terminar.
+    """
+
+    def __init__(self, limite=None):
+        """Inicializar cache com limite de registros (padrão vindo da configuração)"""
+        if limite is None:
+            try:
+                from config import config_manager
+                limite = config_manager.get("detail_cache_size", LIMITE_PADRAO)
+            except ImportError:
+                limite = LIMITE_PADRAO
+
+        self.limite = limite or LIMITE_PADRAO
+        self._lock = threading.Lock()
+        self._entradas = OrderedDict()  # (tipo, id, banco) -> detalhes
+        self._bancos = {}  # (tipo, id) -> bancos com entrada no cache
+        self._geracao = 0
+        self.acertos = 0
+        self.falhas = 0
+        self.invalidacoes = 0
+
+    @staticmethod
+    def _banco(db_path):
+        """Chave do banco (None = banco padrão do pool de conexões)"""
+        from .conexao import caminho_banco, gerenciador_conexoes
+        if db_path is None:
+            return gerenciador_conexoes.db_path
+        return caminho_banco(db_path)
+
+    @property
+    def geracao(self):
+        """Muda a cada invalidação (usar em guardar() para descartar leituras antigas)"""
+        return self._geracao
+
+    def buscar(self, tipo, registro_id, db_path=None):
+        """
+        Detalhes em cache de um registro
+
+        Returns:
+            cópia dos detalhes, ou None se o registro não estiver no cache
+        """
+        chave = (tipo, int(registro_id), self._banco(db_path))
+        with self._lock:
+            detalhes = self._entradas.get(chave)
+            if detalhes is None:
+                self.falhas += 1
+                return None
+            self._entradas.move_to_end(chave)
+            self.acertos += 1
+        # Cópia rasa: quem recebe pode alterar o dicionário sem afetar o cache
+        return copy.copy(detalhes)
+
+    def guardar(self, tipo, registro_id, detalhes, db_path=None, geracao=None):
+        """Guardar detalhes lidos do banco (ignorado se houve invalidação desde `geracao`)"""
+        if detalhes is None:
+            return
+        registro_id = int(registro_id)
+        banco = self._banco(db_path)
+        with self._lock:
+            if geracao is not None and geracao != self._geracao:
+                return
+            self._entradas[(tipo, registro_id, banco)] = copy.copy(detalhes)
+            self._entradas.move_to_end((tipo, registro_id, banco))
+            self._bancos.setdefault((tipo, registro_id), set()).add(banco)
+            while len(self._entradas) > self.limite:
+                (t, i, b), _ = self._entradas.popitem(last=False)
+                self._descartar_banco(t, i, b)
+
+    def obter(self, tipo, registro_id, carregar, db_path=None):
+        """Ler do cache ou, se ausente, chamar carregar() e guardar o resultado"""
+        detalhes = self.buscar(tipo, registro_id, db_path)
+        if detalhes is not None:
+            return detalhes
+
+        geracao = self._geracao
+        detalhes = carregar()
+        self.guardar(tipo, registro_id, detalhes, db_path, geracao)
+        return detalhes
+
+    def _descartar_banco(self, tipo, registro_id, banco):
+        bancos = self._bancos.get((tipo, registro_id))
+        if bancos is not None:
+            bancos.discard(banco)
+            if not bancos:
+                del self._bancos[(tipo, registro_id)]
+
+    def invalidar(self, tipo, registro_ids):
+        """Descartar os registros indicados (um id ou lista de ids), em todos os bancos"""
+        if not isinstance(registro_ids, (list, tuple, set)):
+            registro_ids = [registro_ids]
+
+        with self._lock:
+            self._geracao += 1
+            for registro_id in registro_ids:
+                try:
+                    registro_id = int(registro_id)
+                except (TypeError, ValueError):
+                    continue
+                for banco in self._bancos.pop((tipo, registro_id), ()):
+                    if self._entradas.pop((tipo, registro_id, banco), None) is not None:
+                        self.invalidacoes += 1
+
+    def invalidar_relacionados(self, tipo, campo, relacionado_ids):
+        """
+        Descartar os registros cujos detalhes citam outro registro
+
+        Ex.: invalidar_relacionados("pintura", "fotos", foto_id) descarta as
+        pinturas em cache cuja lista "fotos" contém essa foto. Serve para
+        remoções feitas pelo id do registro filho (foto, preço, local).
+        """
+        if not isinstance(relacionado_ids, (list, tuple, set)):
+            relacionado_ids = [relacionado_ids]
+        relacionados = set()
+        for relacionado_id in relacionado_ids:
+            try:
+                relacionados.add(int(relacionado_id))
+            except (TypeError, ValueError):
+                continue
+
+        with self._lock:
+            afetados = [
+                chave[1] for chave, detalhes in self._entradas.items()
+                if chave[0] == tipo and isinstance(detalhes, dict)
+                and any(item and item[0] in relacionados for item in detalhes.get(campo) or [])
+            ]
+        self.invalidar(tipo, afetados)
+
+    def invalidar_tipo(self, tipo):
+        """Descartar todos os registros de um tipo"""
+        with self._lock:
+            self._geracao += 1
+            for chave in [chave for chave in self._entradas if chave[0] == tipo]:
+                del self._entradas[chave]
+                self._descartar_banco(*chave)
+                self.invalidacoes += 1
+
+    def limpar(self):
+        """Descartar todo o cache"""
+        with self._lock:
+            self._geracao += 1
+            self.invalidacoes += len(self._entradas)
+            self._entradas.clear()
+            self._bancos.clear()
+
+    def estatisticas(self):
+        """Acertos, falhas e ocupação do cache"""
+        with self._lock:
+            consultas = self.acertos + self.falhas
+            por_tipo = {tipo: 0 for tipo in TIPOS}
+            for chave in self._entradas:
+                por_tipo[chave[0]] = por_tipo.get(chave[0], 0) + 1
+            return {
+                "registros": len(self._entradas),
+                "limite": self.limite,
+                "por_tipo": por_tipo,
+                "acertos": self.acertos,
+                "falhas": self.falhas,
+                "taxa_acertos": self.acertos / consultas if consultas else 0.0,
+                "invalidacoes": self.invalidacoes
+            }
+
+    def resetar_estatisticas(self):
+        """Zerar contadores de acertos e falhas"""
+        with self._lock:
+            self.acertos = 0
+            self.falhas = 0
+            self.invalidacoes = 0
+
+
+# Instância global para uso em todo o projeto
+cache_detalhes = CacheDetalhes()
@@ -0,0 +1,355 @@
+# -*- coding: utf-8 -*-
+"""
+Módulo de Conexões com o Banco de Dados
+Pool de conexões SQLite por thread, compartilhado por todos os módulos CRUD
+"""
+
+import itertools
+import os
+import sqlite3 as sql
+import sys
+import threading
+import time
+import weakref
+from contextlib import contextmanager
+from pathlib import Path
+
+from .perfil_sql import CursorInstrumentado, perfil_sql
+
+# Ajustes aplicados a cada conexão aberta pelo pool
+PRAGMAS = (
+    "PRAGMA journal_mode = WAL",       # leitores não bloqueiam a escrita
+    "PRAGMA synchronous = NORMAL",     # seguro com WAL e sem fsync a cada commit
+    "PRAGMA mmap_size = 268435456",    # 256 MB mapeados em memória
+    "PRAGMA cache_size = -65536",      # 64 MB de cache de páginas
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA foreign_keys = ON",        # exclusões em cascata (migração 6)
+)
+
+
+def caminho_banco(db_path):
+    """Caminho normalizado do banco: o mesmo arquivo sempre usa a mesma conexão do pool"""
+    caminho = str(db_path)
+    if caminho == ":memory:" or caminho.startswith("file:"):
+        return caminho
+    return os.path.realpath(caminho)
+
+
+# Número de cada conexão aberta (nunca reaproveitado, ao contrário de id())
+_numeros_conexoes = itertools.count(1)
+
+
+class Conexao(sql.Connection):
+    """Conexão SQLite reutilizável mantida pelo pool"""
+
+    # Geração dos dados no processo: avança a cada commit ou rollback feito
+    # pelo pool, e quando uma conexão nota pelo data_version um commit de fora
+    geracao = 0
+    _lock_geracao = threading.Lock()
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.numero = next(_numeros_conexoes)
+        self._data_version = None
+        # Profundidade de `with transacao()` ativos e savepoints das funções CRUD dentro deles
+        self.unidade = 0
+        self.savepoints = []
+        # Blocos `with conexao()` abertos nesta conexão (funções CRUD que chamam outras)
+        self.usos = 0
+
+    def cursor(self, factory=None):
+        """Cursor comum ou, com o perfil SQL ligado, instrumentado"""
+        if factory is None:
+            factory = CursorInstrumentado if perfil_sql.ativo else sql.Cursor
+        return super().cursor(factory)
+
+    def execute(self, *args):
+        if perfil_sql.ativo:
+            return self.cursor().execute(*args)
+        return super().execute(*args)
+
+    def executemany(self, *args):
+        if perfil_sql.ativo:
+            return self.cursor().executemany(*args)
+        return super().executemany(*args)
+
+    def executescript(self, script):
+        try:
+            if perfil_sql.ativo:
+                return self.cursor().executescript(script)
+            return super().executescript(script)
+        finally:
+            # executescript confirma a transação pendente e roda o script em autocommit
+            Conexao.nova_geracao()
+
+    def close(self):
+        """Ignorar fechamentos avulsos - o pool controla o ciclo de vida"""
+        pass
+
+    def commit(self):
+        """Dentro de uma transação do pool, o commit fica para o final da unidade"""
+        if self.unidade:
+            return
+        pendente = self.in_transaction
+        super().commit()
+        if pendente:
+            Conexao.nova_geracao()
+
+    def rollback(self):
+        """Dentro de uma transação do pool, desfazer só a parte da função atual"""
+        if self.savepoints:
+            self.execute(f"ROLLBACK TO {self.savepoints[-1]}")
+        elif self.unidade:
+            # Rollback direto no corpo da unidade: descartar tudo e recomeçar
+            super().rollback()
+            self.execute("BEGIN")
+        else:
+            super().rollback()
+        Conexao.nova_geracao()
+
+    @classmethod
+    def nova_geracao(cls):
+        """Avançar a geração dos dados (invalida o que foi memorizado com versao_dados)"""
+        with cls._lock_geracao:
+            Conexao.geracao += 1
+
+    def versao_dados(self):
+        """
+        Marca que muda sempre que o banco é alterado, comparável entre as
+        conexões de threads diferentes
+
+        data_version e total_changes são contadores desta conexão e não
+        valem em outra; a marca usa a geração do processo. Dentro de uma
+        transação, inclui também as alterações ainda não gravadas desta
+        conexão, que as outras não enxergam.
+        """
+        data_version = self.execute("PRAGMA data_version").fetchone()[0]
+        if data_version != self._data_version:
+            if self._data_version is not None:
+                # Commit de outra conexão (possivelmente de outro processo)
+                Conexao.nova_geracao()
+            self._data_version = data_version
+        if self.in_transaction:
+            return Conexao.geracao, self.numero, self.total_changes
+        return Conexao.geracao, 0, 0
+
+    def fechar_definitivamente(self):
+        """Fechar a conexão de fato (usado apenas pelo pool)"""
+        super().close()
+
+
+class _DonoConexoes:
+    """Guardado no threading.local: é descartado quando a thread termina"""
+
+
+class _UsoConexao:
+    """Contexto de uso de uma conexão do pool com medição de tempo"""
+
+    def __init__(self, gerenciador, db_path, nome):
+        self.gerenciador = gerenciador
+        self.db_path = db_path
+        self.nome = nome
+        self.conn = None
+        self.inicio = None
+
+    def __enter__(self):
+        self.inicio = time.perf_counter()
+        self.conn = self.gerenciador.obter_conexao(self.db_path)
+        self.conn.usos += 1
+        if self.conn.unidade:
+            # Dentro de `with transacao()`: a função trabalha em um savepoint
+            savepoint = f"sp_{len(self.conn.savepoints)}"
+            self.conn.execute(f"SAVEPOINT {savepoint}")
+            self.conn.savepoints.append(savepoint)
+        return self.conn
+
+    def __exit__(self, exc_type, exc, tb):
+        self.conn.usos -= 1
+        if self.conn.unidade and self.conn.savepoints:
+            savepoint = self.conn.savepoints.pop()
+            if exc_type is not None:
+                self.conn.execute(f"ROLLBACK TO {savepoint}")
+                Conexao.nova_geracao()
+            self.conn.execute(f"RELEASE {savepoint}")
+        elif self.conn.usos == 0 and not self.conn.unidade and self.conn.in_transaction:
+            # Só a função mais externa decide: as escritas pendentes de quem
+            # chamou uma função aninhada não podem ser descartadas por ela.
+            # Sem exceção, são escritas que a função esqueceu de confirmar.
+            if exc_type is None:
+                print(f"Aviso: {self.nome} terminou sem commit; escritas pendentes desfeitas")
+            self.conn.rollback()
+        self.gerenciador._registrar_tempo(self.nome, time.perf_counter() - self.inicio)
+        return False
+
+
+class GerenciadorConexoes:
+    """Gerenciador de conexões SQLite reaproveitadas por thread"""
+
+    def __init__(self, db_path=None):
+        """Inicializar pool com o caminho do banco das configurações"""
+        if db_path is None:
+            try:
+                from config import config_manager
+                db_path = config_manager.get_database_path()
+            except ImportError:
+                # Fallback para o banco padrão se config não estiver disponível
+                db_path = Path(__file__).parent.parent / "Data" / "Data.db"
+
+        self.db_path = caminho_banco(db_path)
+        self._local = threading.local()
+        self._lock = threading.RLock()
+        self._conexoes = []
+        self._migrados = set()
+        self.conexoes_abertas = 0
+        self.reutilizacoes = 0
+        self.estatisticas = {}
+
+    def configurar(self, db_path):
+        """Definir o banco padrão usado quando nenhum caminho é informado"""
+        self.db_path = caminho_banco(db_path)
+
+    def obter_conexao(self, db_path=None):
+        """Obter a conexão da thread atual para o banco (criar se não existir)"""
+        caminho = caminho_banco(db_path) if db_path is not None else self.db_path
+        conexoes = getattr(self._local, "conexoes", None)
+        if conexoes is None:
+            conexoes = self._local.conexoes = {}
+            # Ao fim da thread o threading.local solta o dono e as conexões dela são fechadas
+            self._local.dono = _DonoConexoes()
+            weakref.finalize(self._local.dono, self._liberar_conexoes, conexoes)
+
+        conn = conexoes.get(caminho)
+        if conn is not None:
+            with self._lock:
+                self.reutilizacoes += 1
+            return conn
+
+        conn = sql.connect(caminho, factory=Conexao, check_same_thread=False)
+        for pragma in PRAGMAS:
+            try:
+                conn.execute(pragma)
+            except sql.Error as e:
+                print(f"Aviso: {pragma} não aplicado: {e}")
+        conexoes[caminho] = conn
+        with self._lock:
+            self._conexoes.append(conn)
+            self.conexoes_abertas += 1
+            migrar = caminho not in self._migrados
+            self._migrados.add(caminho)
+
+        # Primeira abertura do banco no processo: aplicar migrações pendentes
+        if migrar:
+            from .migracoes import aplicar_migracoes
+            try:
+                aplicar_migracoes(conn)
+            except Exception as e:
+                print(f"Erro ao migrar banco {caminho}: {e}")
+        return conn
+
+    def _liberar_conexoes(self, conexoes):
+        """Fechar as conexões de uma thread que terminou e tirá-las do pool"""
+        with self._lock:
+            for conn in conexoes.values():
+                if conn in self._conexoes:
+                    self._conexoes.remove(conn)
+                    self.conexoes_abertas -= 1
+        for conn in conexoes.values():
+            try:
+                conn.fechar_definitivamente()
+            except Exception as e:
+                print(f"Erro ao fechar conexão: {e}")
+        conexoes.clear()
+
+    def conexao(self, db_path=None, nome=None):
+        """Contexto `with` que entrega a conexão do pool e mede o tempo da chamada"""
+        if nome is None:
+            nome = sys._getframe(1).f_code.co_name
+        return _UsoConexao(self, db_path, nome)
+
+    @contextmanager
+    def transacao(self, db_path=None):
+        """
+        Unidade de trabalho: as funções CRUD chamadas dentro do bloco usam a
+        mesma conexão, seus commits são adiados e tudo é gravado de uma vez
+        ao sair do bloco (ou desfeito se ocorrer uma exceção).
+
+            with gerenciador_conexoes.transacao(db_path):
+                for obra_id in obras:
+                    associar_pintura_exposicao(obra_id, exposicao_id, db_path=db_path)
+        """
+        conn = self.obter_conexao(db_path)
+        if conn.unidade == 0:
+            if conn.in_transaction:
+                # Escritas pendentes de uma função em andamento: não desfazê-las
+                # nem gravá-las junto com a unidade sem que ela saiba
+                raise sql.ProgrammingError(
+                    "transacao() iniciada com escritas pendentes nesta conexão; "
+                    "confirme-as antes ou abra a unidade por fora")
+            conn.execute("BEGIN")
+        conn.unidade += 1
+
+        try:
+            yield conn
+        except BaseException:
+            conn.unidade -= 1
+            if conn.unidade == 0:
+                conn.savepoints.clear()
+                sql.Connection.rollback(conn)
+                Conexao.nova_geracao()
+                # Detalhes lidos dentro da unidade podem conter dados desfeitos
+                from .cache_detalhes import cache_detalhes
+                cache_detalhes.limpar()
+            raise
+        else:
+            conn.unidade -= 1
+            if conn.unidade == 0:
+                sql.Connection.commit(conn)
+                Conexao.nova_geracao()
+
+    def _registrar_tempo(self, nome, duracao):
+        """Acumular contadores de tempo por função"""
+        with self._lock:
+            stats = self.estatisticas.setdefault(nome, {
+                "chamadas": 0,
+                "tempo_total": 0.0,
+                "tempo_max": 0.0
+            })
+            stats["chamadas"] += 1
+            stats["tempo_total"] += duracao
+            stats["tempo_max"] = max(stats["tempo_max"], duracao)
+
+    def obter_estatisticas(self):
+        """Retornar cópia dos contadores de conexões e tempos por função"""
+        with self._lock:
+            funcoes = {}
+            for nome, stats in self.estatisticas.items():
+                funcoes[nome] = dict(stats)
+                funcoes[nome]["tempo_medio"] = stats["tempo_total"] / stats["chamadas"]
+            return {
+                "conexoes_abertas": self.conexoes_abertas,
+                "reutilizacoes": self.reutilizacoes,
+                "funcoes": funcoes
+            }
+
+    def resetar_estatisticas(self):
+        """Zerar contadores de tempo e de reutilização"""
+        with self._lock:
+            self.estatisticas = {}
+            self.reutilizacoes = 0
+
+    def fechar_todas(self):
+        """Fechar todas as conexões abertas pelo pool (ao encerrar o aplicativo)"""
+        with self._lock:
+            conexoes = self._conexoes
+            self._conexoes = []
+            self.conexoes_abertas = 0
+        for conn in conexoes:
+            try:
+                conn.fechar_definitivamente()
+            except Exception as e:
+                print(f"Erro ao fechar conexão: {e}")
+        self._local = threading.local()
+
+
+# Instância global para uso em todo o projeto
+gerenciador_conexoes = GerenciadorConexoes()
@@ -4,64 +4,106 @@ Módulo CRUD para Fotos
 Operações de banco de dados para gerenciamento de fotos das pinturas
 """
 
-import sqlite3 as sql   
+import os
 
+from .armazem_fotos import armazem_fotos, hash_arquivo
+from .cache_detalhes import cache_detalhes
+from .conexao import gerenciador_conexoes
 
-def adicionar_foto(pintura_id, caminho, descricao):
-    conn = sql.connect("C:\\Users\\virtu\\Desktop\\EDU\\Programação\\DB\\Data\\Data.db")
-    cursor = conn.cursor()
-    
-    cursor.execute("""
-    INSERT INTO fotos (pintura_id, caminho, descricao)
-    VALUES (?, ?, ?)
-    """, (pintura_id, caminho, descricao))
-    
-    conn.commit()
-    conn.close()
+
+def adicionar_foto(pintura_id, caminho, descricao, hash=None):
+    with gerenciador_conexoes.conexao() as conn:
+        cursor = conn.cursor()
+
+        # O índice de fotos pode ter cadastrado o arquivo assim que ele apareceu na pasta
+        existente = cursor.execute(
+            "SELECT id FROM fotos WHERE pintura_id = ? AND caminho = ?", (pintura_id, caminho)
+        ).fetchone()
+        if existente:
+            foto_id = existente[0]
+            cursor.execute("UPDATE fotos SET descricao = ?, hash = ? WHERE id = ?", (descricao, hash, foto_id))
+        else:
+            cursor.execute("""
+            INSERT INTO fotos (pintura_id, caminho, descricao, hash)
+            VALUES (?, ?, ?, ?)
+            """, (pintura_id, caminho, descricao, hash))
+            foto_id = cursor.lastrowid
+
+        conn.commit()
+    cache_detalhes.invalidar("pintura", pintura_id)
+    return foto_id
+
+
+def importar_foto(pintura_id, arquivo, pasta_pintura, descricao=None):
+    """
+    Copiar um arquivo para a pasta Fotos da pintura e cadastrá-lo
+
+    Com o armazém de fotos ativo, uma foto que a pintura já tem não é
+    copiada nem cadastrada de novo, e a mesma imagem já cadastrada em outra
+    pintura é clonada da biblioteca (sem custo com reflink).
+
+    Returns:
+        (foto_id, caminho, True se a foto foi adicionada agora)
+    """
+    resumo = None
+    outra_pintura = None
+    if armazem_fotos.ativo:
+        resumo = hash_arquivo(arquivo)
+        with gerenciador_conexoes.conexao() as conn:
+            iguais = conn.execute(
+                "SELECT id, caminho, pintura_id FROM fotos WHERE hash = ? ORDER BY pintura_id = ? DESC, id",
+                (resumo, pintura_id)
+            ).fetchall()
+        for foto_id, caminho, dono in iguais:
+            if dono == pintura_id:
+                return foto_id, caminho, False
+            if os.path.isfile(caminho):
+                outra_pintura = caminho
+                break
+
+    caminho, resumo = armazem_fotos.copiar_para_pasta(
+        arquivo, os.path.join(pasta_pintura, "Fotos"), resumo, outra_pintura
+    )
+    return adicionar_foto(pintura_id, caminho, descricao, resumo), caminho, True
 
 
 def listar_fotos(pintura_id, db_path=None):
-    if db_path is None:
-        db_path = "C:\\Users\\virtu\\Desktop\\EDU\\Programação\\DB\\Data\\Data.db"
-    
-    conn = sql.connect(db_path)
-    cursor = conn.cursor()
-    
-    cursor.execute("SELECT id, caminho, descricao FROM fotos WHERE pintura_id = ?", (pintura_id,))
-    fotos = cursor.fetchall()
-    conn.close()
+    with gerenciador_conexoes.conexao(db_path) as conn:
+        cursor = conn.cursor()
+
+        cursor.execute("SELECT id, caminho, descricao FROM fotos WHERE pintura_id = ?", (pintura_id,))
+        fotos = cursor.fetchall()
     return fotos
 
 
 def buscar_foto(foto_id):
-    conn = sql.connect("C:\\Users\\virtu\\Desktop\\EDU\\Programação\\DB\\Data\\Data.db")
-    cursor = conn.cursor()
-    
-    cursor.execute("SELECT * FROM fotos WHERE id = ?", (foto_id,))
-    foto = cursor.fetchone()
-    
-    conn.close()
-    return foto 
+    with gerenciador_conexoes.conexao() as conn:
+        cursor = conn.cursor()
+
+        cursor.execute("SELECT * FROM fotos WHERE id = ?", (foto_id,))
+        foto = cursor.fetchone()
+
+    return foto
 
 def remover_foto(foto_id):
-    conn = sql.connect("C:\\Users\\virtu\\Desktop\\EDU\\Programação\\DB\\Data\\Data.db")
-    cursor = conn.cursor()
-    
-    cursor.execute("DELETE FROM fotos WHERE id = ?", (foto_id,))
-    
-    conn.commit()
-    conn.close()
+    with gerenciador_conexoes.conexao() as conn:
+        cursor = conn.cursor()
+
+        cursor.execute("DELETE FROM fotos WHERE id = ?", (foto_id,))
+
+        conn.commit()
+    cache_detalhes.invalidar_relacionados("pintura", "fotos", foto_id)
 
 
 def editar_descriçao(foto_id, nova_descricao):
-    conn = sql.connect("C:\\Users\\virtu\\Desktop\\EDU\\Programação\\DB\\Data\\Data.db")
-    cursor = conn.cursor()
-    
-    cursor.execute("""
-    UPDATE fotos
-    SET descricao = ?
-    WHERE id = ?
-    """, (nova_descricao, foto_id))
-    
-    conn.commit()
-    conn.close()
+    with gerenciador_conexoes.conexao() as conn:
+        cursor = conn.cursor()
+
+        cursor.execute("""
+        UPDATE fotos
+        SET descricao = ?
+        WHERE id = ?
+        """, (nova_descricao, foto_id))
+
+        conn.commit()
+    cache_detalhes.invalidar_relacionados("pintura", "fotos", foto_id)
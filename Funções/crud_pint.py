@@ -4,225 +4,390 @@ Módulo CRUD para Pinturas
 Operações de banco de dados para gerenciamento de pinturas
 """
 
-import sqlite3 as sql 
+from .cache_detalhes import cache_detalhes
+from .conexao import gerenciador_conexoes
+from .busca_texto import indices_disponiveis, montar_expressao
+from . import paginacao
+
+# Listagem da janela principal (colunas na ordem da tabela)
+COLUNAS_LISTAGEM = ("id", "titulo", "tecnica", "tamanho", "data", "local")
+CONSULTA_LISTAGEM = f"SELECT {', '.join(COLUNAS_LISTAGEM)} FROM pinturas"
+
+# Ids por consulta `IN (...)`: abaixo do limite de 999 variáveis do SQLite antigo
+LIMITE_VARIAVEIS = 900
+
+
+def _ids_unicos(pintura_ids):
+    """Ids inteiros sem repetição, na ordem recebida"""
+    if not isinstance(pintura_ids, (list, tuple, set)):
+        pintura_ids = [pintura_ids]
+    return list(dict.fromkeys(int(pintura_id) for pintura_id in pintura_ids))
+
+
+def _fatias(ids):
+    """Fatias de ids que cabem em uma consulta `IN (...)`"""
+    for inicio in range(0, len(ids), LIMITE_VARIAVEIS):
+        yield ids[inicio:inicio + LIMITE_VARIAVEIS]
+
+
+def _ids_existentes(cursor, tabela, ids):
+    """Ids que existem na tabela (os demais violariam a chave estrangeira)"""
+    existentes = set()
+    for fatia in _fatias(ids):
+        marcadores = ", ".join("?" for _ in fatia)
+        cursor.execute(f"SELECT id FROM {tabela} WHERE id IN ({marcadores})", fatia)
+        existentes.update(linha[0] for linha in cursor.fetchall())
+    return existentes
+
+
+def _associar_em_lote(pintura_ids, outros_ids, tabela_associacao, coluna,
+                      tabela_outros, tipo_cache, db_path=None):
+    """
+    Associar várias pinturas a vários registros de outra tabela de uma só vez
+
+    Todas as combinações pintura × registro são gravadas com um único
+    INSERT OR IGNORE (executemany) e um único commit. Ids inexistentes
+    ficam de fora (o OR IGNORE não cobre a chave estrangeira e faria o
+    lote inteiro falhar).
+
+    Args:
+        pintura_ids: id ou lista de ids das pinturas
+        outros_ids: id ou lista de ids da outra tabela
+        tabela_associacao: tabela de ligação (ex.: "pintura_serie")
+        coluna: coluna da outra tabela na ligação (ex.: "serie_id")
+        tabela_outros: tabela referenciada (ex.: "series")
+        tipo_cache: tipo no cache de detalhes (ex.: "serie")
+
+    Returns:
+        dict: {(pintura_id, outro_id): True se foi associada agora,
+               False se já existia, se algum dos ids não existe ou se houve erro}
+    """
+    pintura_ids = _ids_unicos(pintura_ids)
+    outros_ids = _ids_unicos(outros_ids)
+    pares = [(p, o) for o in outros_ids for p in pintura_ids]
+    resultado = dict.fromkeys(pares, False)
+    if not pares:
+        return resultado
+
+    with gerenciador_conexoes.conexao(db_path) as conn:
+        cursor = conn.cursor()
+
+        try:
+            validas = (_ids_existentes(cursor, "pinturas", pintura_ids),
+                       _ids_existentes(cursor, tabela_outros, outros_ids))
+
+            # Associações já existentes (índice pela coluna da outra tabela)
+            existentes = set()
+            for outro_id in outros_ids:
+                cursor.execute(
+                    f"SELECT pintura_id, {coluna} FROM {tabela_associacao} WHERE {coluna} = ?",
+                    (outro_id,)
+                )
+                existentes.update(cursor.fetchall())
+
+            novos = [par for par in pares if par not in existentes
+                     and par[0] in validas[0] and par[1] in validas[1]]
+            cursor.executemany(f"""
+            INSERT OR IGNORE INTO {tabela_associacao} (pintura_id, {coluna})
+            VALUES (?, ?)
+            """, novos)
+
+            conn.commit()
+            for par in novos:
+                resultado[par] = True
+            cache_detalhes.invalidar("pintura", [p for p, _ in novos])
+            cache_detalhes.invalidar(tipo_cache, [o for _, o in novos])
+            return resultado
+        except Exception as e:
+            print(f"Erro ao associar pinturas ({tabela_associacao}): {e}")
+            conn.rollback()
+            return dict.fromkeys(pares, False)
 
 
 def adicionar_pintura(titulo, tecnica, tamanho, data, local, serie_id=None, exposicao_id=None, preco=None, db_path=None):
     """Adicionar pintura com relacionamentos opcionais"""
-    if db_path is None:
-        db_path = "C:\\Users\\virtu\\Desktop\\EDU\\Programação\\DB\\Data\\Data.db"
-    
-    conn = sql.connect(db_path)
-    cursor = conn.cursor()
-    
-    try:
-        # Inserir pintura principal
-        cursor.execute("""
-        INSERT INTO pinturas (titulo, tecnica, tamanho, data, local)
-        VALUES (?, ?, ?, ?, ?)
-        """, (titulo, tecnica, tamanho, data, local))
-        
-        pintura_id = cursor.lastrowid
-        
-        # Criar pasta automática para a pintura
+    with gerenciador_conexoes.conexao(db_path) as conn:
+        cursor = conn.cursor()
+
         try:
-            from .gerenciador_pastas import gerenciador_pastas
-            pasta_criada = gerenciador_pastas.criar_pasta_pintura(pintura_id, titulo)
-            print(f"Pasta criada para pintura: {pasta_criada}")
-        except Exception as e:
-            print(f"Erro ao criar pasta (nao critico): {e}")
-        
-        # Adicionar à série se especificado
-        if serie_id:
+            # Inserir pintura principal
             cursor.execute("""
-            INSERT INTO pintura_serie (pintura_id, serie_id)
-            VALUES (?, ?)
-            """, (pintura_id, serie_id))
-        
-        # Adicionar à exposição se especificado
-        if exposicao_id:
-            cursor.execute("""
-            INSERT INTO pintura_exposicao (pintura_id, exposicao_id)
-            VALUES (?, ?)
-            """, (pintura_id, exposicao_id))
-        
-        # Adicionar preço se especificado
-        if preco:
-            from datetime import datetime
-            data_preco = datetime.now().strftime("%Y-%m-%d")
-            cursor.execute("""
-            INSERT INTO precos (pintura_id, valor, data_avaliacao)
-            VALUES (?, ?, ?)
-            """, (pintura_id, preco, data_preco))
-        
-        conn.commit()
-        print("Pintura adicionada com sucesso!")
-        return pintura_id
-        
-    except Exception as e:
-        conn.rollback()
-        print(f"Erro ao adicionar pintura: {e}")
-        raise e
-    finally:
-        conn.close()
+            INSERT INTO pinturas (titulo, tecnica, tamanho, data, local)
+            VALUES (?, ?, ?, ?, ?)
+            """, (titulo, tecnica, tamanho, data, local))
+
+            pintura_id = cursor.lastrowid
+
+            # Criar pasta automática para a pintura
+            try:
+                from .gerenciador_pastas import gerenciador_pastas
+                pasta_criada = gerenciador_pastas.criar_pasta_pintura(pintura_id, titulo)
+                print(f"Pasta criada para pintura: {pasta_criada}")
+            except Exception as e:
+                print(f"Erro ao criar pasta (nao critico): {e}")
+
+            # Adicionar à série se especificado
+            if serie_id:
+                cursor.execute("""
+                INSERT INTO pintura_serie (pintura_id, serie_id)
+                VALUES (?, ?)
+                """, (pintura_id, serie_id))
+
+            # Adicionar à exposição se especificado
+            if exposicao_id:
+                cursor.execute("""
+                INSERT INTO pintura_exposicao (pintura_id, exposicao_id)
+                VALUES (?, ?)
+                """, (pintura_id, exposicao_id))
+
+            # Adicionar preço se especificado
+            if preco:
+                from datetime import datetime
+                data_preco = datetime.now().strftime("%Y-%m-%d")
+                cursor.execute("""
+                INSERT INTO precos (pintura_id, preco, data)
+                VALUES (?, ?, ?)
+                """, (pintura_id, preco, data_preco))
+
+            conn.commit()
+            # Contagem de obras da série/exposição mudou
+            if serie_id:
+                cache_detalhes.invalidar("serie", serie_id)
+            if exposicao_id:
+                cache_detalhes.invalidar("exposicao", exposicao_id)
+            print("Pintura adicionada com sucesso!")
+            return pintura_id
+
+        except Exception as e:
+            conn.rollback()
+            print(f"Erro ao adicionar pintura: {e}")
+            raise e
 
 
 def listar_pinturas(db_path=None):
     """Listar todas as pinturas"""
-    if db_path is None:
-        db_path = "C:\\Users\\virtu\\Desktop\\EDU\\Programação\\DB\\Data\\Data.db"
-    
-    conn = sql.connect(db_path)
-    cursor = conn.cursor()
-    
-    cursor.execute("SELECT * FROM pinturas")
-    pinturas = cursor.fetchall()
-    
-    conn.close()
+    with gerenciador_conexoes.conexao(db_path) as conn:
+        cursor = conn.cursor()
+
+        cursor.execute("SELECT * FROM pinturas")
+        pinturas = cursor.fetchall()
+
     return pinturas
 
+def contar_pinturas(db_path=None):
+    """Quantidade total de pinturas"""
+    return paginacao.contar(CONSULTA_LISTAGEM, db_path=db_path)
+
+def listar_pinturas_pagina(offset, limite, ordem=0, descendente=False, db_path=None):
+    """Listar uma página de pinturas ordenada pela coluna indicada"""
+    return paginacao.carregar_pagina(CONSULTA_LISTAGEM, COLUNAS_LISTAGEM, offset, limite,
+                                     ordem, descendente, db_path=db_path)
+
 def buscar_pintura(pintura_id, db_path=None):
     """Buscar uma pintura específica por ID"""
-    if db_path is None:
-        db_path = "C:\\Users\\virtu\\Desktop\\EDU\\Programação\\DB\\Data\\Data.db"
-    
-    conn = sql.connect(db_path)
-    cursor = conn.cursor()
-    
-    cursor.execute("SELECT * FROM pinturas WHERE id = ?", (pintura_id,))
-    pintura = cursor.fetchone()
-    
-    conn.close()
+    with gerenciador_conexoes.conexao(db_path) as conn:
+        cursor = conn.cursor()
+
+        cursor.execute("SELECT * FROM pinturas WHERE id = ?", (pintura_id,))
+        pintura = cursor.fetchone()
+
     return pintura
 
+def buscar_pinturas(pintura_ids, db_path=None):
+    """
+    Buscar várias pinturas por ID com uma consulta por fatia de ids
+
+    Returns:
+        dict: {pintura_id: linha de pinturas} na ordem recebida (ids inexistentes ficam de fora)
+    """
+    ids = _ids_unicos(pintura_ids)
+    encontradas = {}
+    with gerenciador_conexoes.conexao(db_path) as conn:
+        cursor = conn.cursor()
+
+        for fatia in _fatias(ids):
+            marcadores = ", ".join("?" for _ in fatia)
+            cursor.execute(f"SELECT * FROM pinturas WHERE id IN ({marcadores})", fatia)
+            for pintura in cursor.fetchall():
+                encontradas[pintura[0]] = pintura
+
+    return {pintura_id: encontradas[pintura_id] for pintura_id in ids if pintura_id in encontradas}
+
 def atualizar_pintura(pintura_id, titulo, tecnica, tamanho, data, local, preco=None):
     """Atualizar pintura existente"""
-    conn = sql.connect("C:\\Users\\virtu\\Desktop\\EDU\\Programação\\DB\\Data\\Data.db")
-    cursor = conn.cursor()
-    
-    try:
-        cursor.execute("""
-        UPDATE pinturas
-        SET titulo = ?, tecnica = ?, tamanho = ?, data = ?, local = ?
-        WHERE id = ?
-        """, (titulo, tecnica, tamanho, data, local, pintura_id))
-        
-        conn.commit()
-        print("Pintura atualizada com sucesso!")
-        return True
-    except Exception as e:
-        print(f"Erro ao atualizar pintura: {e}")
-        return False
-    finally:
-        conn.close()
+    with gerenciador_conexoes.conexao() as conn:
+        cursor = conn.cursor()
+
+        try:
+            cursor.execute("""
+            UPDATE pinturas
+            SET titulo = ?, tecnica = ?, tamanho = ?, data = ?, local = ?
+            WHERE id = ?
+            """, (titulo, tecnica, tamanho, data, local, pintura_id))
+
+            conn.commit()
+            cache_detalhes.invalidar("pintura", pintura_id)
+            print("Pintura atualizada com sucesso!")
+            return True
+        except Exception as e:
+            print(f"Erro ao atualizar pintura: {e}")
+            return False
 
 def remover_pintura(pintura_id):
-    """Remover pintura do banco de dados"""
-    conn = sql.connect("C:\\Users\\virtu\\Desktop\\EDU\\Programação\\DB\\Data\\Data.db")
-    cursor = conn.cursor()
-    
+    """Remover pintura do banco de dados (com fotos, preços, locais, vínculos e pasta)"""
+    from .exclusao import excluir_pinturas
     try:
-        cursor.execute("DELETE FROM pinturas WHERE id = ?", (pintura_id,))
-        
-        conn.commit()
+        excluir_pinturas([pintura_id])
         print(f"Pintura {pintura_id} removida com sucesso!")
         return True
     except Exception as e:
         print(f"Erro ao remover pintura: {e}")
         return False
-    finally:
-        conn.close()
+
+def remover_pinturas(pintura_ids, db_path=None):
+    """
+    Remover várias pinturas (e seus dependentes) em uma única transação
+
+    Returns:
+        int: quantidade de pinturas removidas (0 em caso de erro)
+    """
+    from .exclusao import excluir_pinturas
+    try:
+        removidas = excluir_pinturas(pintura_ids, db_path=db_path)["pinturas"]
+    except Exception as e:
+        print(f"Erro ao remover pinturas: {e}")
+        return 0
+    return removidas
 
 def busca_filtros(titulo=None, tecnica=None, tamanho=None, data=None, local=None):
-    conn = sql.connect("C:\\Users\\virtu\\Desktop\\EDU\\Programação\\DB\\Data\\Data.db")
-    cursor = conn.cursor()
-    
-    query = "SELECT * FROM pinturas WHERE 1=1"
-    params = []
-    
-    if titulo:
-        query += " AND titulo LIKE ?"
-        params.append(f"%{titulo}%")
-    if tecnica:
-        query += " AND tecnica LIKE ?"
-        params.append(f"%{tecnica}%")
-    if tamanho:
-        query += " AND tamanho LIKE ?"
-        params.append(f"%{tamanho}%")
-    if data:
-        query += " AND data LIKE ?"
-        params.append(f"%{data}%")
-    if local:
-        query += " AND local LIKE ?"
-        params.append(f"%{local}%")
-    
-    cursor.execute(query, params)
-    resultados = cursor.fetchall()
-    
-    conn.close()
+    with gerenciador_conexoes.conexao() as conn:
+        # Título, técnica e local usam o índice FTS5 quando disponível
+        expressao, atendidas = None, []
+        if indices_disponiveis(conn):
+            expressao, atendidas = montar_expressao({"titulo": titulo, "tecnica": tecnica, "local": local})
+
+        if expressao:
+            query = """
+            SELECT p.* FROM busca_pinturas
+            JOIN pinturas p ON p.id = busca_pinturas.rowid
+            WHERE busca_pinturas MATCH ?
+            """
+            params = [expressao]
+        else:
+            query = "SELECT * FROM pinturas p WHERE 1=1"
+            params = []
+
+        if titulo and "titulo" not in atendidas:
+            query += " AND p.titulo LIKE ?"
+            params.append(f"%{titulo}%")
+        if tecnica and "tecnica" not in atendidas:
+            query += " AND p.tecnica LIKE ?"
+            params.append(f"%{tecnica}%")
+        if tamanho:
+            query += " AND p.tamanho LIKE ?"
+            params.append(f"%{tamanho}%")
+        if data:
+            query += " AND p.data LIKE ?"
+            params.append(f"%{data}%")
+        if local and "local" not in atendidas:
+            query += " AND p.local LIKE ?"
+            params.append(f"%{local}%")
+
+        # Resultados mais relevantes primeiro
+        if expressao:
+            query += " ORDER BY busca_pinturas.rank"
+
+        cursor = conn.cursor()
+        cursor.execute(query, params)
+        resultados = cursor.fetchall()
+
     return resultados
 
-def busca_avancada(titulo=None, tecnica=None, tamanho=None, data=None, local=None, 
-                   preco_min=None, preco_max=None, serie=None, exposicao=None):
+def busca_avancada(titulo=None, tecnica=None, tamanho=None, data=None, local=None,
+                   preco_min=None, preco_max=None, serie=None, exposicao=None, limite=None, db_path=None):
     """
     Busca avançada com filtros por preço, série e exposição
+
+    limite: quantidade máxima de resultados (None = todos)
     """
-    conn = sql.connect("C:\\Users\\virtu\\Desktop\\EDU\\Programação\\DB\\Data\\Data.db")
-    cursor = conn.cursor()
-    
-    # Query base com JOINs para incluir informações relacionadas
-    query = """
-    SELECT DISTINCT p.id, p.titulo, p.tecnica, p.tamanho, p.data, p.local, p.serie_id,
-           pr.valor as preco_atual, s.nome as serie_nome, 
-           GROUP_CONCAT(e.nome) as exposicoes
-    FROM pinturas p
-    LEFT JOIN (
-        SELECT pintura_id, valor, 
-               ROW_NUMBER() OVER (PARTITION BY pintura_id ORDER BY data_avaliacao DESC) as rn
-        FROM precos
-    ) pr ON p.id = pr.pintura_id AND pr.rn = 1
-    LEFT JOIN series s ON p.serie_id = s.id
-    LEFT JOIN pintura_exposicao pe ON p.id = pe.pintura_id
-    LEFT JOIN exposicoes e ON pe.exposicao_id = e.id
-    WHERE 1=1
-    """
-    params = []
-    
-    # Filtros básicos
-    if titulo:
-        query += " AND p.titulo LIKE ?"
-        params.append(f"%{titulo}%")
-    if tecnica:
-        query += " AND p.tecnica LIKE ?"
-        params.append(f"%{tecnica}%")
-    if tamanho:
-        query += " AND p.tamanho LIKE ?"
-        params.append(f"%{tamanho}%")
-    if data:
-        query += " AND p.data LIKE ?"
-        params.append(f"%{data}%")
-    if local:
-        query += " AND p.local LIKE ?"
-        params.append(f"%{local}%")
-    
-    # Filtros avançados
-    if preco_min:
-        query += " AND pr.valor >= ?"
-        params.append(float(preco_min))
-    if preco_max:
-        query += " AND pr.valor <= ?"
-        params.append(float(preco_max))
-    if serie:
-        query += " AND s.nome LIKE ?"
-        params.append(f"%{serie}%")
-    if exposicao:
-        query += " AND e.nome LIKE ?"
-        params.append(f"%{exposicao}%")
-    
-    query += " GROUP BY p.id ORDER BY p.titulo"
-    
-    cursor.execute(query, params)
-    resultados = cursor.fetchall()
-    
-    conn.close()
-    return resultados
\ No newline at end of file
+    with gerenciador_conexoes.conexao(db_path) as conn:
+        usar_indice = indices_disponiveis(conn)
+        expressao, atendidas = None, []
+        if usar_indice:
+            expressao, atendidas = montar_expressao({"titulo": titulo, "tecnica": tecnica, "local": local})
+
+        # Query base com JOINs para incluir informações relacionadas
+        query = """
+        SELECT DISTINCT p.id, p.titulo, p.tecnica, p.tamanho, p.data, p.local, ps.serie_id,
+               pa.preco as preco_atual, s.nome as serie_nome,
+               GROUP_CONCAT(DISTINCT e.nome) as exposicoes
+        FROM pinturas p
+        LEFT JOIN pintura_atual pa ON p.id = pa.pintura_id
+        LEFT JOIN pintura_serie ps ON p.id = ps.pintura_id
+        LEFT JOIN series s ON ps.serie_id = s.id
+        LEFT JOIN pintura_exposicao pe ON p.id = pe.pintura_id
+        LEFT JOIN exposicoes e ON pe.exposicao_id = e.id
+        """
+        params = []
+
+        if expressao:
+            query += """
+        JOIN busca_pinturas ON busca_pinturas.rowid = p.id
+        WHERE busca_pinturas MATCH ?
+        """
+            params.append(expressao)
+        else:
+            query += " WHERE 1=1"
+
+        # Filtros básicos
+        if titulo and "titulo" not in atendidas:
+            query += " AND p.titulo LIKE ?"
+            params.append(f"%{titulo}%")
+        if tecnica and "tecnica" not in atendidas:
+            query += " AND p.tecnica LIKE ?"
+            params.append(f"%{tecnica}%")
+        if tamanho:
+            query += " AND p.tamanho LIKE ?"
+            params.append(f"%{tamanho}%")
+        if data:
+            query += " AND p.data LIKE ?"
+            params.append(f"%{data}%")
+        if local and "local" not in atendidas:
+            query += " AND p.local LIKE ?"
+            params.append(f"%{local}%")
+
+        # Filtros avançados
+        if preco_min:
+            query += " AND pa.preco >= ?"
+            params.append(float(preco_min))
+        if preco_max:
+            query += " AND pa.preco <= ?"
+            params.append(float(preco_max))
+        if serie:
+            expressao_serie = montar_expressao({"nome": serie})[0] if usar_indice else None
+            if expressao_serie:
+                query += " AND s.id IN (SELECT rowid FROM busca_series WHERE busca_series MATCH ?)"
+                params.append(expressao_serie)
+            else:
+                query += " AND s.nome LIKE ?"
+                params.append(f"%{serie}%")
+        if exposicao:
+            expressao_expo = montar_expressao({"nome": exposicao})[0] if usar_indice else None
+            if expressao_expo:
+                query += " AND e.id IN (SELECT rowid FROM busca_exposicoes WHERE busca_exposicoes MATCH ?)"
+                params.append(expressao_expo)
+            else:
+                query += " AND e.nome LIKE ?"
+                params.append(f"%{exposicao}%")
+
+        query += " GROUP BY p.id"
+        query += " ORDER BY busca_pinturas.rank, p.titulo" if expressao else " ORDER BY p.titulo"
+        if limite:
+            query += " LIMIT ?"
+            params.append(int(limite))
+
+        cursor = conn.cursor()
+        cursor.execute(query, params)
+        resultados = cursor.fetchall()
+
+    return resultados
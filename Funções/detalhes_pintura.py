@@ -4,6 +4,144 @@ Módulo para buscar detalhes completos de pinturas
 Separado para evitar importação circular entre Main.py e UI_Dialogs
 """
 
+import json
+
+from .cache_detalhes import cache_detalhes
+from .conexao import gerenciador_conexoes
+
+# Limite de ids por consulta (abaixo do limite de variáveis do SQLite)
+TAMANHO_LOTE = 500
+
+# Uma única consulta traz a pintura e todos os seus relacionamentos como JSON
+QUERY_DETALHES = """
+SELECT p.*,
+    (SELECT json_group_array(json_array(f.id, f.caminho, f.descricao))
+     FROM (SELECT id, caminho, descricao FROM fotos
+           WHERE pintura_id = p.id ORDER BY id) f) AS fotos,
+    (SELECT json_group_array(json_array(e.id, e.nome, e.data, e.local))
+     FROM (SELECT e.id, e.nome, e.data, e.local
+           FROM exposicoes e
+           JOIN pintura_exposicao pe ON e.id = pe.exposicao_id
+           WHERE pe.pintura_id = p.id) e) AS exposicoes,
+    (SELECT json_group_array(json_array(l.id, l.local, l.data_entrada, l.data_saida, l.observacoes))
+     FROM (SELECT id, local, data_entrada, data_saida, observacoes FROM locais
+           WHERE pintura_id = p.id ORDER BY data_entrada DESC, id DESC) l) AS locais,
+    (SELECT json_group_array(json_array(pr.id, pr.preco, pr.data, pr.observacoes))
+     FROM (SELECT id, preco, data, observacoes FROM precos
+           WHERE pintura_id = p.id ORDER BY data DESC, id DESC) pr) AS precos,
+    (SELECT json_group_array(json_array(s.id, s.nome))
+     FROM (SELECT s.id, s.nome
+           FROM series s
+           JOIN pintura_serie ps ON s.id = ps.serie_id
+           WHERE ps.pintura_id = p.id) s) AS series
+FROM pinturas p
+WHERE p.id IN ({marcadores})
+"""
+
+
+def _lista_json(valor):
+    """Converter um array JSON agregado em lista de tuplas (como fetchall)"""
+    if not valor:
+        return []
+    return [tuple(item) for item in json.loads(valor)]
+
+
+def _obter_fotos_path(pintura_id, p):
+    """Endereço base das fotos (usando gerenciador de pastas)"""
+    from pathlib import Path
+    from Funções.gerenciador_pastas import gerenciador_pastas
+
+    try:
+        # Buscar informações da pintura para obter o título
+        if p and len(p) > 1:
+            titulo_pintura = p[1]  # Título da pintura
+            return gerenciador_pastas.obter_pasta_pintura(pintura_id, titulo_pintura)
+        return None
+    except Exception as e:
+        print(f"Erro ao obter pasta da pintura: {e}")
+        BASE_DIR = Path(__file__).parent.parent.resolve()
+        return str(BASE_DIR / "Bibliotecas" / "Pinturas" / f"{pintura_id:04d}_Sem_Nome")
+
+
+def _detalhes_vazios():
+    """Detalhes de uma pintura que não existe no banco"""
+    return {
+        "pintura": None,
+        "fotos": [],
+        "exposicoes": [],
+        "locais": [],
+        "precos": [],
+        "series": [],
+        "preco_atual": None,
+        "local_atual": None,
+        "fotos_path": None
+    }
+
+
+def carregar_detalhes(pintura_ids, db_path=None):
+    """
+    Buscar os detalhes de várias pinturas de uma só vez
+
+    Cada lote de ids é resolvido com uma única consulta, que traz a pintura
+    junto com fotos, exposições, locais, preços e séries. Pinturas que já
+    estão no cache de detalhes não são consultadas de novo.
+
+    Args:
+        pintura_ids: lista de IDs das pinturas
+        db_path: Caminho para o banco de dados
+
+    Returns:
+        dict: {pintura_id: dicionário de detalhes} (mesmo formato de mostrar_detalhes)
+    """
+    # Remover repetidos mantendo a ordem recebida
+    ids = list(dict.fromkeys(int(pintura_id) for pintura_id in pintura_ids))
+
+    # Pinturas já em cache não voltam ao banco
+    resultado = {}
+    for pintura_id in ids:
+        d = cache_detalhes.buscar("pintura", pintura_id, db_path)
+        if d is not None:
+            resultado[pintura_id] = d
+    faltantes = [pintura_id for pintura_id in ids if pintura_id not in resultado]
+    if not faltantes:
+        return resultado
+    geracao = cache_detalhes.geracao
+
+    detalhes = {}
+    with gerenciador_conexoes.conexao(db_path) as conn:
+        cursor = conn.cursor()
+
+        for inicio in range(0, len(faltantes), TAMANHO_LOTE):
+            lote = faltantes[inicio:inicio + TAMANHO_LOTE]
+            marcadores = ", ".join("?" for _ in lote)
+            cursor.execute(QUERY_DETALHES.format(marcadores=marcadores), lote)
+
+            for row in cursor.fetchall():
+                # As cinco últimas colunas são os relacionamentos agregados
+                p = tuple(row[:-5])
+                fotos, expos, locais, precos, series = (_lista_json(v) for v in row[-5:])
+                detalhes[p[0]] = {
+                    "pintura": p,
+                    "fotos": fotos,
+                    "exposicoes": expos,
+                    "locais": locais,
+                    "precos": precos,
+                    "series": series,
+                    # Preço e local atuais são os registros mais recentes do histórico
+                    "preco_atual": precos[0][1:] if precos else None,
+                    "local_atual": (locais[0][1], locais[0][2], locais[0][4]) if locais else None,
+                    "fotos_path": None
+                }
+
+    for pintura_id in faltantes:
+        d = detalhes.get(pintura_id) or _detalhes_vazios()
+        d["fotos_path"] = _obter_fotos_path(pintura_id, d["pintura"])
+        if d["pintura"] is not None:
+            cache_detalhes.guardar("pintura", pintura_id, d, db_path, geracao)
+        resultado[pintura_id] = d
+    return {pintura_id: resultado[pintura_id] for pintura_id in ids}
+
+
 def mostrar_detalhes(pintura_id, db_path):
     """
     Buscar todos os detalhes de uma pintura incluindo:
@@ -12,78 +150,20 @@ def mostrar_detalhes(pintura_id, db_path):
     - Exposições onde foi exibida
     - Histórico de locais
     - Histórico de preços
+    - Séries da pintura
     - Preço atual
     - Local atual
     - Caminho das fotos
-    
+
     Args:
         pintura_id: ID da pintura
         db_path: Caminho para o banco de dados
-        
+
     Returns:
         dict: Dicionário com todos os detalhes da pintura
     """
-    from pathlib import Path
-    
     # Converter para int se necessário
     if isinstance(pintura_id, str):
         pintura_id = int(pintura_id)
-    
-    BASE_DIR = Path(__file__).parent.parent.resolve()
-    
-    # 1) Dados principais da pintura
-    from Funções.crud_pint import buscar_pintura
-    p = buscar_pintura(pintura_id, db_path=str(db_path))
-    # p = (id, titulo, tecnica, tamanho, data, local)
-
-    # 2) Fotos da pintura
-    from Funções.crud_fotos import listar_fotos
-    fotos = listar_fotos(pintura_id, db_path=str(db_path))
-
-    # 3) Exposições onde a pintura foi exibida
-    from Funções.crud_pinturas_exposicoes import listar_exposicoes_pintura
-    expos = listar_exposicoes_pintura(pintura_id, db_path=str(db_path))
-
-    # 4) Locais onde a pintura esteve
-    from Funções.crud_locais import listar_locais_pintura
-    locais = listar_locais_pintura(pintura_id, db_path=str(db_path))
-
-    # 5) Histórico de preços da pintura
-    from Funções.crud_precos import listar_precos_pintura
-    precos = listar_precos_pintura(pintura_id, db_path=str(db_path))
-
-    # 6) Preço atual da pintura
-    from Funções.crud_precos import buscar_preco_atual
-    preco_atual = buscar_preco_atual(pintura_id, db_path=str(db_path))
-
-    # 7) Local atual da pintura
-    from Funções.crud_locais import buscar_local_atual
-    local_atual = buscar_local_atual(pintura_id, db_path=str(db_path))
-
-    # 8) Endereço base das fotos (usando gerenciador de pastas)
-    from Funções.gerenciador_pastas import gerenciador_pastas
-    try:
-        # Buscar informações da pintura para obter o título
-        if p and len(p) > 1:
-            titulo_pintura = p[1]  # Título da pintura
-            fotos_path = gerenciador_pastas.obter_pasta_pintura(pintura_id, titulo_pintura)
-        else:
-            fotos_path = None
-    except Exception as e:
-        print(f"Erro ao obter pasta da pintura: {e}")
-        fotos_path = str(BASE_DIR / "Bibliotecas" / "Pinturas" / f"{pintura_id:04d}_Sem_Nome")
-
-    # Criar dicionário com todos os detalhes
-    detalhes_pintura = {   
-        "pintura": p,
-        "fotos": fotos,
-        "exposicoes": expos,
-        "locais": locais,
-        "precos": precos,
-        "preco_atual": preco_atual,
-        "local_atual": local_atual,
-        "fotos_path": fotos_path
-    }
 
-    # Retornar o dicionário completo
-    return detalhes_pintura
+    return carregar_detalhes([pintura_id], db_path=db_path)[pintura_id]
@@ -0,0 +1,253 @@
+# -*- coding: utf-8 -*-
+"""
+Módulo de Exclusão de Pinturas
+Remove pinturas junto com tudo o que depende delas - fotos, preços, locais,
+séries, exposições (ON DELETE CASCADE, migração 6) e a pasta da biblioteca -
+e faz a varredura de registros, pastas e objetos órfãos deixados por
+exclusões antigas, seguida de um VACUUM opcional
+
+Uso pela linha de comando:
+    python -m Funções.exclusao varrer [--sem-vacuum] [--sem-arquivos]
+"""
+
+import os
+import shutil
+import threading
+import time
+from pathlib import Path
+
+from .cache_detalhes import cache_detalhes
+from .conexao import gerenciador_conexoes
+from .crud_pint import _fatias, _ids_unicos
+
+# Tabelas dependentes de pinturas (apagadas em cascata)
+DEPENDENTES = ("fotos", "precos", "locais", "pintura_serie", "pintura_exposicao")
+
+# Registros órfãos: tabela -> condição
+ORFAOS = {
+    "fotos": "pintura_id IS NULL OR pintura_id NOT IN (SELECT id FROM pinturas)",
+    "precos": "pintura_id IS NULL OR pintura_id NOT IN (SELECT id FROM pinturas)",
+    "locais": "pintura_id IS NULL OR pintura_id NOT IN (SELECT id FROM pinturas)",
+    "pintura_serie": "pintura_id NOT IN (SELECT id FROM pinturas) OR serie_id NOT IN (SELECT id FROM series)",
+    "pintura_exposicao": ("pintura_id NOT IN (SELECT id FROM pinturas)"
+                          " OR exposicao_id NOT IN (SELECT id FROM exposicoes)"),
+    "pintura_atual": "pintura_id NOT IN (SELECT id FROM pinturas)",
+    "pastas_fotos": "pintura_id NOT IN (SELECT id FROM pinturas)",
+    "arquivos_fotos": "pintura_id NOT IN (SELECT id FROM pinturas)",
+}
+
+
+def _apagar_arquivos(caminho):
+    """
+    Apagar arquivo ou pasta e contar os bytes liberados (arquivos com outro
+    hardlink não liberam espaço)
+
+    Returns:
+        int: bytes liberados
+    """
+    caminho = Path(caminho)
+    if not caminho.is_dir():
+        estado = caminho.lstat()
+        caminho.unlink()
+        return estado.st_size if estado.st_nlink == 1 else 0
+
+    liberados = 0
+    for raiz, _, arquivos in os.walk(caminho):
+        for nome in arquivos:
+            try:
+                liberados += _apagar_arquivos(os.path.join(raiz, nome))
+            except OSError as e:
+                print(f"Aviso: {nome} não removido: {e}")
+    shutil.rmtree(caminho, ignore_errors=True)
+    return liberados
+
+
+def _pastas_pintura(ids):
+    """Pastas da biblioteca das pinturas indicadas {id: caminho}"""
+    from .gerenciador_pastas import gerenciador_pastas
+    pastas = {}
+    for pintura_id in ids:
+        pasta = gerenciador_pastas.obter_pasta_pintura(pintura_id)
+        if pasta:
+            pastas[pintura_id] = pasta
+    return pastas
+
+
+def excluir_pinturas(pintura_ids, remover_pastas=True, db_path=None):
+    """
+    Excluir pinturas e todos os seus dependentes em uma única transação
+
+    As pastas da biblioteca só são apagadas depois do commit (se a exclusão
+    falhar, nada é removido do disco). Chamada dentro de outro `with
+    transacao()`, que ainda pode ser desfeito, as pastas ficam para a
+    varredura de órfãos.
+
+    Args:
+        pintura_ids: id ou lista de ids
+        remover_pastas: apagar também as pastas das pinturas em Bibliotecas/Pinturas
+
+    Returns:
+        dict: {"pinturas": n, "fotos": n, ..., "pastas": n, "bytes": n}
+    """
+    ids = _ids_unicos(pintura_ids)
+    relatorio = dict.fromkeys(("pinturas",) + DEPENDENTES + ("pastas", "bytes"), 0)
+    if not ids:
+        return relatorio
+
+    with gerenciador_conexoes.transacao(db_path) as conn:
+        aninhada = conn.unidade > 1
+        cascata = conn.execute("PRAGMA foreign_keys").fetchone()[0]
+        for fatia in _fatias(ids):
+            marcadores = ", ".join("?" for _ in fatia)
+            for tabela in DEPENDENTES:
+                if cascata:
+                    relatorio[tabela] += conn.execute(
+                        f"SELECT COUNT(*) FROM {tabela} WHERE pintura_id IN ({marcadores})", fatia
+                    ).fetchone()[0]
+                else:
+                    # Banco sem chaves estrangeiras ativas: apagar os dependentes à mão
+                    relatorio[tabela] += conn.execute(
+                        f"DELETE FROM {tabela} WHERE pintura_id IN ({marcadores})", fatia
+                    ).rowcount
+            relatorio["pinturas"] += conn.execute(
+                f"DELETE FROM pinturas WHERE id IN ({marcadores})", fatia
+            ).rowcount
+
+    cache_detalhes.invalidar("pintura", ids)
+    # Contagens de obras de séries e exposições podem ter mudado
+    cache_detalhes.invalidar_tipo("exposicao")
+    cache_detalhes.invalidar_tipo("serie")
+
+    if remover_pastas and not aninhada:
+        from .gerenciador_pastas import gerenciador_pastas
+        for pintura_id, pasta in _pastas_pintura(ids).items():
+            try:
+                relatorio["bytes"] += _apagar_arquivos(pasta)
+                relatorio["pastas"] += 1
+                gerenciador_pastas.remover_do_indice(gerenciador_pastas.pasta_pinturas, pintura_id)
+            except OSError as e:
+                print(f"Aviso: pasta da pintura {pintura_id} não removida: {e}")
+
+    print(f"🗑️ {relatorio['pinturas']} pintura(s) excluída(s) com "
+          f"{sum(relatorio[tabela] for tabela in DEPENDENTES)} registro(s) dependente(s) "
+          f"e {relatorio['pastas']} pasta(s)")
+    return relatorio
+
+
+def _tamanho_banco(conn):
+    paginas = conn.execute("PRAGMA page_count").fetchone()[0]
+    return paginas * conn.execute("PRAGMA page_size").fetchone()[0]
+
+
+def varrer_orfaos(arquivos=True, vacuum=True, db_path=None):
+    """
+    Remover registros órfãos, pastas de pinturas excluídas e objetos do
+    armazém de fotos sem uso; por fim, compactar o banco com VACUUM
+
+    Só são consideradas órfãs as pastas cujo id já foi usado por este banco
+    (até o último id do AUTOINCREMENT): uma biblioteca apontada para outro
+    banco não tem suas pastas apagadas.
+
+    Returns:
+        dict: {"linhas": {tabela: n}, "pastas": n, "objetos": n,
+               "bytes_arquivos": n, "bytes_banco": n, "segundos": s}
+    """
+    inicio = time.perf_counter()
+    relatorio = {"linhas": {}, "pastas": 0, "objetos": 0, "bytes_arquivos": 0, "bytes_banco": 0}
+
+    with gerenciador_conexoes.transacao(db_path) as conn:
+        for tabela, condicao in ORFAOS.items():
+            removidas = conn.execute(f"DELETE FROM {tabela} WHERE {condicao}").rowcount
+            if removidas:
+                relatorio["linhas"][tabela] = removidas
+        existentes = {linha[0] for linha in conn.execute("SELECT id FROM pinturas")}
+        ultimo_id = conn.execute("SELECT seq FROM sqlite_sequence WHERE name = 'pinturas'").fetchone()
+        ultimo_id = ultimo_id[0] if ultimo_id else max(existentes, default=0)
+        hashes = {linha[0] for linha in conn.execute("SELECT DISTINCT hash FROM fotos WHERE hash IS NOT NULL")}
+
+    if relatorio["linhas"]:
+        cache_detalhes.limpar()
+
+    if arquivos:
+        from .gerenciador_pastas import gerenciador_pastas
+        from .armazem_fotos import armazem_fotos
+
+        for pasta in gerenciador_pastas.listar_pastas_pinturas():
+            if pasta["id"] in existentes or pasta["id"] > ultimo_id:
+                continue
+            try:
+                relatorio["bytes_arquivos"] += _apagar_arquivos(pasta["caminho"])
+                relatorio["pastas"] += 1
+            except OSError as e:
+                print(f"Aviso: pasta {pasta['nome']} não removida: {e}")
+        if relatorio["pastas"]:
+            gerenciador_pastas.invalidar_indices()
+
+        # Objetos do armazém que nenhuma foto cadastrada usa mais
+        pasta_objetos = armazem_fotos.pasta_objetos
+        if pasta_objetos.is_dir():
+            for objeto in list(pasta_objetos.glob("*/*")):
+                if objeto.is_file() and objeto.name.split(".")[0] not in hashes:
+                    try:
+                        relatorio["bytes_arquivos"] += _apagar_arquivos(objeto)
+                        relatorio["objetos"] += 1
+                    except OSError as e:
+                        print(f"Aviso: objeto {objeto.name} não removido: {e}")
+            for subpasta in pasta_objetos.iterdir():
+                if subpasta.is_dir() and not any(subpasta.iterdir()):
+                    subpasta.rmdir()
+
+    if vacuum:
+        with gerenciador_conexoes.conexao(db_path) as conn:
+            antes = _tamanho_banco(conn)
+            try:
+                conn.execute("VACUUM")
+                conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+                relatorio["bytes_banco"] = antes - _tamanho_banco(conn)
+            except Exception as e:
+                # Outra conexão com leitura/escrita em andamento
+                print(f"Aviso: VACUUM não executado: {e}")
+
+    relatorio["segundos"] = round(time.perf_counter() - inicio, 2)
+    print(f"🧹 Varredura concluída: {sum(relatorio['linhas'].values())} registro(s), "
+          f"{relatorio['pastas']} pasta(s) e {relatorio['objetos']} objeto(s) órfãos; "
+          f"{(relatorio['bytes_arquivos'] + relatorio['bytes_banco']) / 1024 / 1024:.1f} MB liberados")
+    return relatorio
+
+
+def varrer_em_segundo_plano(ao_concluir=None, arquivos=True, vacuum=True, db_path=None):
+    """
+    Executar varrer_orfaos em uma thread de fundo
+
+    Args:
+        ao_concluir: função chamada (na thread de fundo) com o relatório,
+                     ou com a exceção se a varredura falhar
+
+    Returns:
+        threading.Thread iniciada
+    """
+    def executar():
+        try:
+            resultado = varrer_orfaos(arquivos, vacuum, db_path)
+        except Exception as e:
+            print(f"❌ Erro na varredura de órfãos: {e}")
+            resultado = e
+        if ao_concluir is not None:
+            ao_concluir(resultado)
+
+    thread = threading.Thread(target=executar, name="varredura-orfaos", daemon=True)
+    thread.start()
+    return thread
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Limpeza de registros e arquivos órfãos")
+    parser.add_argument("comando", choices=["varrer"])
+    parser.add_argument("--sem-vacuum", action="store_true", help="não compactar o banco")
+    parser.add_argument("--sem-arquivos", action="store_true", help="só o banco, sem pastas e objetos")
+    parser.add_argument("--banco", help="caminho do banco (padrão: o da configuração)")
+    args = parser.parse_args()
+
+    varrer_orfaos(arquivos=not args.sem_arquivos, vacuum=not args.sem_vacuum, db_path=args.banco)
@@ -0,0 +1,279 @@
+# -*- coding: utf-8 -*-
+"""
+Módulo de Exportação do Catálogo
+Exporta as pinturas com preço e local atuais, séries, exposições e fotos em
+CSV, JSON Lines ou formato colunar compactado, lendo o banco em blocos
+(fetchmany): a memória usada não depende do tamanho do acervo
+
+Os nomes das colunas são os mesmos aceitos pelo importador, então um arquivo
+exportado pode ser importado em outro banco.
+
+Uso pela linha de comando:
+    python -m Funções.exportador catalogo.csv [--colunas titulo,preco] [--db Data/Data.db]
+"""
+
+import csv
+import json
+import struct
+import zlib
+from pathlib import Path
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    # PyArrow é opcional: só o formato Parquet depende dele
+    pyarrow = None
+
+from .conexao import gerenciador_conexoes
+
+# Linhas lidas do banco (e gravadas) por bloco
+TAMANHO_BLOCO = 1000
+
+# Separador dos valores múltiplos (séries, exposições, fotos), como no importador
+SEPARADOR_LISTA = "|"
+
+# Colunas exportáveis e a expressão SQL de cada uma
+COLUNAS = {
+    "id": "p.id",
+    "titulo": "p.titulo",
+    "tecnica": "p.tecnica",
+    "tamanho": "p.tamanho",
+    "data": "p.data",
+    "local": "p.local",
+    "preco": "pa.preco",
+    "data_preco": "pa.data_preco",
+    "local_atual": "pa.local",
+    "data_entrada": "pa.data_entrada",
+    "series": f"""(SELECT group_concat(s.nome, '{SEPARADOR_LISTA}')
+                   FROM pintura_serie ps JOIN series s ON s.id = ps.serie_id
+                   WHERE ps.pintura_id = p.id)""",
+    "exposicoes": f"""(SELECT group_concat(e.nome, '{SEPARADOR_LISTA}')
+                       FROM pintura_exposicao pe JOIN exposicoes e ON e.id = pe.exposicao_id
+                       WHERE pe.pintura_id = p.id)""",
+    "fotos": f"""(SELECT group_concat(f.caminho, '{SEPARADOR_LISTA}')
+                  FROM fotos f WHERE f.pintura_id = p.id)"""
+}
+
+# Cabeçalho do formato colunar
+ASSINATURA_COLUNAR = b"DCCOL1\n"
+
+# Extensão de arquivo -> formato
+FORMATOS = {
+    ".csv": "csv",
+    ".jsonl": "jsonl",
+    ".ndjson": "jsonl",
+    ".colz": "colunar",
+    ".parquet": "parquet"
+}
+
+
+def _consulta(colunas):
+    """SELECT só com as colunas pedidas (as subconsultas das demais não rodam)"""
+    desconhecidas = [coluna for coluna in colunas if coluna not in COLUNAS]
+    if desconhecidas:
+        raise ValueError(f"Colunas desconhecidas: {', '.join(desconhecidas)}")
+
+    campos = ",\n       ".join(f"{COLUNAS[coluna]} AS {coluna}" for coluna in colunas)
+    return f"""
+    SELECT {campos}
+    FROM pinturas p
+    LEFT JOIN pintura_atual pa ON pa.pintura_id = p.id
+    ORDER BY p.id
+    """
+
+
+def iterar_blocos(colunas=None, tamanho_bloco=TAMANHO_BLOCO, db_path=None):
+    """
+    Gerar as linhas do catálogo em blocos
+
+    Yields:
+        list de tuplas na ordem de `colunas` (no máximo `tamanho_bloco` por bloco)
+    """
+    colunas = list(colunas or COLUNAS)
+    with gerenciador_conexoes.conexao(db_path) as conn:
+        cursor = conn.cursor()
+        cursor.execute(_consulta(colunas))
+        while True:
+            linhas = cursor.fetchmany(tamanho_bloco)
+            if not linhas:
+                break
+            yield linhas
+
+
+# ---- Escritores ----
+
+class _EscritorCSV:
+    def __init__(self, arquivo, colunas):
+        self.arquivo = open(arquivo, "w", newline="", encoding="utf-8-sig")
+        self.csv = csv.writer(self.arquivo, delimiter=";")
+        self.csv.writerow(colunas)
+
+    def escrever(self, linhas):
+        self.csv.writerows(linhas)
+
+    def fechar(self):
+        self.arquivo.close()
+
+
+class _EscritorJSONL:
+    def __init__(self, arquivo, colunas):
+        self.arquivo = open(arquivo, "w", encoding="utf-8")
+        self.colunas = colunas
+
+    def escrever(self, linhas):
+        self.arquivo.writelines(
+            json.dumps(dict(zip(self.colunas, linha)), ensure_ascii=False) + "\n" for linha in linhas
+        )
+
+    def fechar(self):
+        self.arquivo.close()
+
+
+class _EscritorColunar:
+    """
+    Formato colunar próprio, sem dependências
+
+        assinatura
+        grupo*: tamanho (4 bytes) + cabeçalho JSON {"linhas", "colunas": [[nome, bytes], ...]}
+                seguido do bloco zlib de cada coluna (lista JSON de valores)
+
+    Cada bloco exportado vira um grupo de linhas; ler_colunar() descompacta
+    só as colunas pedidas.
+    """
+
+    def __init__(self, arquivo, colunas):
+        self.arquivo = open(arquivo, "wb")
+        self.colunas = colunas
+        self.arquivo.write(ASSINATURA_COLUNAR)
+
+    def escrever(self, linhas):
+        blocos = [
+            zlib.compress(json.dumps(list(valores), ensure_ascii=False).encode("utf-8"))
+            for valores in zip(*linhas)
+        ]
+        cabecalho = json.dumps({
+            "linhas": len(linhas),
+            "colunas": [[nome, len(bloco)] for nome, bloco in zip(self.colunas, blocos)]
+        }).encode("utf-8")
+
+        self.arquivo.write(struct.pack(">I", len(cabecalho)))
+        self.arquivo.write(cabecalho)
+        for bloco in blocos:
+            self.arquivo.write(bloco)
+
+    def fechar(self):
+        self.arquivo.close()
+
+
+class _EscritorParquet:
+    def __init__(self, arquivo, colunas):
+        if pyarrow is None:
+            raise ImportError("O formato Parquet precisa do PyArrow (pip install pyarrow)")
+        self.colunas = colunas
+        # Tipos fixos: um bloco só com nulos não pode mudar o esquema do arquivo
+        self.esquema = pyarrow.schema([
+            (nome, pyarrow.int64() if nome == "id" else pyarrow.float64() if nome == "preco" else pyarrow.string())
+            for nome in colunas
+        ])
+        self.escritor = pyarrow.parquet.ParquetWriter(arquivo, self.esquema, compression="zstd")
+
+    def escrever(self, linhas):
+        dados = {}
+        for nome, valores in zip(self.colunas, zip(*linhas)):
+            if nome not in ("id", "preco"):
+                valores = [None if valor is None else str(valor) for valor in valores]
+            dados[nome] = list(valores)
+        self.escritor.write_table(pyarrow.table(dados, schema=self.esquema))
+
+    def fechar(self):
+        self.escritor.close()
+
+
+ESCRITORES = {
+    "csv": _EscritorCSV,
+    "jsonl": _EscritorJSONL,
+    "colunar": _EscritorColunar,
+    "parquet": _EscritorParquet
+}
+
+
+def exportar_catalogo(arquivo, formato=None, colunas=None, tamanho_bloco=TAMANHO_BLOCO,
+                      db_path=None, progresso=None):
+    """
+    Exportar o catálogo de pinturas
+
+    Args:
+        arquivo: caminho do arquivo gerado
+        formato: "csv", "jsonl", "colunar" ou "parquet" (padrão: pela extensão)
+        colunas: lista de colunas de COLUNAS a exportar (padrão: todas)
+        tamanho_bloco: linhas lidas e gravadas por vez
+        progresso: função chamada a cada bloco com o total de linhas gravadas
+
+    Returns:
+        int: quantidade de linhas exportadas
+    """
+    if formato is None:
+        formato = FORMATOS.get(Path(arquivo).suffix.lower())
+    if formato not in ESCRITORES:
+        raise ValueError(f"Formato de exportação não suportado: {formato} "
+                         f"(use {', '.join(ESCRITORES)})")
+
+    colunas = list(colunas or COLUNAS)
+    escritor = ESCRITORES[formato](arquivo, colunas)
+    total = 0
+    try:
+        for linhas in iterar_blocos(colunas, tamanho_bloco, db_path):
+            escritor.escrever(linhas)
+            total += len(linhas)
+            if progresso:
+                progresso(total)
+    finally:
+        escritor.fechar()
+
+    print(f"📤 {total} pinturas exportadas para {arquivo}")
+    return total
+
+
+def ler_colunar(arquivo, colunas=None):
+    """
+    Ler um arquivo do formato colunar, grupo a grupo
+
+    Yields:
+        dict {coluna: lista de valores} de cada grupo de linhas
+    """
+    with open(arquivo, "rb") as entrada:
+        if entrada.read(len(ASSINATURA_COLUNAR)) != ASSINATURA_COLUNAR:
+            raise ValueError(f"{arquivo} não está no formato colunar")
+
+        while True:
+            tamanho = entrada.read(4)
+            if not tamanho:
+                return
+            cabecalho = json.loads(entrada.read(struct.unpack(">I", tamanho)[0]))
+
+            grupo = {}
+            for nome, tamanho_bloco in cabecalho["colunas"]:
+                if colunas is None or nome in colunas:
+                    grupo[nome] = json.loads(zlib.decompress(entrada.read(tamanho_bloco)))
+                else:
+                    entrada.seek(tamanho_bloco, 1)
+            yield grupo
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Exportar o catálogo de pinturas")
+    parser.add_argument("arquivo", help="arquivo .csv, .jsonl, .colz ou .parquet")
+    parser.add_argument("--formato", choices=list(ESCRITORES), help="formato (padrão: pela extensão)")
+    parser.add_argument("--colunas", help=f"colunas separadas por vírgula ({', '.join(COLUNAS)})")
+    parser.add_argument("--db", help="banco de dados de origem (padrão: o da configuração)")
+    args = parser.parse_args()
+
+    exportar_catalogo(
+        args.arquivo,
+        args.formato,
+        [coluna.strip() for coluna in args.colunas.split(",")] if args.colunas else None,
+        db_path=args.db
+    )
@@ -5,6 +5,7 @@ Cria e organiza automaticamente as pastas para fotos de pinturas e exposições
 """
 
 import os
+import threading
 from pathlib import Path
 import shutil
 from datetime import datetime
@@ -23,14 +24,33 @@ class GerenciadorPastas:
         else:
             self.pasta_base = Path(pasta_base)
         
-        self._criar_estrutura_base()
+        # Índices id -> pasta, montados na primeira consulta
+        # pasta de origem -> {"mtime": mtime da pasta na varredura, "ids": {id: caminho}}
+        self._indices = {}
+        self._lock_indices = threading.Lock()
+        
+        # Estrutura: Bibliotecas/Exposições e Bibliotecas/Pinturas
+        self.pasta_exposicoes = self.pasta_base / "Exposições"
+        self.pasta_pinturas = self.pasta_base / "Pinturas"
+        
+        # Pastas criadas no primeiro uso (ou por preparar_estrutura), fora da importação
+        self._estrutura_pronta = False
+        self._lock_estrutura = threading.Lock()
+    
+    def preparar_estrutura(self):
+        """Garantir que a estrutura básica existe (só verifica o disco na primeira vez)"""
+        if self._estrutura_pronta:
+            return
+        with self._lock_estrutura:
+            if not self._estrutura_pronta:
+                self._criar_estrutura_base()
+                self._estrutura_pronta = True
     
     def _criar_estrutura_base(self):
         """Criar estrutura básica de pastas"""
         try:
-            # Estrutura: Bibliotecas/Exposições e Bibliotecas/Pinturas
-            self.pasta_exposicoes = self.pasta_base / "Exposições"
-            self.pasta_pinturas = self.pasta_base / "Pinturas"
+            if self.pasta_exposicoes.is_dir() and self.pasta_pinturas.is_dir():
+                return
             
             # Criar pastas se não existirem
             self.pasta_exposicoes.mkdir(parents=True, exist_ok=True)
@@ -47,6 +67,8 @@ class GerenciadorPastas:
     def criar_pasta_pintura(self, pintura_id, titulo_pintura):
         """Criar pasta específica para uma pintura"""
         try:
+            self.preparar_estrutura()
+            
             # Limpar nome para ser válido como nome de pasta
             nome_limpo = self._limpar_nome_arquivo(titulo_pintura)
             nome_pasta = f"{pintura_id:04d}_{nome_limpo}"
@@ -57,6 +79,7 @@ class GerenciadorPastas:
             # Criar apenas uma pasta simples para fotos
             (pasta_pintura / "Fotos").mkdir(exist_ok=True)
             
+            self._registrar_no_indice(self.pasta_pinturas, pintura_id, pasta_pintura)
             print(f"🎨 Pasta criada para pintura: {pasta_pintura}")
             return str(pasta_pintura)
             
@@ -67,6 +90,8 @@ class GerenciadorPastas:
     def criar_pasta_exposicao(self, exposicao_id, nome_exposicao):
         """Criar pasta específica para uma exposição"""
         try:
+            self.preparar_estrutura()
+            
             # Limpar nome para ser válido como nome de pasta
             nome_limpo = self._limpar_nome_arquivo(nome_exposicao)
             nome_pasta = f"{exposicao_id:04d}_{nome_limpo}"
@@ -80,6 +105,7 @@ class GerenciadorPastas:
             (pasta_exposicao / "Documentação").mkdir(exist_ok=True)
             (pasta_exposicao / "Obras_Expostas").mkdir(exist_ok=True)
             
+            self._registrar_no_indice(self.pasta_exposicoes, exposicao_id, pasta_exposicao)
             print(f"🖼️ Pasta criada para exposição: {pasta_exposicao}")
             return str(pasta_exposicao)
             
@@ -87,13 +113,67 @@ class GerenciadorPastas:
             print(f"❌ Erro ao criar pasta para exposição {exposicao_id}: {e}")
             return None
     
+    def _varrer_pasta(self, pasta_origem):
+        """Montar índice {id: caminho} das subpastas no formato 0001_Nome"""
+        ids = {}
+        with os.scandir(pasta_origem) as entradas:
+            for entrada in entradas:
+                prefixo, separador, _ = entrada.name.partition("_")
+                if separador and prefixo.isdigit() and entrada.is_dir():
+                    # Em caso de pastas repetidas, manter a primeira em ordem alfabética
+                    caminho_atual = ids.get(int(prefixo))
+                    if caminho_atual is None or entrada.path < caminho_atual:
+                        ids[int(prefixo)] = entrada.path
+        return ids
+
+    def _buscar_no_indice(self, pasta_origem, registro_id):
+        """Localizar pasta pelo id sem percorrer o diretório a cada consulta"""
+        self.preparar_estrutura()
+        pasta_origem = str(pasta_origem)
+        with self._lock_indices:
+            indice = self._indices.get(pasta_origem)
+            mtime = os.stat(pasta_origem).st_mtime_ns
+
+            # Diretório mudou desde a varredura (pastas criadas/removidas por fora)
+            if indice is None or (registro_id not in indice["ids"] and indice["mtime"] != mtime):
+                indice = {"mtime": mtime, "ids": self._varrer_pasta(pasta_origem)}
+                self._indices[pasta_origem] = indice
+
+            caminho = indice["ids"].get(registro_id)
+            if caminho and not os.path.isdir(caminho):
+                # Pasta removida: refazer índice
+                indice["ids"] = self._varrer_pasta(pasta_origem)
+                indice["mtime"] = mtime
+                caminho = indice["ids"].get(registro_id)
+            return caminho
+
+    def _registrar_no_indice(self, pasta_origem, registro_id, caminho):
+        """Atualizar índice após criar uma pasta"""
+        with self._lock_indices:
+            indice = self._indices.get(str(pasta_origem))
+            if indice is not None:
+                indice["ids"][registro_id] = str(caminho)
+                indice["mtime"] = os.stat(pasta_origem).st_mtime_ns
+
+    def remover_do_indice(self, pasta_origem, registro_id):
+        """Retirar do índice uma pasta excluída"""
+        with self._lock_indices:
+            indice = self._indices.get(str(pasta_origem))
+            if indice is not None:
+                indice["ids"].pop(registro_id, None)
+
+    def invalidar_indices(self):
+        """Descartar os índices (serão refeitos na próxima consulta)"""
+        with self._lock_indices:
+            self._indices.clear()
+
     def obter_pasta_pintura(self, pintura_id, titulo_pintura=None):
         """Obter caminho da pasta de uma pintura (criar se não existir)"""
         try:
             # Procurar pasta existente
-            for pasta in self.pasta_pinturas.iterdir():
-                if pasta.is_dir() and pasta.name.startswith(f"{pintura_id:04d}_"):
-                    return str(pasta)
+            pasta = self._buscar_no_indice(self.pasta_pinturas, int(pintura_id))
+            if pasta:
+                return pasta
             
             # Se não encontrou e tem título, criar nova
             if titulo_pintura:
@@ -109,9 +189,9 @@ class GerenciadorPastas:
         """Obter caminho da pasta de uma exposição (criar se não existir)"""
         try:
             # Procurar pasta existente
-            for pasta in self.pasta_exposicoes.iterdir():
-                if pasta.is_dir() and pasta.name.startswith(f"{exposicao_id:04d}_"):
-                    return str(pasta)
+            pasta = self._buscar_no_indice(self.pasta_exposicoes, int(exposicao_id))
+            if pasta:
+                return pasta
             
             # Se não encontrou e tem nome, criar nova
             if nome_exposicao:
@@ -157,6 +237,7 @@ class GerenciadorPastas:
     def listar_pastas_pinturas(self):
         """Listar todas as pastas de pinturas"""
         try:
+            self.preparar_estrutura()
             pastas = []
             for pasta in self.pasta_pinturas.iterdir():
                 if pasta.is_dir():
@@ -173,6 +254,7 @@ class GerenciadorPastas:
     def listar_pastas_exposicoes(self):
         """Listar todas as pastas de exposições"""
         try:
+            self.preparar_estrutura()
             pastas = []
             for pasta in self.pasta_exposicoes.iterdir():
                 if pasta.is_dir():
@@ -0,0 +1,421 @@
+# -*- coding: utf-8 -*-
+"""
+Módulo de Importação em Lote
+Importa pinturas de arquivos CSV ou JSON (inventários com milhares de obras)
+sem carregar o arquivo inteiro: as linhas são lidas em lotes, gravadas com
+executemany em uma transação por lote, e as pastas/fotos são criadas em
+paralelo por um pool de threads
+
+Colunas reconhecidas (CSV com cabeçalho, ou chaves dos objetos JSON):
+    titulo (obrigatória), tecnica, tamanho, data, local
+    preco, data_preco, observacoes_preco
+    local_atual, data_entrada
+    series, exposicoes   nomes separados por "|" (criados se não existirem)
+    fotos                caminhos separados por "|" (relativos ao arquivo importado)
+
+Uso pela linha de comando:
+    python -m Funções.importador inventario.csv [--db Data/Data.db]
+"""
+
+import csv
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+from .armazem_fotos import armazem_fotos
+from .cache_detalhes import cache_detalhes
+from .conexao import gerenciador_conexoes
+
+# Linhas gravadas por transação
+TAMANHO_LOTE = 500
+
+# Threads para criar pastas e copiar fotos
+MAX_TRABALHADORES = 4
+
+# Separador de valores múltiplos (séries, exposições, fotos) no CSV
+SEPARADOR_LISTA = "|"
+
+# Tamanho dos blocos lidos de um arquivo JSON com um array de objetos
+BLOCO_JSON = 64 * 1024
+
+
+# ---- Leitura em fluxo ----
+
+def ler_csv(caminho):
+    """Gerar um dicionário por linha do CSV (delimitador , ou ; detectado no cabeçalho)"""
+    with open(caminho, newline="", encoding="utf-8-sig") as arquivo:
+        cabecalho = arquivo.readline()
+        delimitador = ";" if cabecalho.count(";") > cabecalho.count(",") else ","
+        arquivo.seek(0)
+        for linha in csv.DictReader(arquivo, delimiter=delimitador):
+            yield {(chave or "").strip().lower(): valor for chave, valor in linha.items()}
+
+
+def ler_json(caminho):
+    """
+    Gerar os objetos de um arquivo JSON sem carregá-lo inteiro
+
+    Aceita JSON Lines (um objeto por linha) ou um array de objetos.
+    """
+    decodificador = json.JSONDecoder()
+    with open(caminho, encoding="utf-8-sig") as arquivo:
+        buffer = ""
+        dentro_array = False
+        fim_arquivo = False
+
+        while True:
+            # Pular espaços, vírgulas e colchetes entre os objetos
+            posicao = 0
+            while posicao < len(buffer) and buffer[posicao] in " \t\r\n,[]":
+                if buffer[posicao] == "[":
+                    dentro_array = True
+                posicao += 1
+            buffer = buffer[posicao:]
+
+            if not buffer:
+                if fim_arquivo:
+                    return
+                bloco = arquivo.read(BLOCO_JSON)
+                fim_arquivo = not bloco
+                buffer += bloco
+                continue
+
+            try:
+                objeto, fim = decodificador.raw_decode(buffer)
+            except json.JSONDecodeError:
+                if fim_arquivo:
+                    raise
+                # Objeto incompleto: ler mais um bloco
+                bloco = arquivo.read(BLOCO_JSON)
+                fim_arquivo = not bloco
+                buffer += bloco
+                continue
+
+            buffer = buffer[fim:]
+            if isinstance(objeto, list) and not dentro_array:
+                # Arquivo pequeno lido de uma vez como array
+                yield from objeto
+            else:
+                yield objeto
+
+
+def ler_registros(caminho):
+    """Escolher o leitor pela extensão do arquivo"""
+    extensao = Path(caminho).suffix.lower()
+    if extensao == ".csv":
+        return ler_csv(caminho)
+    if extensao in (".json", ".jsonl", ".ndjson"):
+        return ler_json(caminho)
+    raise ValueError(f"Formato não suportado: {extensao} (use .csv, .json ou .jsonl)")
+
+
+# ---- Conversão dos campos ----
+
+def _texto(valor):
+    if valor is None:
+        return None
+    valor = str(valor).strip()
+    return valor or None
+
+
+def _lista(valor):
+    """Lista a partir de uma lista JSON ou de um texto separado por |"""
+    if valor is None:
+        return []
+    if isinstance(valor, (list, tuple)):
+        return [str(v).strip() for v in valor if str(v).strip()]
+    return [parte.strip() for parte in str(valor).split(SEPARADOR_LISTA) if parte.strip()]
+
+
+def _preco(valor):
+    """Converter preço (aceita 'R$ 1.234,56', '1234.56' ou número)"""
+    if valor is None or valor == "":
+        return None
+    if isinstance(valor, (int, float)):
+        return float(valor)
+    texto = str(valor).replace("R$", "").replace(" ", "").strip()
+    if not texto:
+        return None
+    if "," in texto:
+        texto = texto.replace(".", "").replace(",", ".")
+    return float(texto)
+
+
+def _campo(registro, *chaves):
+    """Valor da primeira chave presente (um preço 0 não conta como ausente)"""
+    for chave in chaves:
+        valor = registro.get(chave)
+        if valor is not None:
+            return valor
+    return None
+
+
+def _normalizar(registro):
+    """Validar e converter um registro lido (ValueError com a causa se inválido)"""
+    registro = {str(chave).strip().lower(): valor for chave, valor in registro.items()}
+
+    titulo = _texto(_campo(registro, "titulo", "título"))
+    if not titulo:
+        raise ValueError("título ausente")
+
+    valor_preco = _campo(registro, "preco", "preço")
+    try:
+        preco = _preco(valor_preco)
+    except ValueError:
+        raise ValueError(f"preço inválido: {valor_preco!r}")
+
+    return {
+        "titulo": titulo,
+        "tecnica": _texto(_campo(registro, "tecnica", "técnica")),
+        "tamanho": _texto(registro.get("tamanho")),
+        "data": _texto(registro.get("data")),
+        "local": _texto(registro.get("local")),
+        "preco": preco,
+        "data_preco": _texto(registro.get("data_preco")),
+        "observacoes_preco": _texto(registro.get("observacoes_preco")),
+        "local_atual": _texto(registro.get("local_atual")),
+        "data_entrada": _texto(registro.get("data_entrada")),
+        "series": _lista(_campo(registro, "series", "serie")),
+        "exposicoes": _lista(_campo(registro, "exposicoes", "exposicao")),
+        "fotos": _lista(_campo(registro, "fotos", "foto")),
+    }
+
+
+# ---- Importação ----
+
+class ImportadorPinturas:
+    """
+    Importador de pinturas em lotes
+
+        importador = ImportadorPinturas(db_path)
+        relatorio = importador.importar("inventario.csv")
+        for linha, mensagem in relatorio["erros"]:
+            ...
+    """
+
+    def __init__(self, db_path=None, tamanho_lote=TAMANHO_LOTE, max_trabalhadores=MAX_TRABALHADORES,
+                 progresso=None):
+        """
+        Args:
+            db_path: banco de destino (None = banco padrão do pool)
+            tamanho_lote: linhas por transação
+            max_trabalhadores: threads para pastas e fotos
+            progresso: função chamada após cada lote com o relatório parcial
+                       (padrão: imprimir no console)
+        """
+        self.db_path = db_path
+        self.tamanho_lote = max(int(tamanho_lote), 1)
+        self.max_trabalhadores = max(int(max_trabalhadores), 1)
+        self.progresso = progresso or self._imprimir_progresso
+        self._series = {}
+        self._exposicoes = {}
+
+    @staticmethod
+    def _imprimir_progresso(relatorio):
+        print(f"📥 {relatorio['lidas']} linhas lidas, {relatorio['importadas']} pinturas importadas, "
+              f"{relatorio['fotos_copiadas']} fotos, {len(relatorio['erros'])} erro(s)")
+
+    def importar(self, caminho):
+        """
+        Importar um arquivo CSV/JSON
+
+        Returns:
+            dict: lidas, importadas, fotos_copiadas, erros [(linha, mensagem)],
+                  pintura_ids e segundos
+        """
+        inicio = time.perf_counter()
+        pasta_arquivo = Path(caminho).resolve().parent
+        relatorio = {
+            "lidas": 0,
+            "importadas": 0,
+            "fotos_copiadas": 0,
+            "erros": [],
+            "pintura_ids": [],
+            "segundos": 0.0
+        }
+
+        lote = []
+        pendentes = []  # tarefas de pastas/fotos do lote anterior
+
+        with ThreadPoolExecutor(max_workers=self.max_trabalhadores, thread_name_prefix="importador") as pool:
+            for numero, registro in enumerate(ler_registros(caminho), start=1):
+                relatorio["lidas"] += 1
+                try:
+                    lote.append((numero, _normalizar(registro)))
+                except (ValueError, AttributeError) as e:
+                    relatorio["erros"].append((numero, str(e)))
+
+                if len(lote) >= self.tamanho_lote:
+                    novas = self._processar_lote(lote, pasta_arquivo, pool, relatorio)
+                    # Um lote de arquivos em andamento enquanto o próximo é gravado
+                    self._concluir_arquivos(pendentes, relatorio)
+                    pendentes = novas
+                    lote = []
+                    self.progresso(relatorio)
+
+            if lote:
+                novas = self._processar_lote(lote, pasta_arquivo, pool, relatorio)
+                self._concluir_arquivos(pendentes, relatorio)
+                pendentes = novas
+            self._concluir_arquivos(pendentes, relatorio)
+
+        relatorio["segundos"] = time.perf_counter() - inicio
+        self.progresso(relatorio)
+        return relatorio
+
+    # ---- Banco ----
+
+    def _ids_por_nome(self, cursor, tabela, cache, nomes):
+        """
+        Ids de séries/exposições pelo nome (criando as que não existem)
+
+        A comparação usa str.casefold(): o lower() do SQLite só conhece
+        letras ASCII e não acharia "Água Viva" ao importar "água viva".
+
+        Returns:
+            dict: {nome.casefold(): id} dos nomes que não estavam no cache
+                  (só entram nele depois do commit do lote)
+        """
+        novos = {}
+        faltantes = [nome for nome in dict.fromkeys(nomes) if nome.casefold() not in cache]
+        if faltantes:
+            procurados = {nome.casefold() for nome in faltantes}
+            cursor.execute(f"SELECT id, nome FROM {tabela} ORDER BY id")
+            for registro_id, nome in cursor.fetchall():
+                chave = (nome or "").casefold()
+                if chave in procurados and chave not in novos:
+                    novos[chave] = registro_id
+
+            for nome in faltantes:
+                if nome.casefold() not in novos:
+                    cursor.execute(f"INSERT INTO {tabela} (nome) VALUES (?)", (nome,))
+                    novos[nome.casefold()] = cursor.lastrowid
+        return novos
+
+    def _processar_lote(self, lote, pasta_arquivo, pool, relatorio):
+        """Gravar um lote em uma transação e agendar pastas/fotos das pinturas gravadas"""
+        hoje = datetime.now().strftime("%Y-%m-%d")
+        try:
+            with gerenciador_conexoes.transacao(self.db_path) as conn:
+                cursor = conn.cursor()
+
+                cursor.executemany("""
+                INSERT INTO pinturas (titulo, tecnica, tamanho, data, local)
+                VALUES (?, ?, ?, ?, ?)
+                """, [(r["titulo"], r["tecnica"], r["tamanho"], r["data"], r["local"]) for _, r in lote])
+
+                # Dentro da transação ninguém mais grava: os ids são consecutivos
+                ultimo_id = conn.execute("SELECT last_insert_rowid()").fetchone()[0]
+                ids = range(ultimo_id - len(lote) + 1, ultimo_id + 1)
+
+                cursor.executemany("""
+                INSERT INTO precos (pintura_id, preco, data, observacoes)
+                VALUES (?, ?, ?, ?)
+                """, [(pid, r["preco"], r["data_preco"] or hoje, r["observacoes_preco"])
+                      for pid, (_, r) in zip(ids, lote) if r["preco"] is not None])
+
+                cursor.executemany("""
+                INSERT INTO locais (pintura_id, local, data_entrada)
+                VALUES (?, ?, ?)
+                """, [(pid, r["local_atual"], r["data_entrada"] or hoje)
+                      for pid, (_, r) in zip(ids, lote) if r["local_atual"]])
+
+                novas_series = self._ids_por_nome(cursor, "series", self._series,
+                                                  [s for _, r in lote for s in r["series"]])
+                series = {**self._series, **novas_series}
+                cursor.executemany("""
+                INSERT OR IGNORE INTO pintura_serie (pintura_id, serie_id)
+                VALUES (?, ?)
+                """, [(pid, series[s.casefold()]) for pid, (_, r) in zip(ids, lote) for s in r["series"]])
+
+                novas_exposicoes = self._ids_por_nome(cursor, "exposicoes", self._exposicoes,
+                                                      [e for _, r in lote for e in r["exposicoes"]])
+                exposicoes = {**self._exposicoes, **novas_exposicoes}
+                cursor.executemany("""
+                INSERT OR IGNORE INTO pintura_exposicao (pintura_id, exposicao_id)
+                VALUES (?, ?)
+                """, [(pid, exposicoes[e.casefold()]) for pid, (_, r) in zip(ids, lote) for e in r["exposicoes"]])
+        except Exception as e:
+            # Lote inteiro desfeito pela transação
+            for numero, _ in lote:
+                relatorio["erros"].append((numero, f"lote não gravado: {e}"))
+            return []
+
+        # Lote gravado: só agora os ids criados valem para os próximos lotes
+        self._series.update(novas_series)
+        self._exposicoes.update(novas_exposicoes)
+        relatorio["importadas"] += len(lote)
+        relatorio["pintura_ids"].extend(ids)
+        cache_detalhes.invalidar_tipo("serie")
+        cache_detalhes.invalidar_tipo("exposicao")
+
+        return [
+            (numero, pool.submit(self._criar_arquivos, pid, r["titulo"], r["fotos"], pasta_arquivo))
+            for pid, (numero, r) in zip(ids, lote)
+        ]
+
+    # ---- Pastas e fotos ----
+
+    @staticmethod
+    def _criar_arquivos(pintura_id, titulo, fotos, pasta_arquivo):
+        """Criar a pasta da pintura e copiar as fotos (executado no pool de threads)"""
+        from .gerenciador_pastas import gerenciador_pastas
+
+        pasta = gerenciador_pastas.criar_pasta_pintura(pintura_id, titulo)
+        if not pasta:
+            raise OSError("pasta da pintura não criada")
+
+        copiadas, erros = [], []
+        pasta_fotos = os.path.join(pasta, "Fotos")
+        for foto in dict.fromkeys(fotos):
+            origem = Path(foto)
+            if not origem.is_absolute():
+                origem = pasta_arquivo / origem
+            try:
+                # Mesma imagem em várias obras: guardada uma vez só pelo armazém
+                destino, resumo = armazem_fotos.copiar_para_pasta(origem, pasta_fotos)
+                copiadas.append((pintura_id, destino, resumo))
+            except OSError as e:
+                erros.append(f"foto {foto}: {e}")
+        return copiadas, erros
+
+    def _concluir_arquivos(self, pendentes, relatorio):
+        """Esperar as tarefas de um lote e registrar as fotos copiadas"""
+        fotos = []
+        for numero, tarefa in pendentes:
+            try:
+                copiadas, erros = tarefa.result()
+            except Exception as e:
+                relatorio["erros"].append((numero, f"pasta: {e}"))
+                continue
+            fotos.extend(copiadas)
+            relatorio["erros"].extend((numero, erro) for erro in erros)
+
+        if fotos:
+            with gerenciador_conexoes.transacao(self.db_path) as conn:
+                conn.executemany("INSERT INTO fotos (pintura_id, caminho, hash) VALUES (?, ?, ?)", fotos)
+            relatorio["fotos_copiadas"] += len(fotos)
+
+
+def importar_arquivo(caminho, db_path=None, **opcoes):
+    """Importar um arquivo CSV/JSON de pinturas (ver ImportadorPinturas)"""
+    return ImportadorPinturas(db_path, **opcoes).importar(caminho)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Importar pinturas de um arquivo CSV ou JSON")
+    parser.add_argument("arquivo", help="arquivo .csv, .json ou .jsonl")
+    parser.add_argument("--db", help="banco de dados de destino (padrão: o da configuração)")
+    parser.add_argument("--lote", type=int, default=TAMANHO_LOTE, help="linhas por transação")
+    parser.add_argument("--threads", type=int, default=MAX_TRABALHADORES, help="threads para pastas e fotos")
+    args = parser.parse_args()
+
+    resultado = importar_arquivo(args.arquivo, args.db, tamanho_lote=args.lote, max_trabalhadores=args.threads)
+    for linha, mensagem in resultado["erros"]:
+        print(f"❌ Linha {linha}: {mensagem}")
+    print(f"✅ {resultado['importadas']} pinturas importadas em {resultado['segundos']:.1f} s")
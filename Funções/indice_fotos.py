@@ -0,0 +1,294 @@
+# -*- coding: utf-8 -*-
+"""
+Módulo de Índice das Fotos
+Lista de imagens da pasta Fotos de cada pintura mantida em memória e no
+banco (pastas_fotos/arquivos_fotos), para que os diálogos não leiam o disco
+a cada seleção, e sincronização com a tabela fotos: imagens colocadas na
+pasta à mão são cadastradas e as apagadas da pasta saem do cadastro
+
+Com o monitor de pastas (UI_Dialogs/monitor_pastas.py) ativo, as pastas
+observadas são confiáveis em memória e só são relidas quando mudam; sem
+ele, cada consulta compara a data de modificação da pasta (um stat).
+
+Uso pela linha de comando:
+    python -m Funções.indice_fotos sincronizar
+"""
+
+import os
+import sqlite3 as sql
+import threading
+
+from .cache_detalhes import cache_detalhes
+from .conexao import gerenciador_conexoes
+
+EXTENSOES = (".png", ".jpg", ".jpeg", ".bmp", ".gif", ".tiff")
+
+PASTA_FOTOS = "Fotos"
+
+
+def _mesmo_caminho(caminho):
+    return os.path.normcase(os.path.abspath(caminho))
+
+
+def _mtime(pasta):
+    try:
+        return os.stat(pasta).st_mtime_ns
+    except OSError:
+        return None
+
+
+def listar_imagens(pasta):
+    """Nomes das imagens de uma pasta, em ordem alfabética"""
+    with os.scandir(pasta) as entradas:
+        return sorted(entrada.name for entrada in entradas
+                      if entrada.name.lower().endswith(EXTENSOES) and entrada.is_file())
+
+
+class IndiceFotos:
+    """Índice {pintura_id: imagens da pasta Fotos} com sincronização da tabela fotos"""
+
+    def __init__(self, db_path=None):
+        """Inicializar índice vazio (as pastas entram no primeiro acesso)"""
+        self.db_path = db_path
+        # pintura_id -> {"pasta": pasta Fotos, "mtime": mtime lido, "arquivos": [nomes], "observada": bool}
+        self._pastas = {}
+        self._lock = threading.RLock()
+        # Funções chamadas com o caminho de cada pasta que entra no índice (ex.: o monitor de pastas)
+        self.observadores = []
+        self.leituras_disco = 0
+        self.leituras_banco = 0
+        self.fotos_cadastradas = 0
+        self.fotos_descadastradas = 0
+
+    def _pasta_fotos(self, pintura_id, pasta_pintura=None):
+        """Pasta Fotos da pintura (a já indexada, a informada ou a do gerenciador de pastas)"""
+        if pasta_pintura is None:
+            entrada = self._pastas.get(pintura_id)
+            if entrada is not None:
+                return entrada["pasta"]
+            from .gerenciador_pastas import gerenciador_pastas
+            pasta_pintura = gerenciador_pastas.obter_pasta_pintura(pintura_id)
+            if not pasta_pintura:
+                return None
+        return os.path.join(str(pasta_pintura), PASTA_FOTOS)
+
+    def fotos(self, pintura_id, pasta_pintura=None):
+        """
+        Nomes das imagens da pasta Fotos da pintura
+
+        Args:
+            pasta_pintura: pasta da pintura, se já conhecida (evita procurá-la)
+        """
+        pintura_id = int(pintura_id)
+        with self._lock:
+            entrada = self._pastas.get(pintura_id)
+            if entrada is not None and (pasta_pintura is None or
+                                        entrada["pasta"] == self._pasta_fotos(pintura_id, pasta_pintura)):
+                if entrada["observada"] or _mtime(entrada["pasta"]) == entrada["mtime"]:
+                    return list(entrada["arquivos"])
+        return self.sincronizar(pintura_id, pasta_pintura)
+
+    def caminhos(self, pintura_id, pasta_pintura=None):
+        """Caminhos completos das imagens da pasta Fotos da pintura"""
+        nomes = self.fotos(pintura_id, pasta_pintura)
+        pasta = self.pasta(pintura_id)
+        return [os.path.join(pasta, nome) for nome in nomes] if pasta else []
+
+    def pasta(self, pintura_id):
+        """Pasta Fotos indexada da pintura (None se ainda não indexada)"""
+        entrada = self._pastas.get(int(pintura_id))
+        return entrada["pasta"] if entrada else None
+
+    def existe(self, pintura_id, caminho):
+        """Arquivo existe? Responde pelo índice quando está na pasta Fotos indexada"""
+        entrada = self._pastas.get(int(pintura_id))
+        if entrada is not None and _mesmo_caminho(os.path.dirname(caminho)) == _mesmo_caminho(entrada["pasta"]):
+            return os.path.basename(caminho) in entrada["arquivos"]
+        return os.path.exists(caminho)
+
+    def pastas_indexadas(self):
+        """Pastas Fotos que estão no índice em memória"""
+        with self._lock:
+            return [entrada["pasta"] for entrada in self._pastas.values()]
+
+    def pintura_da_pasta(self, pasta):
+        """Id da pintura dona da pasta Fotos indexada (None se não estiver no índice)"""
+        pasta = _mesmo_caminho(pasta)
+        with self._lock:
+            for pintura_id, entrada in self._pastas.items():
+                if _mesmo_caminho(entrada["pasta"]) == pasta:
+                    return pintura_id
+        return None
+
+    def marcar_observada(self, pasta, observada=True):
+        """Chamado pelo monitor: mudanças na pasta serão avisadas (não precisa do stat)"""
+        pintura_id = self.pintura_da_pasta(pasta)
+        if pintura_id is not None:
+            with self._lock:
+                self._pastas[pintura_id]["observada"] = observada
+
+    def descartar(self, pintura_id=None):
+        """Tirar uma pintura (ou todas) do índice em memória"""
+        with self._lock:
+            if pintura_id is None:
+                self._pastas.clear()
+            else:
+                self._pastas.pop(int(pintura_id), None)
+
+    def descartar_ausentes(self):
+        """Tirar do índice as pastas que não existem mais (renomeadas ou apagadas)"""
+        with self._lock:
+            for pintura_id in [pintura_id for pintura_id, entrada in self._pastas.items()
+                               if not os.path.isdir(entrada["pasta"])]:
+                del self._pastas[pintura_id]
+
+    def _guardar(self, pintura_id, pasta, mtime, arquivos):
+        with self._lock:
+            anterior = self._pastas.get(pintura_id)
+            nova = anterior is None or anterior["pasta"] != pasta
+            self._pastas[pintura_id] = {
+                "pasta": pasta,
+                "mtime": mtime,
+                "arquivos": arquivos,
+                "observada": not nova and anterior["observada"],
+            }
+        if nova:
+            for observador in list(self.observadores):
+                try:
+                    observador(pasta)
+                except Exception as e:
+                    print(f"Aviso: observador do índice de fotos falhou: {e}")
+
+    def sincronizar(self, pintura_id, pasta_pintura=None):
+        """
+        Reler a pasta Fotos da pintura e acertar o índice e a tabela fotos
+
+        Só lê o diretório se a pasta mudou desde a última leitura gravada no
+        banco. Imagens novas na pasta (que a tabela fotos não conhece) são
+        cadastradas sem descrição; imagens indexadas que sumiram da pasta são
+        descadastradas. Fotos removidas do cadastro pelo usuário continuam
+        no índice e não voltam a ser cadastradas.
+
+        Returns:
+            list: nomes das imagens da pasta
+        """
+        pintura_id = int(pintura_id)
+        pasta = self._pasta_fotos(pintura_id, pasta_pintura)
+        mtime = _mtime(pasta) if pasta else None
+        if mtime is None:
+            self.descartar(pintura_id)
+            return []
+
+        with gerenciador_conexoes.conexao(self.db_path) as conn:
+            gravada = conn.execute(
+                "SELECT caminho, mtime FROM pastas_fotos WHERE pintura_id = ?", (pintura_id,)
+            ).fetchone()
+            conhecidos = [linha[0] for linha in conn.execute(
+                "SELECT nome FROM arquivos_fotos WHERE pintura_id = ? ORDER BY nome", (pintura_id,)
+            )]
+
+        # Pasta igual à da última leitura: a lista gravada no banco vale
+        if gravada is not None and gravada[0] == pasta and gravada[1] == mtime:
+            self.leituras_banco += 1
+            self._guardar(pintura_id, pasta, mtime, conhecidos)
+            return list(conhecidos)
+
+        arquivos = listar_imagens(pasta)
+        self.leituras_disco += 1
+        if gravada is None or gravada[0] != pasta:
+            # Primeira leitura (ou pasta renomeada): nenhum arquivo conta como apagado
+            conhecidos = [nome for nome in conhecidos if nome in arquivos]
+        novos = sorted(set(arquivos) - set(conhecidos))
+        sumidos = sorted(set(conhecidos) - set(arquivos))
+
+        cadastradas = descadastradas = 0
+        try:
+            with gerenciador_conexoes.transacao(self.db_path) as conn:
+                cadastro = {}
+                for foto_id, caminho in conn.execute(
+                        "SELECT id, caminho FROM fotos WHERE pintura_id = ?", (pintura_id,)):
+                    cadastro.setdefault(_mesmo_caminho(caminho), []).append(foto_id)
+
+                sem_cadastro = [os.path.join(pasta, nome) for nome in novos
+                                if _mesmo_caminho(os.path.join(pasta, nome)) not in cadastro]
+                conn.executemany("INSERT INTO fotos (pintura_id, caminho, descricao) VALUES (?, ?, NULL)",
+                                 [(pintura_id, caminho) for caminho in sem_cadastro])
+                cadastradas = len(sem_cadastro)
+
+                apagadas = [foto_id for nome in sumidos
+                            for foto_id in cadastro.get(_mesmo_caminho(os.path.join(pasta, nome)), ())]
+                conn.executemany("DELETE FROM fotos WHERE id = ?", [(foto_id,) for foto_id in apagadas])
+                descadastradas = len(apagadas)
+
+                conn.executemany("INSERT OR IGNORE INTO arquivos_fotos (pintura_id, nome) VALUES (?, ?)",
+                                 [(pintura_id, nome) for nome in novos])
+                conn.executemany("DELETE FROM arquivos_fotos WHERE pintura_id = ? AND nome = ?",
+                                 [(pintura_id, nome) for nome in sumidos])
+                conn.execute("""
+                INSERT INTO pastas_fotos (pintura_id, caminho, mtime) VALUES (?, ?, ?)
+                ON CONFLICT(pintura_id) DO UPDATE SET caminho = excluded.caminho, mtime = excluded.mtime
+                """, (pintura_id, pasta, mtime))
+        except sql.IntegrityError:
+            # Pasta de uma pintura que não existe no banco: só o índice em memória
+            cadastradas = descadastradas = 0
+
+        if cadastradas or descadastradas:
+            with self._lock:
+                self.fotos_cadastradas += cadastradas
+                self.fotos_descadastradas += descadastradas
+            cache_detalhes.invalidar("pintura", pintura_id)
+            print(f"🖼️ Pintura {pintura_id}: {cadastradas} foto(s) cadastrada(s) e "
+                  f"{descadastradas} descadastrada(s) pela pasta")
+
+        self._guardar(pintura_id, pasta, mtime, arquivos)
+        return list(arquivos)
+
+    def sincronizar_tudo(self):
+        """
+        Sincronizar as pastas de todas as pinturas da biblioteca
+
+        Returns:
+            dict: pastas lidas, fotos cadastradas e descadastradas
+        """
+        from .gerenciador_pastas import gerenciador_pastas
+
+        with gerenciador_conexoes.conexao(self.db_path) as conn:
+            existentes = {linha[0] for linha in conn.execute("SELECT id FROM pinturas")}
+
+        antes = (self.fotos_cadastradas, self.fotos_descadastradas)
+        pastas = 0
+        for pasta in gerenciador_pastas.listar_pastas_pinturas():
+            if pasta["id"] in existentes:
+                self.sincronizar(pasta["id"], pasta["caminho"])
+                pastas += 1
+        return {
+            "pastas": pastas,
+            "cadastradas": self.fotos_cadastradas - antes[0],
+            "descadastradas": self.fotos_descadastradas - antes[1],
+        }
+
+    def estatisticas(self):
+        """Pastas em memória (e quantas observadas) e leituras feitas no disco e no banco"""
+        with self._lock:
+            return {
+                "pastas": len(self._pastas),
+                "observadas": sum(1 for entrada in self._pastas.values() if entrada["observada"]),
+                "leituras_disco": self.leituras_disco,
+                "leituras_banco": self.leituras_banco,
+                "fotos_cadastradas": self.fotos_cadastradas,
+                "fotos_descadastradas": self.fotos_descadastradas,
+            }
+
+
+# Instância global para uso em todo o projeto
+indice_fotos = IndiceFotos()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Índice das pastas de fotos das pinturas")
+    parser.add_argument("comando", choices=["sincronizar"])
+    args = parser.parse_args()
+
+    print(f"✅ {indice_fotos.sincronizar_tudo()}")
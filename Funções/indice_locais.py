@@ -0,0 +1,262 @@
+# -*- coding: utf-8 -*-
+"""
+Módulo de Índice de Locais
+Árvore de intervalos sobre os períodos (data_entrada, data_saida) da tabela
+locais, para saber onde estava cada obra em uma data e quais obras passaram
+por um local em um período, no acervo inteiro
+"""
+
+import threading
+from datetime import date
+
+from .conexao import gerenciador_conexoes
+
+# Registro sem data_saida: a obra continua no local
+FIM_ABERTO = date.max.toordinal() + 1
+
+
+def _ordinal(texto):
+    """Converter data (AAAA-MM-DD, AAAA-MM, AAAA ou DD/MM/AAAA) em número de dias"""
+    if not texto:
+        return None
+    texto = str(texto).strip()
+    try:
+        if len(texto) == 4:
+            return date(int(texto), 1, 1).toordinal()
+        if len(texto) == 7:
+            return date(int(texto[:4]), int(texto[5:7]), 1).toordinal()
+        if texto[2:3] == "/":
+            return date(int(texto[6:10]), int(texto[3:5]), int(texto[:2])).toordinal()
+        return date.fromisoformat(texto[:10]).toordinal()
+    except ValueError:
+        return None
+
+
+def _como_ordinal(data):
+    """Aceitar date/datetime ou texto"""
+    if isinstance(data, date):
+        return data.toordinal()
+    ordinal = _ordinal(data)
+    if ordinal is None:
+        raise ValueError(f"Data inválida: {data}")
+    return ordinal
+
+
+class _No:
+    """Nó da árvore: intervalos que contêm o centro, ordenados pelas duas pontas"""
+    __slots__ = ("centro", "por_inicio", "por_fim", "esquerda", "direita")
+
+
+class IndiceIntervalos:
+    """
+    Árvore de intervalos centrada (estática) com intervalos semiabertos [inicio, fim)
+
+    Consultas por ponto e por sobreposição em O(log n + k).
+    """
+
+    def __init__(self, intervalos):
+        """intervalos: lista de (inicio, fim, registro)"""
+        self.tamanho = len(intervalos)
+        self.raiz = self._construir(list(intervalos))
+
+    def _construir(self, intervalos):
+        if not intervalos:
+            return None
+
+        # Mediana das pontas: cada lado fica com no máximo metade dos intervalos
+        pontas = sorted(p for inicio, fim, _ in intervalos for p in (inicio, fim - 1))
+        centro = pontas[len(pontas) // 2]
+
+        esquerda, direita, cruzam = [], [], []
+        for intervalo in intervalos:
+            if intervalo[1] <= centro:
+                esquerda.append(intervalo)
+            elif intervalo[0] > centro:
+                direita.append(intervalo)
+            else:
+                cruzam.append(intervalo)
+
+        no = _No()
+        no.centro = centro
+        no.por_inicio = sorted(cruzam, key=lambda i: i[0])
+        no.por_fim = sorted(cruzam, key=lambda i: i[1], reverse=True)
+        no.esquerda = self._construir(esquerda)
+        no.direita = self._construir(direita)
+        return no
+
+    def sobrepostos(self, inicio, fim):
+        """Registros cujo intervalo tem interseção com [inicio, fim)"""
+        resultado = []
+        pendentes = [self.raiz]
+        while pendentes:
+            no = pendentes.pop()
+            if no is None:
+                continue
+
+            if fim <= no.centro:
+                # Consulta à esquerda do centro: basta o intervalo começar antes do fim
+                for i_inicio, _, registro in no.por_inicio:
+                    if i_inicio >= fim:
+                        break
+                    resultado.append(registro)
+                pendentes.append(no.esquerda)
+            elif inicio > no.centro:
+                # Consulta à direita do centro: basta o intervalo terminar depois do início
+                for _, i_fim, registro in no.por_fim:
+                    if i_fim <= inicio:
+                        break
+                    resultado.append(registro)
+                pendentes.append(no.direita)
+            else:
+                # Consulta contém o centro: todos os intervalos do nó se sobrepõem
+                resultado.extend(registro for _, _, registro in no.por_inicio)
+                pendentes.append(no.esquerda)
+                pendentes.append(no.direita)
+        return resultado
+
+    def em(self, ponto):
+        """Registros cujo intervalo contém o ponto"""
+        return self.sobrepostos(ponto, ponto + 1)
+
+
+class IndiceLocais:
+    """
+    Índice do histórico de locais de todas as pinturas
+
+    Cada registro é a tupla (local_id, pintura_id, local, data_entrada, data_saida).
+    """
+
+    def __init__(self, linhas):
+        """linhas: (id, pintura_id, local, data_entrada, data_saida) da tabela locais"""
+        self.registros = []
+        self.ignorados = 0
+        intervalos = []
+        por_local = {}
+
+        for linha in linhas:
+            inicio = _ordinal(linha[3])
+            if inicio is None:
+                # Sem data de entrada válida não há período para indexar
+                self.ignorados += 1
+                continue
+            saida = _ordinal(linha[4])
+            # Entrada e saída no mesmo dia: considerar o dia inteiro
+            fim = max(saida, inicio + 1) if saida is not None else FIM_ABERTO
+
+            registro = tuple(linha[:5])
+            intervalo = (inicio, fim, registro)
+            self.registros.append((inicio, saida, registro))
+            intervalos.append(intervalo)
+            por_local.setdefault(self._nome(linha[2]), []).append(intervalo)
+
+        self.arvore = IndiceIntervalos(intervalos)
+        self.arvores_locais = {nome: IndiceIntervalos(lista) for nome, lista in por_local.items()}
+
+    @staticmethod
+    def _nome(local):
+        return (local or "").strip().lower()
+
+    def _arvores(self, local):
+        """Árvores dos locais com o nome informado (exato, ou contendo o texto como no LIKE)"""
+        if local is None:
+            return [self.arvore]
+        nome = self._nome(local)
+        if nome in self.arvores_locais:
+            return [self.arvores_locais[nome]]
+        return [arvore for chave, arvore in self.arvores_locais.items() if nome in chave]
+
+    def onde_estava(self, data):
+        """
+        Local de cada pintura em uma data
+
+        Returns:
+            dict: {pintura_id: registro} (havendo períodos sobrepostos, vale a entrada mais recente)
+        """
+        resultado = {}
+        for registro in self.arvore.em(_como_ordinal(data)):
+            atual = resultado.get(registro[1])
+            if atual is None or (registro[3], registro[0]) > (atual[3], atual[0]):
+                resultado[registro[1]] = registro
+        return resultado
+
+    def sobrepostos(self, local=None, data_inicio=None, data_fim=None):
+        """
+        Registros de um local (ou de todos) com período que cruza [data_inicio, data_fim]
+
+        Datas ausentes deixam o período aberto naquele lado.
+        """
+        inicio = _como_ordinal(data_inicio) if data_inicio else 0
+        fim = _como_ordinal(data_fim) + 1 if data_fim else FIM_ABERTO + 1
+
+        resultado = []
+        for arvore in self._arvores(local):
+            resultado.extend(arvore.sobrepostos(inicio, fim))
+        resultado.sort(key=lambda r: (r[3] or "", r[0]), reverse=True)
+        return resultado
+
+    def tempo_no_local(self, ate=None):
+        """
+        Dias de permanência de cada registro (saída em aberto conta até `ate`, padrão hoje)
+
+        Returns:
+            dict: {local_id: {pintura_id, local, data_entrada, data_saida, dias_no_local}}
+        """
+        limite = _como_ordinal(ate) if ate else date.today().toordinal()
+        resultado = {}
+        for inicio, saida, registro in self.registros:
+            resultado[registro[0]] = {
+                "pintura_id": registro[1],
+                "local": registro[2],
+                "data_entrada": registro[3],
+                "data_saida": registro[4],
+                "dias_no_local": (saida if saida is not None else limite) - inicio
+            }
+        return resultado
+
+    def dias_por_local(self, ate=None):
+        """Total de dias de cada pintura em cada local: {(pintura_id, local): dias}"""
+        totais = {}
+        for dados in self.tempo_no_local(ate).values():
+            chave = (dados["pintura_id"], dados["local"])
+            totais[chave] = totais.get(chave, 0) + dados["dias_no_local"]
+        return totais
+
+
+# Último índice montado por banco: {arquivo: (versão, IndiceLocais)}
+_indices = {}
+_lock = threading.Lock()
+
+
+def carregar_indice(db_path=None):
+    """Índice de locais do banco (remontado só quando o banco muda)"""
+    with gerenciador_conexoes.conexao(db_path) as conn:
+        arquivo = conn.execute("PRAGMA database_list").fetchone()[2]
+        versao = conn.versao_dados()
+        with _lock:
+            memorizado = _indices.get(arquivo)
+        if memorizado and memorizado[0] == versao:
+            return memorizado[1]
+
+        cursor = conn.cursor()
+        cursor.execute("SELECT id, pintura_id, local, data_entrada, data_saida FROM locais")
+        linhas = cursor.fetchall()
+
+    indice = IndiceLocais(linhas)
+    with _lock:
+        _indices[arquivo] = (versao, indice)
+    return indice
+
+
+def onde_estava(data, db_path=None):
+    """Local de cada pintura do acervo em uma data: {pintura_id: registro}"""
+    return carregar_indice(db_path).onde_estava(data)
+
+
+def pinturas_no_periodo(local, data_inicio=None, data_fim=None, db_path=None):
+    """Registros de pinturas que estiveram no local durante o período"""
+    return carregar_indice(db_path).sobrepostos(local, data_inicio, data_fim)
+
+
+def tempo_no_local_todas(ate=None, db_path=None):
+    """tempo_no_local de todos os registros de uma vez: {local_id: dados}"""
+    return carregar_indice(db_path).tempo_no_local(ate)
@@ -0,0 +1,398 @@
+# -*- coding: utf-8 -*-
+"""
+Módulo de Migrações do Banco de Dados
+Esquema canônico versionado com PRAGMA user_version. Cada migração roda uma
+única vez por banco, em ordem, dentro de uma transação.
+"""
+
+import sqlite3 as sql
+
+
+def _colunas(conn, tabela):
+    """Nomes das colunas de uma tabela (vazio se a tabela não existir)"""
+    return [linha[1] for linha in conn.execute(f'PRAGMA table_info("{tabela}")')]
+
+
+def _tabela_existe(conn, tabela):
+    linha = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (tabela,)
+    ).fetchone()
+    return linha is not None
+
+
+def _renomear_coluna(conn, tabela, antiga, nova):
+    """Renomear coluna de esquemas antigos (se a antiga existir e a nova não)"""
+    colunas = _colunas(conn, tabela)
+    if antiga in colunas and nova not in colunas:
+        conn.execute(f'ALTER TABLE "{tabela}" RENAME COLUMN "{antiga}" TO "{nova}"')
+
+
+def _adicionar_coluna(conn, tabela, coluna, tipo):
+    """Adicionar coluna ausente"""
+    if coluna not in _colunas(conn, tabela):
+        conn.execute(f'ALTER TABLE "{tabela}" ADD COLUMN "{coluna}" {tipo}')
+
+
+def _migracao_1_esquema_canonico(conn):
+    """Tabelas do sistema, com os nomes de colunas usados pelos módulos CRUD"""
+    # Bancos criados por CriarTabelas.py usavam nomes acentuados
+    if _tabela_existe(conn, "exposições") and not _tabela_existe(conn, "exposicoes"):
+        conn.execute('ALTER TABLE "exposições" RENAME TO exposicoes')
+    if _tabela_existe(conn, "pintura_exposição") and not _tabela_existe(conn, "pintura_exposicao"):
+        conn.execute('ALTER TABLE "pintura_exposição" RENAME TO pintura_exposicao')
+
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS pinturas (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        titulo TEXT NOT NULL,
+        tecnica TEXT,
+        tamanho TEXT,
+        data TEXT,
+        local TEXT
+    )
+    """)
+
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS series (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        nome TEXT NOT NULL,
+        descricao TEXT,
+        data_inicio TEXT,
+        data_fim TEXT
+    )
+    """)
+
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS exposicoes (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        nome TEXT NOT NULL,
+        tema TEXT,
+        tipo TEXT,
+        artistas TEXT,
+        data TEXT,
+        local TEXT,
+        curadoria TEXT,
+        organizador TEXT,
+        periodo TEXT
+    )
+    """)
+    _adicionar_coluna(conn, "exposicoes", "tipo", "TEXT")
+    _adicionar_coluna(conn, "exposicoes", "periodo", "TEXT")
+
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS pintura_serie (
+        pintura_id INTEGER,
+        serie_id INTEGER,
+        PRIMARY KEY (pintura_id, serie_id),
+        FOREIGN KEY (pintura_id) REFERENCES pinturas(id),
+        FOREIGN KEY (serie_id) REFERENCES series(id)
+    )
+    """)
+
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS pintura_exposicao (
+        pintura_id INTEGER,
+        exposicao_id INTEGER,
+        PRIMARY KEY (pintura_id, exposicao_id),
+        FOREIGN KEY (pintura_id) REFERENCES pinturas(id),
+        FOREIGN KEY (exposicao_id) REFERENCES exposicoes(id)
+    )
+    """)
+
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS fotos (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        pintura_id INTEGER,
+        caminho TEXT NOT NULL,
+        descricao TEXT,
+        FOREIGN KEY (pintura_id) REFERENCES pinturas(id)
+    )
+    """)
+    _renomear_coluna(conn, "fotos", "descrição", "descricao")
+
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS precos (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        pintura_id INTEGER,
+        preco REAL,
+        data TEXT,
+        observacoes TEXT,
+        FOREIGN KEY (pintura_id) REFERENCES pinturas(id)
+    )
+    """)
+    _renomear_coluna(conn, "precos", "valor", "preco")
+    _renomear_coluna(conn, "precos", "data_avaliacao", "data")
+    _renomear_coluna(conn, "precos", "observacao", "observacoes")
+
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS locais (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        pintura_id INTEGER,
+        local TEXT,
+        data_entrada TEXT,
+        data_saida TEXT,
+        observacoes TEXT,
+        FOREIGN KEY (pintura_id) REFERENCES pinturas(id)
+    )
+    """)
+    _renomear_coluna(conn, "locais", "observacao", "observacoes")
+
+
+def _migracao_2_indices(conn):
+    """Índices das consultas de detalhes e relacionamentos"""
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_fotos_pintura ON fotos(pintura_id)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_precos_pintura_data ON precos(pintura_id, data)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_locais_pintura_entrada ON locais(pintura_id, data_entrada)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_pintura_exposicao_exposicao ON pintura_exposicao(exposicao_id)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_pintura_serie_serie ON pintura_serie(serie_id)")
+
+
+def _migracao_3_busca_textual(conn):
+    """Índices FTS5 de pinturas, exposições e séries"""
+    from .busca_texto import criar_indices_busca
+    try:
+        criar_indices_busca(conn)
+    except sql.OperationalError as e:
+        # SQLite sem FTS5: as buscas continuam funcionando com LIKE
+        print(f"Busca textual indisponível, índices FTS5 não criados: {e}")
+
+
+# Histórico -> colunas materializadas em pintura_atual
+# tabela: (colunas de pintura_atual, colunas do histórico, ordem do registro atual)
+HISTORICOS_ATUAIS = {
+    "precos": (("preco_id", "preco", "data_preco"), ("id", "preco", "data"), "data DESC, id DESC"),
+    "locais": (("local_id", "local", "data_entrada"), ("id", "local", "data_entrada"), "data_entrada DESC, id DESC"),
+}
+
+
+def _sql_recalcular_atual(tabela, pintura_id):
+    """UPDATE que recalcula as colunas de pintura_atual de uma pintura a partir do histórico"""
+    destino, origem, ordem = HISTORICOS_ATUAIS[tabela]
+    return f"""
+        UPDATE pintura_atual SET ({", ".join(destino)}) = (
+            SELECT {", ".join(origem)} FROM {tabela}
+            WHERE pintura_id = {pintura_id}
+            ORDER BY {ordem} LIMIT 1
+        ) WHERE pintura_id = {pintura_id};"""
+
+
+def _migracao_4_valores_atuais(conn):
+    """Preço e local atuais materializados em pintura_atual, mantidos por triggers"""
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS pintura_atual (
+        pintura_id INTEGER PRIMARY KEY,
+        preco_id INTEGER,
+        preco REAL,
+        data_preco TEXT,
+        local_id INTEGER,
+        local TEXT,
+        data_entrada TEXT
+    )
+    """)
+    # Filtros por faixa de preço viram uma busca por intervalo no índice
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_pintura_atual_preco ON pintura_atual(preco)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_pintura_atual_local ON pintura_atual(local)")
+
+    for tabela, (_, origem, _) in HISTORICOS_ATUAIS.items():
+        colunas = ", ".join(origem[1:])
+        conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS pintura_atual_{tabela}_ai AFTER INSERT ON {tabela} BEGIN
+            INSERT OR IGNORE INTO pintura_atual(pintura_id) VALUES (new.pintura_id);
+            {_sql_recalcular_atual(tabela, "new.pintura_id")}
+        END
+        """)
+        conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS pintura_atual_{tabela}_ad AFTER DELETE ON {tabela} BEGIN
+            {_sql_recalcular_atual(tabela, "old.pintura_id")}
+        END
+        """)
+        conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS pintura_atual_{tabela}_au AFTER UPDATE OF pintura_id, {colunas} ON {tabela} BEGIN
+            INSERT OR IGNORE INTO pintura_atual(pintura_id) VALUES (new.pintura_id);
+            {_sql_recalcular_atual(tabela, "old.pintura_id")}
+            {_sql_recalcular_atual(tabela, "new.pintura_id")}
+        END
+        """)
+
+    conn.execute("""
+    CREATE TRIGGER IF NOT EXISTS pintura_atual_pinturas_ad AFTER DELETE ON pinturas BEGIN
+        DELETE FROM pintura_atual WHERE pintura_id = old.id;
+    END
+    """)
+
+    # Preencher com o histórico já existente
+    conn.execute("""
+    INSERT OR IGNORE INTO pintura_atual(pintura_id)
+    SELECT pintura_id FROM precos WHERE pintura_id IS NOT NULL
+    UNION
+    SELECT pintura_id FROM locais WHERE pintura_id IS NOT NULL
+    """)
+    for tabela in HISTORICOS_ATUAIS:
+        conn.execute(_sql_recalcular_atual(tabela, "pintura_atual.pintura_id"))
+
+
+def _migracao_5_hash_fotos(conn):
+    """Hash do conteúdo de cada foto (armazenamento endereçado por conteúdo)"""
+    # Fotos já cadastradas ficam sem hash até armazem_fotos.registrar_hashes()
+    _adicionar_coluna(conn, "fotos", "hash", "TEXT")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_fotos_hash ON fotos(hash)")
+
+
+# Tabelas dependentes de pinturas: (definição com ON DELETE CASCADE, filtro das linhas válidas)
+DEPENDENTES_PINTURAS = {
+    "fotos": ("""
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        pintura_id INTEGER REFERENCES pinturas(id) ON DELETE CASCADE,
+        caminho TEXT NOT NULL,
+        descricao TEXT,
+        hash TEXT
+    """, "pintura_id IN (SELECT id FROM pinturas)"),
+    "precos": ("""
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        pintura_id INTEGER REFERENCES pinturas(id) ON DELETE CASCADE,
+        preco REAL,
+        data TEXT,
+        observacoes TEXT
+    """, "pintura_id IN (SELECT id FROM pinturas)"),
+    "locais": ("""
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        pintura_id INTEGER REFERENCES pinturas(id) ON DELETE CASCADE,
+        local TEXT,
+        data_entrada TEXT,
+        data_saida TEXT,
+        observacoes TEXT
+    """, "pintura_id IN (SELECT id FROM pinturas)"),
+    "pintura_serie": ("""
+        pintura_id INTEGER REFERENCES pinturas(id) ON DELETE CASCADE,
+        serie_id INTEGER REFERENCES series(id) ON DELETE CASCADE,
+        PRIMARY KEY (pintura_id, serie_id)
+    """, "pintura_id IN (SELECT id FROM pinturas) AND serie_id IN (SELECT id FROM series)"),
+    "pintura_exposicao": ("""
+        pintura_id INTEGER REFERENCES pinturas(id) ON DELETE CASCADE,
+        exposicao_id INTEGER REFERENCES exposicoes(id) ON DELETE CASCADE,
+        PRIMARY KEY (pintura_id, exposicao_id)
+    """, "pintura_id IN (SELECT id FROM pinturas) AND exposicao_id IN (SELECT id FROM exposicoes)"),
+}
+
+
+def _recriar_tabela(conn, tabela, definicao, filtro):
+    """
+    Recriar a tabela com uma nova definição (o SQLite não altera chaves
+    estrangeiras com ALTER TABLE), preservando índices, triggers e a
+    sequência do AUTOINCREMENT
+
+    Returns:
+        int: linhas descartadas por não passarem no filtro (órfãs)
+    """
+    objetos = [linha[0] for linha in conn.execute(
+        "SELECT sql FROM sqlite_master WHERE tbl_name = ? AND type IN ('index', 'trigger') AND sql IS NOT NULL",
+        (tabela,)
+    )]
+    sequencia = conn.execute("SELECT seq FROM sqlite_sequence WHERE name = ?", (tabela,)).fetchone()
+
+    nova = f"{tabela}_nova"
+    conn.execute(f'CREATE TABLE "{nova}" ({definicao})')
+    colunas = ", ".join(f'"{coluna}"' for coluna in _colunas(conn, tabela) if coluna in _colunas(conn, nova))
+    total = conn.execute(f'SELECT COUNT(*) FROM "{tabela}"').fetchone()[0]
+    copiadas = conn.execute(
+        f'INSERT INTO "{nova}" ({colunas}) SELECT {colunas} FROM "{tabela}" WHERE {filtro}'
+    ).rowcount
+    conn.execute(f'DROP TABLE "{tabela}"')
+    conn.execute(f'ALTER TABLE "{nova}" RENAME TO "{tabela}"')
+
+    for objeto in objetos:
+        conn.execute(objeto)
+    if sequencia is not None:
+        conn.execute("UPDATE sqlite_sequence SET seq = MAX(seq, ?) WHERE name = ?", (sequencia[0], tabela))
+    return total - copiadas
+
+
+def _migracao_6_exclusao_em_cascata(conn):
+    """Chaves estrangeiras com ON DELETE CASCADE nas tabelas dependentes de pinturas"""
+    # Linhas de pinturas, séries ou exposições já excluídas não são copiadas
+    for tabela, (definicao, filtro) in DEPENDENTES_PINTURAS.items():
+        orfas = _recriar_tabela(conn, tabela, definicao, filtro)
+        if orfas:
+            print(f"🧹 {orfas} registro(s) órfão(s) descartado(s) de {tabela}")
+    conn.execute("DELETE FROM pintura_atual WHERE pintura_id NOT IN (SELECT id FROM pinturas)")
+
+
+def _migracao_7_indice_arquivos_fotos(conn):
+    """Índice das pastas Fotos: arquivos vistos em cada pasta e a data da última leitura"""
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS pastas_fotos (
+        pintura_id INTEGER PRIMARY KEY REFERENCES pinturas(id) ON DELETE CASCADE,
+        caminho TEXT NOT NULL,
+        mtime INTEGER
+    )
+    """)
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS arquivos_fotos (
+        pintura_id INTEGER REFERENCES pinturas(id) ON DELETE CASCADE,
+        nome TEXT NOT NULL,
+        PRIMARY KEY (pintura_id, nome)
+    ) WITHOUT ROWID
+    """)
+
+
+# (versão, descrição, função) - nunca alterar migrações já publicadas,
+# apenas acrescentar novas ao final
+MIGRACOES = [
+    (1, "Esquema canônico", _migracao_1_esquema_canonico),
+    (2, "Índices secundários", _migracao_2_indices),
+    (3, "Busca textual (FTS5)", _migracao_3_busca_textual),
+    (4, "Preço e local atuais materializados", _migracao_4_valores_atuais),
+    (5, "Hash das fotos", _migracao_5_hash_fotos),
+    (6, "Exclusão em cascata", _migracao_6_exclusao_em_cascata),
+    (7, "Índice de arquivos das fotos", _migracao_7_indice_arquivos_fotos),
+]
+
+VERSAO_ATUAL = MIGRACOES[-1][0]
+
+
+def versao_banco(conn):
+    """Versão do esquema gravada no banco"""
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def aplicar_migracoes(conn):
+    """
+    Aplicar as migrações pendentes em uma conexão
+
+    Returns:
+        int: versão do esquema após as migrações
+    """
+    versao = versao_banco(conn)
+    if versao >= VERSAO_ATUAL:
+        return versao
+
+    if conn.in_transaction:
+        conn.commit()
+
+    for numero, descricao, migracao in MIGRACOES:
+        if numero <= versao:
+            continue
+        try:
+            conn.execute("BEGIN")
+            migracao(conn)
+            if not conn.in_transaction:
+                # A migração confirmou por conta própria (executescript)
+                conn.execute("BEGIN")
+            conn.execute(f"PRAGMA user_version = {numero}")
+            conn.commit()
+            print(f"🛠️ Migração {numero} aplicada: {descricao}")
+            versao = numero
+        except Exception as e:
+            if conn.in_transaction:
+                conn.rollback()
+            print(f"❌ Erro na migração {numero} ({descricao}): {e}")
+            raise
+
+    return versao
+
+
+def migrar_banco(db_path=None):
+    """Abrir o banco (pelo pool de conexões) e aplicar as migrações pendentes"""
+    from .conexao import gerenciador_conexoes
+    with gerenciador_conexoes.conexao(db_path) as conn:
+        return aplicar_migracoes(conn)
@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+"""
+Módulo de Paginação
+Leitura de listagens em páginas (LIMIT/OFFSET) com ordenação feita pelo
+SQLite, para as tabelas da janela principal
+"""
+
+from .conexao import gerenciador_conexoes
+
+
+def contar(consulta, params=(), db_path=None):
+    """Quantidade de linhas de uma consulta"""
+    with gerenciador_conexoes.conexao(db_path) as conn:
+        cursor = conn.cursor()
+        cursor.execute(f"SELECT COUNT(*) FROM ({consulta})", params)
+        total = cursor.fetchone()[0]
+    return total
+
+
+def carregar_pagina(consulta, colunas, offset, limite, ordem=0, descendente=False, params=(), db_path=None):
+    """
+    Buscar uma página de uma consulta
+
+    Args:
+        consulta: SELECT sem ORDER BY
+        colunas: nomes das colunas da consulta (a posição é o índice da coluna na tabela)
+        offset: primeira linha da página
+        limite: quantidade de linhas
+        ordem: índice da coluna usada na ordenação
+        descendente: ordem decrescente
+        params: parâmetros da consulta
+
+    Returns:
+        list: linhas da página
+    """
+    # Só nomes conhecidos entram no ORDER BY
+    if ordem is None or not 0 <= ordem < len(colunas):
+        ordem = 0
+    direcao = "DESC" if descendente else "ASC"
+
+    # A primeira coluna (id) desempata, para que as páginas não se sobreponham
+    ordenacao = f"{colunas[ordem]} {direcao}"
+    if ordem != 0:
+        ordenacao += f", {colunas[0]} {direcao}"
+
+    with gerenciador_conexoes.conexao(db_path) as conn:
+        cursor = conn.cursor()
+        cursor.execute(
+            f"SELECT * FROM ({consulta}) ORDER BY {ordenacao} LIMIT ? OFFSET ?",
+            (*params, limite, offset)
+        )
+        linhas = cursor.fetchall()
+    return linhas
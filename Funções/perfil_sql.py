@@ -0,0 +1,356 @@
+# -*- coding: utf-8 -*-
+"""
+Módulo de Perfil das Consultas SQL
+Instrumentação opcional de todos os execute das conexões do pool: texto do
+SQL, formato dos parâmetros, linhas retornadas, tempo e, para as consultas
+acima do limite, o EXPLAIN QUERY PLAN - gravados em um log rotativo de
+consultas lentas e exibidos no painel de diagnóstico
+
+Ligado pela configuração "sql_profiling_enabled" (limite em "slow_query_ms")
+ou pela variável de ambiente GERENCIADOR_PERFIL_SQL=1; desligado, as
+conexões usam os cursores normais do sqlite3.
+"""
+
+import contextlib
+import json
+import logging
+import os
+import re
+import sqlite3 as sql
+import sys
+import threading
+import time
+from collections import deque
+from logging.handlers import RotatingFileHandler
+from pathlib import Path
+
+# Log rotativo: 5 arquivos de 1 MB
+ARQUIVO_LOG = Path(__file__).parent.parent / "Data" / "Logs" / "consultas_lentas.log"
+TAMANHO_LOG = 1024 * 1024
+ARQUIVOS_LOG = 5
+
+# Registros mantidos em memória para o painel
+MAX_RECENTES = 1000
+MAX_LENTAS = 200
+
+# Planos memorizados por texto SQL (o plano quase nunca muda entre execuções)
+MAX_PLANOS = 500
+
+# Comandos que têm plano de consulta
+_COM_PLANO = ("SELECT", "WITH", "INSERT", "UPDATE", "DELETE", "REPLACE")
+
+# Arquivos ignorados ao procurar a função que originou a consulta (o pool e o `with transacao()`)
+_INTERNOS = tuple(os.path.normcase(caminho) for caminho in
+                  (__file__, str(Path(__file__).with_name("conexao.py")), contextlib.__file__))
+
+
+def _normalizar_sql(texto):
+    """SQL em uma linha, com os espaços colapsados (chave do resumo)"""
+    return re.sub(r"\s+", " ", texto).strip()
+
+
+def _tipo(valor):
+    return "NULL" if valor is None else type(valor).__name__
+
+
+def formato_parametros(parametros):
+    """
+    Formato dos parâmetros sem os valores: "(int, str, NULL)", "{id: int}",
+    "(int × 500)" para listas longas do mesmo tipo
+    """
+    if not parametros:
+        return ""
+    if isinstance(parametros, dict):
+        return "{" + ", ".join(f"{chave}: {_tipo(valor)}" for chave, valor in parametros.items()) + "}"
+
+    tipos = [_tipo(valor) for valor in parametros]
+    if len(tipos) > 8 and len(set(tipos)) == 1:
+        return f"({tipos[0]} × {len(tipos)})"
+    if len(tipos) > 8:
+        return "(" + ", ".join(tipos[:8]) + f", … +{len(tipos) - 8})"
+    return "(" + ", ".join(tipos) + ")"
+
+
+def _origem():
+    """Primeira função fora do pool e deste módulo na pilha ("modulo.funcao")"""
+    quadro = sys._getframe(2)
+    while quadro is not None:
+        codigo = quadro.f_code
+        if os.path.normcase(codigo.co_filename) not in _INTERNOS:
+            return f"{Path(codigo.co_filename).stem}.{codigo.co_name}"
+        quadro = quadro.f_back
+    return "?"
+
+
+def _varreduras(plano):
+    """Tabelas lidas por inteiro (SCAN em vez de SEARCH por índice)"""
+    # Subconsultas (CO-ROUTINE/MATERIALIZE) são percorridas inteiras de propósito
+    subconsultas = {detalhe.split()[-1] for detalhe in plano
+                    if detalhe.startswith(("CO-ROUTINE ", "MATERIALIZE "))}
+    tabelas = []
+    for detalhe in plano:
+        if not detalhe.startswith("SCAN ") or detalhe.startswith("SCAN CONSTANT ROW"):
+            continue
+        if "VIRTUAL TABLE INDEX" in detalhe and ":M" in detalhe:
+            # Busca textual FTS5 (MATCH) usa o índice da tabela virtual
+            continue
+        # "SCAN p" (SQLite >= 3.36) ou "SCAN TABLE pinturas AS p" (versões antigas)
+        partes = detalhe.split()
+        tabela = partes[2] if len(partes) > 2 and partes[1] == "TABLE" else partes[1]
+        if tabela not in subconsultas:
+            tabelas.append(tabela)
+    return tabelas
+
+
+class CursorInstrumentado(sql.Cursor):
+    """Cursor que mede execute e fetch* e entrega o resultado ao perfil"""
+
+    _registro = None
+
+    def _medir(self, texto, parametros, muitos, inicio):
+        self._registro = {
+            "instante": time.time(),
+            "sql": texto,
+            "parametros": parametros,
+            "muitos": muitos,
+            "origem": _origem(),
+            "segundos": time.perf_counter() - inicio,
+            "linhas": 0,
+        }
+        if self.description is None:
+            # Comando sem resultado: as linhas são as alteradas
+            self._registro["linhas"] = max(self.rowcount, 0)
+            self._concluir()
+
+    def _concluir(self):
+        registro, self._registro = self._registro, None
+        if registro is not None:
+            perfil_sql.registrar(self.connection, registro)
+
+    def _buscar(self, metodo, *args):
+        registro = self._registro
+        inicio = time.perf_counter()
+        resultado = metodo(self, *args)
+        if registro is not None:
+            registro["segundos"] += time.perf_counter() - inicio
+        return resultado
+
+    def execute(self, texto, parametros=()):
+        self._concluir()
+        inicio = time.perf_counter()
+        super().execute(texto, parametros)
+        self._medir(texto, parametros, False, inicio)
+        return self
+
+    def executemany(self, texto, sequencia):
+        self._concluir()
+        sequencia = list(sequencia)
+        inicio = time.perf_counter()
+        super().executemany(texto, sequencia)
+        self._medir(texto, sequencia, True, inicio)
+        return self
+
+    def executescript(self, script):
+        self._concluir()
+        inicio = time.perf_counter()
+        super().executescript(script)
+        self._medir(script, (), False, inicio)
+        return self
+
+    def fetchone(self):
+        linha = self._buscar(sql.Cursor.fetchone)
+        if self._registro is not None:
+            if linha is None:
+                self._concluir()
+            else:
+                self._registro["linhas"] += 1
+        return linha
+
+    def fetchmany(self, tamanho=None):
+        tamanho = self.arraysize if tamanho is None else tamanho
+        linhas = self._buscar(sql.Cursor.fetchmany, tamanho)
+        if self._registro is not None:
+            self._registro["linhas"] += len(linhas)
+            if len(linhas) < tamanho:
+                self._concluir()
+        return linhas
+
+    def fetchall(self):
+        linhas = self._buscar(sql.Cursor.fetchall)
+        if self._registro is not None:
+            self._registro["linhas"] += len(linhas)
+            self._concluir()
+        return linhas
+
+    def __next__(self):
+        linha = self.fetchone()
+        if linha is None:
+            raise StopIteration
+        return linha
+
+    def close(self):
+        self._concluir()
+        super().close()
+
+    def __del__(self):
+        # Cursor descartado sem esgotar o resultado (ex.: um fetchone só)
+        try:
+            self._concluir()
+        except Exception:
+            pass
+
+
+class PerfilSQL:
+    """Coleta das medições, resumo por consulta e log de consultas lentas"""
+
+    def __init__(self):
+        """Inicializar perfil com a configuração (ou o ambiente)"""
+        ativo, limite_ms = False, 50
+        try:
+            from config import config_manager
+            ativo = config_manager.get("sql_profiling_enabled", False)
+            limite_ms = config_manager.get("slow_query_ms", 50)
+        except ImportError:
+            pass
+
+        self.ativo = bool(ativo or os.environ.get("GERENCIADOR_PERFIL_SQL"))
+        self.limite_ms = limite_ms
+        self.arquivo_log = ARQUIVO_LOG
+        self._lock = threading.RLock()
+        self._log = None
+        self._planos = {}
+        self.limpar()
+
+    def ativar(self, limite_ms=None):
+        """Ligar a instrumentação (vale para os próximos cursores)"""
+        if limite_ms is not None:
+            self.limite_ms = limite_ms
+        self.ativo = True
+
+    def desativar(self):
+        self.ativo = False
+
+    def limpar(self):
+        """Descartar medições e resumo (o log em disco é mantido)"""
+        with self._lock:
+            self.recentes = deque(maxlen=MAX_RECENTES)
+            self.lentas = deque(maxlen=MAX_LENTAS)
+            self._resumo = {}
+
+    def _plano(self, conn, registro):
+        """EXPLAIN QUERY PLAN da consulta (memorizado por texto SQL)"""
+        texto = registro["sql"]
+        if texto in self._planos:
+            return self._planos[texto]
+        if texto.lstrip().split(None, 1)[0].upper() not in _COM_PLANO or texto.count(";") > 1:
+            return None
+
+        parametros = registro["parametros"]
+        if registro["muitos"]:
+            parametros = parametros[0] if parametros else ()
+        try:
+            # Cursor comum: o próprio EXPLAIN não entra nas medições
+            cursor = sql.Cursor(conn)
+            plano = [linha[3] for linha in cursor.execute(f"EXPLAIN QUERY PLAN {texto}", parametros)]
+            cursor.close()
+        except sql.Error as e:
+            plano = [f"(plano indisponível: {e})"]
+
+        if len(self._planos) >= MAX_PLANOS:
+            self._planos.clear()
+        self._planos[texto] = plano
+        return plano
+
+    def _gravar_log(self, registro):
+        """Acrescentar a consulta lenta ao log rotativo (criado no primeiro uso)"""
+        if self._log is None:
+            try:
+                self.arquivo_log.parent.mkdir(parents=True, exist_ok=True)
+                manipulador = RotatingFileHandler(self.arquivo_log, maxBytes=TAMANHO_LOG,
+                                                  backupCount=ARQUIVOS_LOG, encoding="utf-8")
+                manipulador.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+                log = logging.getLogger("gerenciador.consultas_lentas")
+                log.setLevel(logging.INFO)
+                log.propagate = False
+                log.addHandler(manipulador)
+                self._log = log
+            except OSError as e:
+                print(f"Aviso: log de consultas lentas indisponível: {e}")
+                self._log = False
+        if self._log:
+            self._log.info(json.dumps(registro, ensure_ascii=False))
+
+    def registrar(self, conn, medicao):
+        """Receber a medição concluída de um cursor instrumentado"""
+        muitos = medicao["muitos"]
+        parametros = medicao["parametros"]
+        registro = {
+            "instante": medicao["instante"],
+            "sql": _normalizar_sql(medicao["sql"]),
+            "parametros": (f"{len(parametros)} × {formato_parametros(parametros[0]) if parametros else '()'}"
+                           if muitos else formato_parametros(parametros)),
+            "linhas": medicao["linhas"],
+            "ms": round(medicao["segundos"] * 1000, 3),
+            "origem": medicao["origem"],
+        }
+
+        lenta = registro["ms"] >= self.limite_ms
+        if lenta:
+            plano = self._plano(conn, medicao)
+            registro["plano"] = plano
+            registro["varredura"] = _varreduras(plano or [])
+
+        with self._lock:
+            self.recentes.append(registro)
+            resumo = self._resumo.setdefault(registro["sql"], {
+                "sql": registro["sql"],
+                "execucoes": 0,
+                "ms_total": 0.0,
+                "ms_max": 0.0,
+                "linhas": 0,
+                "lentas": 0,
+                "origens": set(),
+                "varredura": [],
+            })
+            resumo["execucoes"] += 1
+            resumo["ms_total"] += registro["ms"]
+            resumo["ms_max"] = max(resumo["ms_max"], registro["ms"])
+            resumo["linhas"] += registro["linhas"]
+            resumo["origens"].add(registro["origem"])
+            if lenta:
+                resumo["lentas"] += 1
+                resumo["varredura"] = registro["varredura"]
+                self.lentas.append(registro)
+
+        if lenta:
+            self._gravar_log(registro)
+
+    def resumo(self, ordem="ms_total"):
+        """
+        Consultas agrupadas pelo texto SQL, das mais caras para as mais baratas
+
+        Returns:
+            list de dicts com execucoes, ms_total, ms_medio, ms_max, linhas,
+            lentas, origens e varredura (tabelas lidas por inteiro)
+        """
+        with self._lock:
+            consultas = []
+            for resumo in self._resumo.values():
+                consulta = dict(resumo)
+                consulta["origens"] = sorted(resumo["origens"])
+                consulta["ms_medio"] = resumo["ms_total"] / resumo["execucoes"]
+                consultas.append(consulta)
+        return sorted(consultas, key=lambda c: c[ordem], reverse=True)
+
+    def relatorio(self, limite=20):
+        """Texto com as consultas mais caras (para o terminal)"""
+        linhas = [f"🔎 Perfil SQL ({'ativo' if self.ativo else 'desligado'}, limite {self.limite_ms} ms)"]
+        for consulta in self.resumo()[:limite]:
+            alerta = f"  ⚠️ SCAN {', '.join(consulta['varredura'])}" if consulta["varredura"] else ""
+            linhas.append(f"   {consulta['ms_total']:9.1f} ms  {consulta['execucoes']:6d}x  "
+                          f"{', '.join(consulta['origens'])}: {consulta['sql'][:100]}{alerta}")
+        return "\n".join(linhas)
+
+
+# Instância global para uso em todo o projeto
+perfil_sql = PerfilSQL()
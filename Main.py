@@ -6,14 +6,17 @@ Sistema de catalogação e gestão de obras de arte
 
 import sys, os
 from pathlib import Path
+
+# Medição da inicialização (python Main.py --relatorio-inicio) antes das demais importações
+import relatorio_inicio
+relatorio_inicio.iniciar()
   
 from Funções.detalhes_pintura import mostrar_detalhes
-from UI_Dialogs import Dialogs_pintura, Dialogs_univ, Dialogs_expos
-from config_dialog import ConfigDialog
 from config import config_manager
-from PyQt5 import uic
+from UI_Dialogs.formularios import carregar_ui
 from PyQt5.QtWidgets import QApplication, QMainWindow, QDialog, QVBoxLayout, QDialogButtonBox, QMessageBox, QHeaderView
-from PyQt5.QtGui import QStandardItemModel, QStandardItem, QIcon
+from PyQt5.QtGui import QIcon
+from PyQt5.QtCore import Qt, QTimer
 
 # Determinar o diretório base correto (funciona tanto no código quanto no executável)
 if getattr(sys, 'frozen', False):
@@ -31,8 +34,18 @@ UI_DIR   = RESOURCE_DIR / "Interface"
 # Banco de dados usa caminho relativo simples
 DB_PATH  = BASE_DIR / "Data" / "Data.db"
 
-from Funções.crud_pint import listar_pinturas, busca_filtros, busca_avancada, adicionar_pintura, atualizar_pintura, buscar_pintura, remover_pintura
+from Funções.crud_pint import busca_filtros, busca_avancada, adicionar_pintura, atualizar_pintura, buscar_pintura, remover_pintura
+from Funções.crud_pint import contar_pinturas, listar_pinturas_pagina
+from Funções.crud_exp import contar_exposicoes, listar_exposicoes_pagina
 from Funções import crud_series
+from Funções.cache_detalhes import cache_detalhes
+from UI_Dialogs.modelo_tabela import ModeloTabelaPaginado
+
+CABECALHOS_PINTURAS = ["ID", "Título", "Técnica", "Tamanho", "Data", "Local", "Série"]
+CABECALHOS_EXPOSICOES = ["ID", "Nome", "Tema", "Artistas", "Data", "Local", "Curadoria", "Organizador"]
+CABECALHOS_SERIES = ["ID", "Nome", "Descrição", "Data Início", "Data Fim", "Nº Pinturas"]
+from Funções.conexao import gerenciador_conexoes
+from Funções.backup import servico_backup
 
 
 
@@ -45,7 +58,7 @@ class MainWindow(QMainWindow):
     def __init__(self):
         """Inicializar interface e conectar eventos"""
         super(MainWindow, self).__init__()
-        uic.loadUi(os.path.join(UI_DIR, 'main', 'interface.ui'), self)
+        carregar_ui(os.path.join(UI_DIR, 'main', 'interface.ui'), self)
         
         # Configurar interface inicial
         self._configurar_interface()
@@ -72,6 +85,11 @@ class MainWindow(QMainWindow):
         # Permitir seleção múltipla na tabela de séries
         self.tableView_series.setSelectionMode(QAbstractItemView.ExtendedSelection)
         
+        # Ordenação pelo cabeçalho (feita no banco pelos modelos paginados)
+        for table_view in (self.tableView, self.tableView_3, self.tableView_series):
+            table_view.horizontalHeader().setSortIndicator(0, Qt.AscendingOrder)
+            table_view.setSortingEnabled(True)
+        
         # Carregar dados iniciais
         self.tabelar_pinturas()
         self.tabelar_exposicoes()
@@ -129,16 +147,70 @@ class MainWindow(QMainWindow):
         # Menu Arquivo
         self.actionAbrir_Biblioteca.triggered.connect(self.escolher_pasta_biblioteca)
         self.actionConfigura_es.triggered.connect(self.abrir_configuracoes)
+        self.menuArquivo.addAction("Diagnóstico de consultas...", self.abrir_diagnostico)
+        self.menuArquivo.addAction("Limpar registros órfãos...", self.limpar_orfaos)
     
     
     def abrir_configuracoes(self):
         """Abrir diálogo de configurações"""
         try:
+            from config_dialog import ConfigDialog
             dialog = ConfigDialog(self)
             dialog.exec_()
         except Exception as e:
             QMessageBox.critical(self, "Erro", f"Erro ao abrir configurações:\n{e}")
     
+    def abrir_diagnostico(self):
+        """Abrir painel do perfil SQL (consultas lentas e planos)"""
+        try:
+            from UI_Dialogs.Dialogs_diagnostico import DiagnosticoDialog
+            dialog = DiagnosticoDialog(self)
+            dialog.exec_()
+        except Exception as e:
+            QMessageBox.critical(self, "Erro", f"Erro ao abrir diagnóstico:\n{e}")
+    
+    def limpar_orfaos(self):
+        """Varredura de registros, pastas e fotos órfãos + VACUUM em segundo plano"""
+        resposta = QMessageBox.question(
+            self,
+            "Limpar registros órfãos",
+            "Remover registros, pastas e fotos de pinturas já excluídas e compactar o banco?\n"
+            "A varredura roda em segundo plano.",
+            QMessageBox.Yes | QMessageBox.No
+        )
+        if resposta != QMessageBox.Yes:
+            return
+
+        from Funções.exclusao import varrer_em_segundo_plano
+        self._resultado_varredura = None
+        thread = varrer_em_segundo_plano(lambda resultado: setattr(self, "_resultado_varredura", resultado),
+                                         db_path=str(DB_PATH))
+        self.statusBar().showMessage("🧹 Varredura de órfãos em andamento...")
+        self._acompanhar_varredura(thread)
+    
+    def _acompanhar_varredura(self, thread):
+        """Aguardar a thread da varredura sem travar a janela e mostrar o relatório"""
+        if thread.is_alive():
+            QTimer.singleShot(200, lambda: self._acompanhar_varredura(thread))
+            return
+
+        self.statusBar().clearMessage()
+        resultado = self._resultado_varredura
+        if not isinstance(resultado, dict):
+            QMessageBox.critical(self, "Erro", f"Erro na varredura de órfãos:\n{resultado}")
+            return
+
+        linhas = "\n".join(f"   {tabela}: {total}" for tabela, total in resultado["linhas"].items()) or "   nenhum"
+        megabytes = (resultado["bytes_arquivos"] + resultado["bytes_banco"]) / 1024 / 1024
+        QMessageBox.information(
+            self,
+            "Varredura concluída",
+            f"Registros órfãos removidos:\n{linhas}\n\n"
+            f"Pastas removidas: {resultado['pastas']}\n"
+            f"Fotos sem uso removidas: {resultado['objetos']}\n"
+            f"Espaço liberado: {megabytes:.1f} MB"
+        )
+    
     def escolher_pasta_biblioteca(self):
         """Atalho rápido para escolher pasta da biblioteca"""
         from PyQt5.QtWidgets import QFileDialog
@@ -209,16 +281,29 @@ class MainWindow(QMainWindow):
 
 
 
+    def _recarregar_modelo(self, table_view):
+        """Reaproveitar o modelo paginado já exibido (apenas recontar e descartar páginas)"""
+        model = table_view.model()
+        if isinstance(model, ModeloTabelaPaginado) and getattr(model, "completo", False):
+            model.recarregar()
+            return True
+        return False
+
     def tabelar_pinturas(self):
-        rows = listar_pinturas()
-        self.preencher_tabela(rows)
+        if self._recarregar_modelo(self.tableView):
+            return
+        model = ModeloTabelaPaginado(
+            CABECALHOS_PINTURAS, contar_pinturas,
+            lambda offset, limite, ordem, desc: listar_pinturas_pagina(offset, limite, ordem, desc),
+            self
+        )
+        self.exibir_modelo_pinturas(model)
 
     def preencher_tabela(self, rows):
-        model = QStandardItemModel(len(rows), 7, self)
-        model.setHorizontalHeaderLabels(["ID", "Título", "Técnica", "Tamanho", "Data", "Local", "Série"])
-        for r, row in enumerate(rows):
-            for c, val in enumerate(row[:7]):
-                model.setItem(r, c, QStandardItem(str(val)))
+        """Exibir resultados de busca na tabela de pinturas"""
+        self.exibir_modelo_pinturas(ModeloTabelaPaginado.de_linhas(CABECALHOS_PINTURAS, rows, self))
+
+    def exibir_modelo_pinturas(self, model):
         self.tableView.setModel(model)
         
         # Configurar tamanho das colunas de forma dinâmica
@@ -229,17 +314,20 @@ class MainWindow(QMainWindow):
 
     def tabelar_exposicoes(self):
         """Carregar exposições na tabela da aba Exposições"""
-        from Funções.crud_exp import listar_exposicoes
-        rows = listar_exposicoes()
-        self.preencher_tabela_exposicoes(rows)
+        if self._recarregar_modelo(self.tableView_3):
+            return
+        model = ModeloTabelaPaginado(
+            CABECALHOS_EXPOSICOES, contar_exposicoes,
+            lambda offset, limite, ordem, desc: listar_exposicoes_pagina(offset, limite, ordem, desc),
+            self
+        )
+        self.exibir_modelo_exposicoes(model)
 
     def preencher_tabela_exposicoes(self, rows):
-        """Preencher a tabela de exposições (tableView_3)"""
-        model = QStandardItemModel(len(rows), 8, self)
-        model.setHorizontalHeaderLabels(["ID", "Nome", "Tema", "Artistas", "Data", "Local", "Curadoria", "Organizador"])
-        for r, row in enumerate(rows):
-            for c, val in enumerate(row[:8]):
-                model.setItem(r, c, QStandardItem(str(val)))
+        """Preencher a tabela de exposições (tableView_3) com resultados já carregados"""
+        self.exibir_modelo_exposicoes(ModeloTabelaPaginado.de_linhas(CABECALHOS_EXPOSICOES, rows, self))
+
+    def exibir_modelo_exposicoes(self, model):
         self.tableView_3.setModel(model)
         
         # Configurar tamanho das colunas de forma dinâmica
@@ -250,16 +338,22 @@ class MainWindow(QMainWindow):
 
     def tabelar_series(self):
         """Carregar séries na tabela da aba Séries"""
-        series = crud_series.listar_series(db_path=str(DB_PATH))
-        self.preencher_tabela_series(series)
+        if self._recarregar_modelo(self.tableView_series):
+            return
+        model = ModeloTabelaPaginado(
+            CABECALHOS_SERIES,
+            lambda: crud_series.contar_series(db_path=str(DB_PATH)),
+            lambda offset, limite, ordem, desc: crud_series.listar_series_pagina(
+                offset, limite, ordem, desc, db_path=str(DB_PATH)),
+            self
+        )
+        self.exibir_modelo_series(model)
 
     def preencher_tabela_series(self, rows):
-        """Preencher a tabela de séries (tableView_series)"""
-        model = QStandardItemModel(len(rows), 6, self)
-        model.setHorizontalHeaderLabels(["ID", "Nome", "Descrição", "Data Início", "Data Fim", "Nº Pinturas"])
-        for r, row in enumerate(rows):
-            for c, val in enumerate(row[:6]):
-                model.setItem(r, c, QStandardItem(str(val)))
+        """Preencher a tabela de séries (tableView_series) com resultados já carregados"""
+        self.exibir_modelo_series(ModeloTabelaPaginado.de_linhas(CABECALHOS_SERIES, rows, self))
+
+    def exibir_modelo_series(self, model):
         self.tableView_series.setModel(model)
         
         # Configurar tamanho das colunas de forma dinâmica
@@ -268,7 +362,23 @@ class MainWindow(QMainWindow):
         # Conectar seleção da tabela após preencher
         self.tableView_series.selectionModel().selectionChanged.connect(self.on_serie_selected)
 
+    def localizar_linha(self, table_view, registro_id):
+        """Linha do registro com o ID informado (buscando mais páginas se preciso)"""
+        model = table_view.model()
+        if not model:
+            return None
+        row = 0
+        while True:
+            while row < model.rowCount():
+                if str(model.index(row, 0).data()) == str(registro_id):
+                    return row
+                row += 1
+            if not model.canFetchMore():
+                return None
+            model.fetchMore()
+
     def abrir_pesquisa(self):
+        from UI_Dialogs import Dialogs_pintura
         dialog = Dialogs_pintura.Pesquisa_pintura()
         if dialog.exec_() == QDialog.Accepted:
             filtros = dialog.filtros
@@ -279,6 +389,7 @@ class MainWindow(QMainWindow):
     
     def abrir_busca_avancada(self):
         """Abrir interface de busca avançada"""
+        from UI_Dialogs import Dialogs_pintura
         dialog = Dialogs_pintura.Busca_Avancada_Pintura()
         if dialog.exec_() == QDialog.Accepted:
             pintura_selecionada = dialog.obter_pintura_selecionada()
@@ -287,20 +398,20 @@ class MainWindow(QMainWindow):
                 self.preencher_tabela(dialog.resultados)
                 
                 # Selecionar a pintura específica se foi escolhida
-                model = self.tableView.model()
-                for row in range(model.rowCount()):
-                    if int(model.index(row, 0).data()) == pintura_selecionada:
-                        self.tableView.selectRow(row)
-                        break
+                row = self.localizar_linha(self.tableView, pintura_selecionada)
+                if row is not None:
+                    self.tableView.selectRow(row)
 
     def adicionar_pintura(self):
         """Abrir dialog para adicionar nova pintura"""
+        from UI_Dialogs import Dialogs_pintura
         dialog = Dialogs_pintura.Nova_pintura()
         if dialog.exec_() == QDialog.Accepted:
             self.carregar_pinturas()
 
     def abrir_pinturas(self):
         """Abrir pinturas selecionadas"""
+        from UI_Dialogs import Dialogs_pintura
         selected = self.tableView.selectionModel().selectedRows()
         if selected:
             for index in selected:
@@ -311,6 +422,7 @@ class MainWindow(QMainWindow):
 
     def editar_selecao(self):
         """Editar pinturas selecionadas"""
+        from UI_Dialogs import Dialogs_pintura
         selected = self.tableView.selectionModel().selectedRows()
         if selected:
             pintura_ids = [self.tableView.model().index(index.row(), 0).data() for index in selected]
@@ -322,6 +434,7 @@ class MainWindow(QMainWindow):
 
     def excluir_selecao(self):
         """Excluir pinturas selecionadas"""
+        from UI_Dialogs import Dialogs_pintura
         selected = self.tableView.selectionModel().selectedRows()
         if selected:
             pintura_ids = [self.tableView.model().index(index.row(), 0).data() for index in selected]
@@ -333,6 +446,7 @@ class MainWindow(QMainWindow):
 
     def adicionar_exposicao(self):
         """Adicionar nova exposição"""
+        from UI_Dialogs import Dialogs_expos
         dialog = Dialogs_expos.Nova_exposicao()
         if dialog.exec_() == QDialog.Accepted:
             QMessageBox.information(self, "Sucesso", "Exposição adicionada com sucesso!")
@@ -377,6 +491,7 @@ class MainWindow(QMainWindow):
             if current_item:
                 exposicao_id = current_item.data(32)
                 # Abrir diálogo de detalhes da exposição
+                from UI_Dialogs import Dialogs_expos
                 expo_dialog = Dialogs_expos.Abrir_exposicao(exposicao_id)
                 expo_dialog.exec_()
 
@@ -384,7 +499,7 @@ class MainWindow(QMainWindow):
         idx = selected.indexes()
         if not idx: return
         row = idx[0].row()
-        pintura_id = int(self.tableView.model().item(row, 0).text())
+        pintura_id = int(self.tableView.model().index(row, 0).data())
 
         # 1) Dados principais da pintura
         from Funções.crud_pint import buscar_pintura
@@ -539,10 +654,19 @@ class MainWindow(QMainWindow):
             row = selected[0].row()
             exposicao_id = self.tableView_3.model().index(row, 0).data()
             
-            # Buscar detalhes da exposição
+            # Buscar detalhes da exposição (do cache, se já foi exibida)
             from Funções.crud_exp import buscar_exposicao
+            from Funções.crud_pinturas_exposicoes import contar_obras_exposicao
+
+            def carregar():
+                exposicao = buscar_exposicao(exposicao_id, db_path=str(DB_PATH))
+                if not exposicao:
+                    return None
+                return exposicao, contar_obras_exposicao(exposicao_id, db_path=str(DB_PATH))
+
             try:
-                detalhes = buscar_exposicao(exposicao_id, db_path=str(DB_PATH))
+                registro = cache_detalhes.obter("exposicao", exposicao_id, carregar, db_path=str(DB_PATH))
+                detalhes, num_obras = registro if registro else (None, 0)
                 
                 if detalhes:
                     # detalhes é uma tupla: (id, nome, tema, artistas, data, local, curadoria, organizador)
@@ -553,14 +677,7 @@ class MainWindow(QMainWindow):
                     self.label_17.setText(detalhes[5] if len(detalhes) > 5 else '')  # Local
                     self.label_45.setText(detalhes[1] if len(detalhes) > 1 else '')  # Título no topo
                     
-                    # Contar número de obras na exposição
-                    from Funções.crud_pinturas_exposicoes import contar_obras_exposicao
-                    try:
-                        num_obras = contar_obras_exposicao(exposicao_id, db_path=str(DB_PATH))
-                        self.label_37.setText(str(num_obras))  # Número de obras
-                    except Exception as e:
-                        print(f"Erro ao contar obras: {e}")
-                        self.label_37.setText("0")
+                    self.label_37.setText(str(num_obras))  # Número de obras
                         
             except Exception as e:
                 print(f"Erro ao buscar exposição: {e}")
@@ -583,6 +700,7 @@ class MainWindow(QMainWindow):
                 try:
                     if getattr(dialog, 'selected_exposicao_id', None):
                         expo_id = dialog.selected_exposicao_id
+                        from UI_Dialogs import Dialogs_expos
                         expo_dialog = Dialogs_expos.Abrir_exposicao(expo_id)
                         expo_dialog.exec_()
                 finally:
@@ -606,21 +724,14 @@ class MainWindow(QMainWindow):
                 try:
                     serie_id = getattr(dialog, 'selected_serie_id', None)
                     if serie_id:
-                        model = self.tableView_series.model()
-                        if model:
-                            for r in range(model.rowCount()):
-                                try:
-                                    val = model.index(r, 0).data()
-                                except:
-                                    val = None
-                                if str(val) == str(serie_id):
-                                    # Selecionar a linha e abrir detalhe
-                                    try:
-                                        self.tableView_series.selectRow(r)
-                                        self.abrir_serie()
-                                    except Exception:
-                                        pass
-                                    break
+                        r = self.localizar_linha(self.tableView_series, serie_id)
+                        if r is not None:
+                            # Selecionar a linha e abrir detalhe
+                            try:
+                                self.tableView_series.selectRow(r)
+                                self.abrir_serie()
+                            except Exception:
+                                pass
                 except Exception:
                     pass
         except Exception as e:
@@ -787,7 +898,7 @@ class MainWindow(QMainWindow):
             class EditarSerieUI(QDialog):
                 def __init__(self, serie_data, parent=None):
                     super().__init__(parent)
-                    uic.loadUi(os.path.join(UI_DIR, 'Editar', 'Editar_série.ui'), self)
+                    carregar_ui(os.path.join(UI_DIR, 'Editar', 'Editar_série.ui'), self)
                     self.serie_data = serie_data
                     self.setWindowTitle("Editar Série")
                     self.setModal(True)
@@ -933,12 +1044,14 @@ class MainWindow(QMainWindow):
                 sucessos = 0
                 erros = []
                 
-                for serie_id, nome in series_para_excluir:
-                    success, message = crud_series.remover_serie(serie_id, db_path=str(DB_PATH))
-                    if success:
-                        sucessos += 1
-                    else:
-                        erros.append(f'{nome}: {message}')
+                # Uma única transação (um commit) para todas as séries
+                with gerenciador_conexoes.transacao(str(DB_PATH)):
+                    for serie_id, nome in series_para_excluir:
+                        success, message = crud_series.remover_serie(serie_id, db_path=str(DB_PATH))
+                        if success:
+                            sucessos += 1
+                        else:
+                            erros.append(f'{nome}: {message}')
                 
                 # Mostrar resultado
                 if sucessos > 0 and len(erros) == 0:
@@ -981,7 +1094,7 @@ class MainWindow(QMainWindow):
                 class EditarExposicao(QDialog):
                     def __init__(self, exposicao_data, parent=None):
                         super().__init__(parent)
-                        uic.loadUi(os.path.join(UI_DIR, 'Editar', 'Editar_expo.ui'), self)
+                        carregar_ui(os.path.join(UI_DIR, 'Editar', 'Editar_expo.ui'), self)
                         self.exposicao_data = exposicao_data
                         self.setWindowTitle("Editar Exposição")
                         self.setModal(True)
@@ -1185,6 +1298,7 @@ class MainWindow(QMainWindow):
                     
                     adicionar_layout.addWidget(QLabel("Todas as pinturas disponíveis:"))
                     self.lista_todas_obras = QListWidget()
+                    self.lista_todas_obras.setSelectionMode(QListWidget.ExtendedSelection)
                     adicionar_layout.addWidget(self.lista_todas_obras)
                     
                     btn_adicionar = QPushButton("Adicionar à Exposição")
@@ -1230,16 +1344,20 @@ class MainWindow(QMainWindow):
                         QMessageBox.warning(self, "Erro", f"Erro ao carregar dados: {e}")
                     
                 def adicionar_obra(self):
-                    """Adicionar obra selecionada à exposição"""
-                    current_item = self.lista_todas_obras.currentItem()
-                    if current_item:
-                        pintura_id = current_item.data(32)
+                    """Adicionar obras selecionadas à exposição"""
+                    itens = self.lista_todas_obras.selectedItems()
+                    if itens:
+                        pintura_ids = [item.data(32) for item in itens]
                         
                         try:
-                            from Funções.crud_pinturas_exposicoes import associar_pintura_exposicao
-                            success = associar_pintura_exposicao(pintura_id, self.exposicao_id, db_path=str(DB_PATH))
-                            if success:
-                                QMessageBox.information(self, "Sucesso", "Obra adicionada à exposição!")
+                            from Funções.crud_pinturas_exposicoes import associar_pinturas_exposicoes
+                            resultado = associar_pinturas_exposicoes(pintura_ids, self.exposicao_id, db_path=str(DB_PATH))
+                            adicionadas = sum(1 for novo in resultado.values() if novo)
+                            if adicionadas:
+                                mensagem = f"{adicionadas} obra(s) adicionada(s) à exposição!"
+                                if adicionadas < len(resultado):
+                                    mensagem += f"\n{len(resultado) - adicionadas} já estava(m) na exposição."
+                                QMessageBox.information(self, "Sucesso", mensagem)
                                 self.carregar_dados()  # Recarregar
                             else:
                                 QMessageBox.warning(self, "Aviso", "Obra já está na exposição ou erro ao adicionar!")
@@ -1285,9 +1403,13 @@ class MainWindow(QMainWindow):
             row = selected[0].row()
             serie_id = self.tableView_series.model().index(row, 0).data()
             
-            # Buscar detalhes da série
+            # Buscar detalhes da série (do cache, se já foi exibida)
             try:
-                serie = crud_series.buscar_serie(serie_id, db_path=str(DB_PATH))
+                serie = cache_detalhes.obter(
+                    "serie", serie_id,
+                    lambda: crud_series.buscar_serie(serie_id, db_path=str(DB_PATH)),
+                    db_path=str(DB_PATH)
+                )
                 
                 if serie:
                     # Atualizar labels da aba Séries
@@ -1324,10 +1446,29 @@ class MainWindow(QMainWindow):
                 self.label_seriesPinturasValor.setText("")
 
 
+def _tarefas_apos_abertura():
+    """Trabalho adiado para depois de a janela aparecer"""
+    import threading
+    from Funções.gerenciador_pastas import gerenciador_pastas
+    # Estrutura de pastas em segundo plano (as funções que usam as pastas também a garantem)
+    threading.Thread(target=gerenciador_pastas.preparar_estrutura, daemon=True).start()
+    servico_backup.iniciar()
+    # Fotos copiadas para as pastas pelo Explorer entram no índice e no banco
+    from UI_Dialogs.monitor_pastas import iniciar_monitor
+    iniciar_monitor(QApplication.instance())
+    relatorio_inicio.concluir()
+
+
 if __name__ == "__main__":
+    relatorio_inicio.marcar("Importações")
     app = QApplication(sys.argv)
+    app.aboutToQuit.connect(servico_backup.parar)
+    app.aboutToQuit.connect(gerenciador_conexoes.fechar_todas)
+    relatorio_inicio.marcar("QApplication")
     window = MainWindow()
+    relatorio_inicio.marcar("Janela principal montada")
     window.show()
+    QTimer.singleShot(0, _tarefas_apos_abertura)
     sys.exit(app.exec_())
     
 
@@ -0,0 +1,187 @@
+# -*- coding: utf-8 -*-
+"""
+Diálogo de Diagnóstico
+Painel do perfil SQL: consultas agrupadas por tempo total, consultas lentas
+com o plano de execução e destaque para as que leem tabelas inteiras (SCAN)
+"""
+
+import os
+import sys
+import time
+from pathlib import Path
+
+from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QTabWidget, QLabel,
+                             QPushButton, QCheckBox, QSpinBox, QTableWidget,
+                             QTableWidgetItem, QHeaderView, QDialogButtonBox)
+from PyQt5.QtGui import QColor, QDesktopServices
+from PyQt5.QtCore import Qt, QUrl
+
+# Adicionar o diretório pai ao path para importações
+sys.path.append(str(Path(__file__).parent.parent))
+
+from Funções.perfil_sql import perfil_sql
+from Funções.conexao import gerenciador_conexoes
+
+COR_VARREDURA = QColor(255, 220, 220)
+
+
+def _item(valor, alinhar_direita=False):
+    item = QTableWidgetItem(str(valor))
+    item.setFlags(item.flags() & ~Qt.ItemIsEditable)
+    if alinhar_direita:
+        item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+    return item
+
+
+class DiagnosticoDialog(QDialog):
+    """Painel de diagnóstico das consultas SQL"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Diagnóstico de Consultas")
+        self.resize(1000, 600)
+
+        self.setup_ui()
+        self.atualizar()
+
+    def setup_ui(self):
+        """Configurar interface do diálogo"""
+        layout = QVBoxLayout(self)
+
+        # Controles do perfil
+        controles = QHBoxLayout()
+        self.perfil_ativo = QCheckBox("Registrar consultas")
+        self.perfil_ativo.setChecked(perfil_sql.ativo)
+        self.perfil_ativo.toggled.connect(self.alternar_perfil)
+        controles.addWidget(self.perfil_ativo)
+
+        controles.addWidget(QLabel("Lenta a partir de:"))
+        self.limite_ms = QSpinBox()
+        self.limite_ms.setRange(1, 60000)
+        self.limite_ms.setSuffix(" ms")
+        self.limite_ms.setValue(int(perfil_sql.limite_ms))
+        self.limite_ms.valueChanged.connect(self.alterar_limite)
+        controles.addWidget(self.limite_ms)
+        controles.addStretch()
+
+        btn_atualizar = QPushButton("Atualizar")
+        btn_atualizar.clicked.connect(self.atualizar)
+        controles.addWidget(btn_atualizar)
+
+        btn_limpar = QPushButton("Limpar")
+        btn_limpar.clicked.connect(self.limpar)
+        controles.addWidget(btn_limpar)
+
+        btn_log = QPushButton("Abrir log")
+        btn_log.clicked.connect(self.abrir_log)
+        controles.addWidget(btn_log)
+        layout.addLayout(controles)
+
+        self.status = QLabel()
+        layout.addWidget(self.status)
+
+        # Abas: resumo por consulta e consultas lentas
+        self.tab_widget = QTabWidget()
+        self.tabela_resumo = self.criar_tabela(
+            ["Origem", "Execuções", "Total (ms)", "Médio (ms)", "Máx. (ms)", "Linhas", "Lentas", "SQL"])
+        self.tab_widget.addTab(self.tabela_resumo, "Resumo")
+        self.tabela_lentas = self.criar_tabela(
+            ["Hora", "Tempo (ms)", "Linhas", "Origem", "Parâmetros", "SQL", "Plano"])
+        self.tab_widget.addTab(self.tabela_lentas, "Consultas lentas")
+        layout.addWidget(self.tab_widget)
+
+        buttons = QDialogButtonBox(QDialogButtonBox.Close)
+        buttons.rejected.connect(self.reject)
+        layout.addWidget(buttons)
+
+    def criar_tabela(self, colunas):
+        tabela = QTableWidget(0, len(colunas))
+        tabela.setHorizontalHeaderLabels(colunas)
+        tabela.setSelectionBehavior(QTableWidget.SelectRows)
+        tabela.setWordWrap(False)
+        tabela.verticalHeader().setVisible(False)
+        tabela.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        tabela.horizontalHeader().setStretchLastSection(True)
+        return tabela
+
+    def alternar_perfil(self, ativo):
+        """Ligar/desligar o perfil e lembrar a escolha na configuração"""
+        if ativo:
+            perfil_sql.ativar(self.limite_ms.value())
+        else:
+            perfil_sql.desativar()
+        try:
+            from config import config_manager
+            config_manager.set("sql_profiling_enabled", ativo)
+        except ImportError:
+            pass
+        self.atualizar()
+
+    def alterar_limite(self, valor):
+        perfil_sql.limite_ms = valor
+        try:
+            from config import config_manager
+            config_manager.set("slow_query_ms", valor)
+        except ImportError:
+            pass
+
+    def limpar(self):
+        perfil_sql.limpar()
+        gerenciador_conexoes.resetar_estatisticas()
+        self.atualizar()
+
+    def abrir_log(self):
+        if perfil_sql.arquivo_log.exists():
+            QDesktopServices.openUrl(QUrl.fromLocalFile(str(perfil_sql.arquivo_log)))
+        else:
+            self.status.setText("Nenhuma consulta lenta registrada em disco ainda.")
+
+    def atualizar(self):
+        """Recarregar as tabelas com as medições atuais"""
+        resumo = perfil_sql.resumo()
+        self.tabela_resumo.setRowCount(len(resumo))
+        for linha, consulta in enumerate(resumo):
+            valores = [
+                ", ".join(consulta["origens"]),
+                _item(consulta["execucoes"], True),
+                _item(f"{consulta['ms_total']:.1f}", True),
+                _item(f"{consulta['ms_medio']:.2f}", True),
+                _item(f"{consulta['ms_max']:.1f}", True),
+                _item(consulta["linhas"], True),
+                _item(consulta["lentas"], True),
+                consulta["sql"],
+            ]
+            for coluna, valor in enumerate(valores):
+                item = valor if isinstance(valor, QTableWidgetItem) else _item(valor)
+                if consulta["varredura"]:
+                    item.setBackground(COR_VARREDURA)
+                    item.setToolTip(f"Lê a(s) tabela(s) inteira(s): {', '.join(consulta['varredura'])}")
+                self.tabela_resumo.setItem(linha, coluna, item)
+
+        lentas = list(reversed(perfil_sql.lentas))
+        self.tabela_lentas.setRowCount(len(lentas))
+        for linha, registro in enumerate(lentas):
+            plano = registro.get("plano") or []
+            valores = [
+                _item(time.strftime("%H:%M:%S", time.localtime(registro["instante"]))),
+                _item(f"{registro['ms']:.1f}", True),
+                _item(registro["linhas"], True),
+                _item(registro["origem"]),
+                _item(registro["parametros"]),
+                _item(registro["sql"]),
+                _item(" | ".join(plano)),
+            ]
+            for coluna, item in enumerate(valores):
+                item.setToolTip("\n".join(plano) or registro["sql"])
+                if registro.get("varredura"):
+                    item.setBackground(COR_VARREDURA)
+                self.tabela_lentas.setItem(linha, coluna, item)
+
+        estatisticas = gerenciador_conexoes.obter_estatisticas()
+        varreduras = sum(1 for consulta in resumo if consulta["varredura"])
+        estado = "ativo" if perfil_sql.ativo else "desligado (marque para registrar)"
+        self.status.setText(
+            f"Perfil {estado} • {len(resumo)} consulta(s) distintas • {len(lentas)} lenta(s) • "
+            f"{varreduras} com SCAN • {estatisticas['conexoes_abertas']} conexão(ões) abertas • "
+            f"log: {os.path.basename(str(perfil_sql.arquivo_log))}"
+        )
@@ -6,7 +6,6 @@ Classes de diálogo para adicionar, editar e visualizar exposições
 
 from PyQt5.QtWidgets import QDialog, QDialogButtonBox, QTableWidgetItem, QMessageBox, QListWidgetItem, QVBoxLayout, QListWidget, QLabel, QPushButton
 from PyQt5.QtGui import QPixmap, QStandardItemModel, QStandardItem
-from PyQt5 import uic
 from PyQt5.QtCore import Qt
 import os
 import sys
@@ -16,8 +15,12 @@ from pathlib import Path
 sys.path.append(str(Path(__file__).parent.parent))
 
 from Funções.crud_exp import adicionar_exposicao
-from Funções.crud_pinturas_exposicoes import associar_pintura_exposicao, remover_pintura_exposicao, mostrar_detalhes_exposicao, listar_obras_exposicao
+from Funções.crud_pinturas_exposicoes import associar_pinturas_exposicoes, remover_pintura_exposicao, mostrar_detalhes_exposicao, listar_obras_exposicao
 from Funções.detalhes_pintura import mostrar_detalhes
+from Funções.indice_fotos import indice_fotos
+from UI_Dialogs.carregador_imagens import CarregadorImagens
+from UI_Dialogs.busca_incremental import BuscaIncremental
+from UI_Dialogs.formularios import carregar_ui
 
 BASE_DIR = Path(__file__).parent.parent.resolve()
 UI_DIR   = BASE_DIR / "Interface"
@@ -26,7 +29,7 @@ DB_PATH  = BASE_DIR / "Data" / "Data.db"
 class Nova_exposicao(QDialog):
     def __init__(self):
         super().__init__()
-        uic.loadUi(os.path.join(UI_DIR, "Adicionar", "Exposicao.ui"), self)
+        carregar_ui(os.path.join(UI_DIR, "Adicionar", "Exposicao.ui"), self)
         self.setWindowTitle("Nova Exposição")
         self.btnSalvar = self.findChild(QPushButton, 'btnSalvar')
         self.btnCancelar = self.findChild(QPushButton, 'btnCancelar')
@@ -75,9 +78,16 @@ class Nova_exposicao(QDialog):
 class Abrir_exposicao(QDialog):
     def __init__(self, exposicao_id):
         super().__init__()
-        uic.loadUi(os.path.join(UI_DIR, "Abrir", "Exposicao.ui"), self)
+        carregar_ui(os.path.join(UI_DIR, "Abrir", "Exposicao.ui"), self)
         self.setWindowTitle("Visualizar Exposição")
         self.exposicao_id = exposicao_id
+        self.fotos_path_obra = None
+        self.caminho_exibido = None
+        
+        # Carregador de imagens em segundo plano
+        self.carregador = CarregadorImagens(self)
+        self.carregador.imagemCarregada.connect(self.exibir_foto)
+        self.carregador.falhaCarregamento.connect(self.falha_foto)
         
         # Conectar botões e eventos
         self.conectar_eventos()
@@ -160,11 +170,11 @@ class Abrir_exposicao(QDialog):
         detalhes_obra = mostrar_detalhes(obra_id, db_path=str(DB_PATH))
         fotos_path = detalhes_obra.get("fotos_path")
         
-        if fotos_path and os.path.exists(fotos_path):
-            # Listar arquivos de foto
-            for foto in os.listdir(fotos_path):
-                if foto.lower().endswith(('.png', '.jpg', '.jpeg', '.bmp', '.gif')):
-                    self.comboBox.addItem(foto)
+        # Imagens da pasta Fotos da obra pelo índice (sem listar o diretório a cada seleção)
+        fotos = indice_fotos.fotos(obra_id, fotos_path) if fotos_path else []
+        self.fotos_path_obra = indice_fotos.pasta(obra_id)
+        if fotos:
+            self.comboBox.addItems(fotos)
         else:
             # Sem fotos disponíveis
             self.comboBox.addItem("Sem fotos")
@@ -182,21 +192,44 @@ class Abrir_exposicao(QDialog):
             
         obra_id = item_atual.data(Qt.UserRole)
         if obra_id:
-            # Buscar caminho das fotos
-            detalhes_obra = mostrar_detalhes(obra_id, db_path=str(DB_PATH))
-            fotos_path = detalhes_obra.get("fotos_path")
+            # Caminho das fotos (já obtido ao listar as fotos da obra)
+            fotos_path = self.fotos_path_obra
             
             if fotos_path:
                 caminho_completo = os.path.join(fotos_path, nome_foto)
-                if os.path.exists(caminho_completo):
-                    # Carregar e redimensionar foto
-                    pixmap = QPixmap(caminho_completo).scaled(400, 400, Qt.KeepAspectRatio)
-                    self.Imagens_expo_selecionadas.setPixmap(pixmap)
+                if indice_fotos.existe(obra_id, caminho_completo):
+                    # Carregar e redimensionar foto em segundo plano
+                    self.caminho_exibido = caminho_completo
+                    self.carregador.carregar(caminho_completo, (400, 400))
+                    
+                    # Adiantar as fotos anterior e seguinte
+                    indice = self.comboBox.currentIndex()
+                    vizinhas = [self.comboBox.itemText(i) for i in (indice + 1, indice - 1)
+                                if 0 <= i < self.comboBox.count()]
+                    self.carregador.pre_carregar(
+                        [os.path.join(fotos_path, foto) for foto in vizinhas], (400, 400))
                 else:
+                    self.carregador.cancelar()
                     self.Imagens_expo_selecionadas.setText("Foto não encontrada")
             else:
                 self.Imagens_expo_selecionadas.setText("Sem fotos")
 
+    def exibir_foto(self, caminho, imagem):
+        # Foto decodificada pelo carregador
+        if caminho != self.caminho_exibido:
+            return
+        pixmap = QPixmap.fromImage(imagem).scaled(400, 400, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+        self.Imagens_expo_selecionadas.setPixmap(pixmap)
+
+    def falha_foto(self, caminho):
+        if caminho == self.caminho_exibido:
+            self.Imagens_expo_selecionadas.setText("Erro ao carregar foto")
+
+    def done(self, resultado):
+        # Cancelar carregamentos pendentes ao fechar
+        self.carregador.cancelar()
+        super().done(resultado)
+
     def mostrar_primeira_foto(self):
         # Mostrar primeira foto automaticamente
         if self.comboBox.count() > 0:
@@ -290,16 +323,16 @@ class Selecionar_obras_para_exposicao(QDialog):
             QMessageBox.warning(self, "Aviso", "Selecione pelo menos uma obra!")
             return
         
-        for item in items_selecionados:
-            obra_id = item.data(Qt.UserRole)
-            associar_pintura_exposicao(obra_id, self.exposicao_id, db_path=str(DB_PATH))
+        # Todas as obras em uma única operação (um commit)
+        obra_ids = [item.data(Qt.UserRole) for item in items_selecionados]
+        associar_pinturas_exposicoes(obra_ids, self.exposicao_id, db_path=str(DB_PATH))
         
         self.accept()
 
 class Exposicao_caminho(QDialog):
     def __init__(self, exposicao_id, nome_exposicao):
         super().__init__()
-        uic.loadUi(os.path.join(UI_DIR, "Adicionar", 'Pintura_caminho.ui'), self)
+        carregar_ui(os.path.join(UI_DIR, "Adicionar", 'Pintura_caminho.ui'), self)
         self.exposicao_id = exposicao_id
         
         # Personalizar para exposição
@@ -331,7 +364,7 @@ class Exposicao_caminho(QDialog):
 class Pesquisa_exposicao(QDialog):
     def __init__(self):
         super().__init__()
-        uic.loadUi(os.path.join(UI_DIR, "Buscar", 'Pesquisa_exposicao.ui'), self)
+        carregar_ui(os.path.join(UI_DIR, "Buscar", 'Pesquisa_exposicao.ui'), self)
         
         # Conectar botões
         self.btnBuscar.clicked.connect(self.buscar)
@@ -345,6 +378,18 @@ class Pesquisa_exposicao(QDialog):
         # Conectar seleção da tabela
         self.tabelaResultados.itemSelectionChanged.connect(self.on_selection_changed)
 
+        # Busca enquanto o usuário digita (thread de fundo, só o último resultado)
+        from Funções.crud_exp import buscar_exposicoes_filtros
+        self.busca = BuscaIncremental(buscar_exposicoes_filtros, self, db_path=str(DB_PATH))
+        self.busca.resultadosProntos.connect(self.exibir_resultados)
+        self.busca.falhaBusca.connect(self.falha_busca)
+        self.avisar_vazio = False
+
+        self.nome.textChanged.connect(self.agendar_busca)
+        self.local.textChanged.connect(self.agendar_busca)
+        self.ano.valueChanged.connect(self.agendar_busca)
+        self.checkAtiva.toggled.connect(self.agendar_busca)
+
         # Configurar tabela
         self.configurar_tabela()
 
@@ -368,25 +413,40 @@ class Pesquisa_exposicao(QDialog):
         except Exception as e:
             QMessageBox.warning(self, "Erro", f"Erro ao carregar exposições: {str(e)}")
 
+    def coletar_filtros(self):
+        """Filtros preenchidos no formulário"""
+        return {
+            "nome": self.nome.text().strip() or None,
+            "local": self.local.text().strip() or None,
+            "ano": self.ano.value() if self.ano.value() != self.ano.minimum() else None,
+            "apenas_ativas": self.checkAtiva.isChecked()
+        }
+
+    def agendar_busca(self):
+        """Buscar após uma pausa na digitação"""
+        self.avisar_vazio = False
+        self.busca.agendar(**self.coletar_filtros())
+
     def buscar(self):
-        """Realizar busca com filtros"""
-        # Coletar filtros
-        nome = self.nome.text().strip() if self.nome.text() else None
-        local = self.local.text().strip() if self.local.text() else None
-        ano = self.ano.value() if self.ano.value() != self.ano.minimum() else None
-        apenas_ativas = self.checkAtiva.isChecked()
-        
-        try:
-            # Buscar com filtros
-            from Funções.crud_exp import buscar_exposicoes_filtros
-            resultados = buscar_exposicoes_filtros(nome, local, ano, apenas_ativas)
-            self.preencher_tabela(resultados)
-            
-            if not resultados:
-                QMessageBox.information(self, "Busca", "Nenhuma exposição encontrada com os filtros especificados.")
-                
-        except Exception as e:
-            QMessageBox.critical(self, "Erro", f"Erro na busca: {str(e)}")
+        """Realizar busca com filtros (botão Buscar: sem esperar a pausa)"""
+        self.avisar_vazio = True
+        self.busca.executar(**self.coletar_filtros())
+
+    def exibir_resultados(self, resultados):
+        """Receber resultados da busca em segundo plano"""
+        self.preencher_tabela(resultados)
+
+        if not resultados and self.avisar_vazio:
+            QMessageBox.information(self, "Busca", "Nenhuma exposição encontrada com os filtros especificados.")
+        self.avisar_vazio = False
+
+    def falha_busca(self, mensagem):
+        QMessageBox.critical(self, "Erro", f"Erro na busca: {mensagem}")
+
+    def done(self, resultado):
+        # Interromper busca em andamento ao fechar
+        self.busca.cancelar()
+        super().done(resultado)
 
     def preencher_tabela(self, exposicoes):
         """Preencher tabela com resultados"""
@@ -407,6 +467,7 @@ class Pesquisa_exposicao(QDialog):
         self.local.clear()
         self.ano.setValue(self.ano.minimum())
         self.checkAtiva.setChecked(False)
+        self.busca.cancelar()
         self.carregar_todas_exposicoes()
 
     def on_selection_changed(self):
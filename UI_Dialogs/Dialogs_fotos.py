@@ -5,11 +5,11 @@ Interface para upload, visualização e gerenciamento de fotos das pinturas
 """
 
 import os
-import shutil
 from PyQt5.QtWidgets import *
 from PyQt5.QtCore import *
 from PyQt5.QtGui import *
-from PyQt5 import uic
+from UI_Dialogs.formularios import carregar_ui
+from Funções.indice_fotos import indice_fotos
 
 # Configurar diretório das interfaces
 current_dir = os.path.dirname(__file__)
@@ -19,11 +19,18 @@ UI_DIR = os.path.join(os.path.dirname(current_dir), "Interface")
 class GestaoFotos(QDialog):
     def __init__(self, pintura_id, nome_pintura):
         super().__init__()
-        uic.loadUi(os.path.join(UI_DIR, 'Gestao_fotos.ui'), self)
+        carregar_ui(os.path.join(UI_DIR, 'Gestao_fotos.ui'), self)
         
         self.pintura_id = pintura_id
         self.nome_pintura = nome_pintura
         self.pasta_pintura = None
+        self.caminho_exibido = None
+        
+        # Carregador de imagens em segundo plano
+        from UI_Dialogs.carregador_imagens import CarregadorImagens
+        self.carregador = CarregadorImagens(self)
+        self.carregador.imagemCarregada.connect(self.exibir_imagem)
+        self.carregador.falhaCarregamento.connect(self.falha_imagem)
         
         # Configurar título
         self.lblTitulo.setText(f"Gestão de Fotos - Pintura: {nome_pintura}")
@@ -37,6 +44,11 @@ class GestaoFotos(QDialog):
         # Carregar fotos existentes
         self.carregar_fotos()
         
+        # Fotos copiadas/apagadas na pasta enquanto o diálogo está aberto
+        from UI_Dialogs import monitor_pastas
+        if monitor_pastas.monitor_pastas is not None:
+            monitor_pastas.monitor_pastas.fotosAlteradas.connect(self.fotos_alteradas)
+        
         # Configurar splitter (30% lista, 70% visualização)
         self.splitter.setSizes([270, 630])
 
@@ -67,6 +79,9 @@ class GestaoFotos(QDialog):
         """Carregar lista de fotos da pintura"""
         try:
             from Funções.crud_fotos import listar_fotos
+            # Sincronizar com a pasta primeiro: imagens copiadas à mão entram no cadastro
+            if self.pasta_pintura:
+                indice_fotos.fotos(self.pintura_id, self.pasta_pintura)
             fotos = listar_fotos(self.pintura_id)
             
             self.listaFotos.clear()
@@ -77,8 +92,8 @@ class GestaoFotos(QDialog):
                 # Criar item da lista
                 item = QListWidgetItem()
                 
-                # Verificar se arquivo existe
-                if os.path.exists(caminho):
+                # Verificar se arquivo existe (pelo índice da pasta Fotos)
+                if indice_fotos.existe(self.pintura_id, caminho):
                     nome_arquivo = os.path.basename(caminho)
                     item.setText(f"{nome_arquivo}")
                     item.setData(Qt.UserRole, foto)  # Armazenar dados da foto
@@ -101,6 +116,11 @@ class GestaoFotos(QDialog):
         except Exception as e:
             QMessageBox.critical(self, "Erro", f"Erro ao carregar fotos: {str(e)}")
 
+    def fotos_alteradas(self, pintura_id):
+        """Aviso do monitor de pastas: recarregar se for a pintura deste diálogo"""
+        if pintura_id == int(self.pintura_id):
+            self.carregar_fotos()
+
     def on_foto_selecionada(self):
         """Evento quando uma foto é selecionada"""
         current_item = self.listaFotos.currentItem()
@@ -124,27 +144,24 @@ class GestaoFotos(QDialog):
             self.btnRemoverFoto.setEnabled(False)
             self.btnEditarDescricao.setEnabled(False)
             self.lblDescricao.setText("Descrição: ")
+            self.caminho_exibido = None
+            self.carregador.cancelar()
             self.lblImagem.setText("Selecione uma foto para visualizar")
             self.lblImagem.setPixmap(QPixmap())
 
     def carregar_imagem(self, caminho):
-        """Carregar e exibir imagem"""
+        """Carregar e exibir imagem (decodificação em segundo plano)"""
         try:
-            if os.path.exists(caminho):
-                pixmap = QPixmap(caminho)
-                if not pixmap.isNull():
-                    # Redimensionar mantendo proporção
-                    scaled_pixmap = pixmap.scaled(
-                        self.lblImagem.size(), 
-                        Qt.KeepAspectRatio, 
-                        Qt.SmoothTransformation
-                    )
-                    self.lblImagem.setPixmap(scaled_pixmap)
-                    self.lblImagem.setText("")
-                else:
-                    self.lblImagem.setText("❌ Erro ao carregar imagem")
-                    self.lblImagem.setPixmap(QPixmap())
+            self.caminho_exibido = caminho
+            if indice_fotos.existe(self.pintura_id, caminho):
+                self.lblImagem.setPixmap(QPixmap())
+                self.lblImagem.setText("Carregando...")
+                self.carregador.carregar(caminho, self.lblImagem.size())
+                
+                # Adiantar as fotos anterior e seguinte da lista
+                self.carregador.pre_carregar(self.caminhos_vizinhos(), self.lblImagem.size())
             else:
+                self.carregador.cancelar()
                 self.lblImagem.setText("❌ Arquivo não encontrado")
                 self.lblImagem.setPixmap(QPixmap())
                 
@@ -152,6 +169,42 @@ class GestaoFotos(QDialog):
             self.lblImagem.setText(f"❌ Erro: {str(e)}")
             self.lblImagem.setPixmap(QPixmap())
 
+    def caminhos_vizinhos(self):
+        """Caminhos das fotos anterior e seguinte na lista"""
+        linha = self.listaFotos.currentRow()
+        caminhos = []
+        for vizinha in (linha + 1, linha - 1):
+            item = self.listaFotos.item(vizinha) if vizinha >= 0 else None
+            foto_data = item.data(Qt.UserRole) if item else None
+            if foto_data and indice_fotos.existe(self.pintura_id, foto_data[1]):
+                caminhos.append(foto_data[1])
+        return caminhos
+
+    def exibir_imagem(self, caminho, imagem):
+        """Exibir imagem decodificada pelo carregador"""
+        if caminho != self.caminho_exibido:
+            return
+        # Redimensionar mantendo proporção
+        scaled_pixmap = QPixmap.fromImage(imagem).scaled(
+            self.lblImagem.size(), 
+            Qt.KeepAspectRatio, 
+            Qt.SmoothTransformation
+        )
+        self.lblImagem.setPixmap(scaled_pixmap)
+        self.lblImagem.setText("")
+
+    def falha_imagem(self, caminho):
+        """Imagem não pôde ser decodificada"""
+        if caminho != self.caminho_exibido:
+            return
+        self.lblImagem.setText("❌ Erro ao carregar imagem")
+        self.lblImagem.setPixmap(QPixmap())
+
+    def done(self, resultado):
+        """Cancelar carregamentos pendentes ao fechar"""
+        self.carregador.cancelar()
+        super().done(resultado)
+
     def adicionar_foto(self):
         """Adicionar nova foto"""
         if not self.pasta_pintura:
@@ -178,30 +231,13 @@ class GestaoFotos(QDialog):
                 if not ok:
                     return
                 
-                # Pasta de destino simples
-                pasta_destino = os.path.join(self.pasta_pintura, "Fotos")
-                
-                # Garantir que a pasta existe
-                os.makedirs(pasta_destino, exist_ok=True)
+                # Copiar para a pasta Fotos (pelo armazém de fotos) e cadastrar
+                from Funções.crud_fotos import importar_foto
+                _, _, adicionada = importar_foto(self.pintura_id, arquivo, self.pasta_pintura, descricao or None)
                 
-                # Copiar arquivo para pasta de destino
-                nome_arquivo = os.path.basename(arquivo)
-                caminho_destino = os.path.join(pasta_destino, nome_arquivo)
-                
-                # Verificar se já existe
-                contador = 1
-                nome_base, extensao = os.path.splitext(nome_arquivo)
-                while os.path.exists(caminho_destino):
-                    novo_nome = f"{nome_base}_{contador}{extensao}"
-                    caminho_destino = os.path.join(pasta_destino, novo_nome)
-                    contador += 1
-                
-                # Copiar arquivo
-                shutil.copy2(arquivo, caminho_destino)
-                
-                # Adicionar ao banco de dados
-                from Funções.crud_fotos import adicionar_foto
-                adicionar_foto(self.pintura_id, caminho_destino, descricao or None)
+                if not adicionada:
+                    QMessageBox.information(self, "Foto existente", "Esta foto já está cadastrada para a pintura.")
+                    return
                 
                 # Recarregar lista
                 self.carregar_fotos()
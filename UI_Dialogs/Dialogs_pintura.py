@@ -6,9 +6,8 @@ Classes de diálogo para adicionar, editar e pesquisar pinturas
 
 from PyQt5.QtWidgets import (QDialog, QMainWindow, QDialogButtonBox, QTableWidgetItem, QMessageBox, QPushButton, 
                              QCheckBox, QVBoxLayout, QHBoxLayout, QFormLayout, QGroupBox, 
-                             QLabel, QLineEdit, QComboBox, QTableWidget, QAbstractItemView)
+                             QLabel, QLineEdit, QComboBox, QTableWidget, QAbstractItemView, QInputDialog)
 from PyQt5.QtGui import QPixmap, QStandardItemModel, QStandardItem
-from PyQt5 import uic
 from PyQt5.QtCore import Qt
 import os
 import sys
@@ -17,8 +16,8 @@ from pathlib import Path
 # Adicionar o diretório pai ao path para importações
 sys.path.append(str(Path(__file__).parent.parent))
 
-from Funções.crud_pint import listar_pinturas, busca_filtros, adicionar_pintura, atualizar_pintura, buscar_pintura, remover_pintura
-from Funções.detalhes_pintura import mostrar_detalhes
+from Funções.crud_pint import listar_pinturas, busca_filtros, adicionar_pintura, atualizar_pintura, buscar_pintura
+from Funções.detalhes_pintura import mostrar_detalhes, carregar_detalhes
 
 BASE_DIR = Path(__file__).parent.parent.resolve()
 UI_DIR   = BASE_DIR / "Interface"
@@ -29,18 +28,27 @@ from pathlib import Path
 # Adicionar o diretório pai ao path para importações
 sys.path.append(str(Path(__file__).parent.parent))
 
-from Funções.crud_pint import listar_pinturas, busca_filtros, adicionar_pintura, atualizar_pintura, buscar_pintura, remover_pintura
-from Funções.detalhes_pintura import mostrar_detalhes
+from Funções.crud_pint import listar_pinturas, busca_filtros, adicionar_pintura, atualizar_pintura, buscar_pintura
+from Funções.crud_pint import buscar_pinturas, remover_pinturas
+from Funções.detalhes_pintura import mostrar_detalhes, carregar_detalhes
+from Funções.conexao import gerenciador_conexoes
+from Funções.indice_fotos import indice_fotos
+from UI_Dialogs.carregador_imagens import CarregadorImagens
+from UI_Dialogs.busca_incremental import BuscaIncremental
+from UI_Dialogs.formularios import carregar_ui
 
 BASE_DIR = Path(__file__).parent.parent.resolve()
 UI_DIR   = BASE_DIR / "Interface"
 DB_PATH  = BASE_DIR / "Data" / "Data.db"
 
+# Máximo de linhas exibidas pela busca avançada (refinar os filtros para ver as demais)
+LIMITE_RESULTADOS = 1000
+
 
 class Nova_pintura(QDialog):
     def __init__(self):
         super().__init__()
-        uic.loadUi(os.path.join(UI_DIR, "Adicionar", 'Pintura.ui'), self)
+        carregar_ui(os.path.join(UI_DIR, "Adicionar", 'Pintura.ui'), self)
         
         # Conectar botões corretos
         self.btnSalvar = self.findChild(QPushButton, 'btnSalvar')
@@ -134,7 +142,7 @@ class Nova_pintura(QDialog):
 class Pintura_caminho(QDialog):
     def __init__(self, pintura_id, titulo_pintura):
         super().__init__()
-        uic.loadUi(os.path.join(UI_DIR, "Adicionar", 'Pintura_caminho.ui'), self)
+        carregar_ui(os.path.join(UI_DIR, "Adicionar", 'Pintura_caminho.ui'), self)
         self.pintura_id = pintura_id
         
         # Obter caminho da pasta criada
@@ -162,7 +170,7 @@ class Pintura_caminho(QDialog):
 class Editar_pintura(QDialog):
     def __init__(self, pintura_id):
         super().__init__()
-        uic.loadUi(os.path.join(UI_DIR, "Editar", 'Editar.ui'), self)
+        carregar_ui(os.path.join(UI_DIR, "Editar", 'Editar.ui'), self)
         self.pintura_ids = pintura_id if isinstance(pintura_id, list) else [pintura_id]
         self.buttonBox.accepted.connect(self.editar)
         self.buttonBox.rejected.connect(self.reject)
@@ -176,19 +184,21 @@ class Editar_pintura(QDialog):
             "serie": self.comboBox_serielist.currentText() if self.checkBox_serie.isChecked() else None,
             "local": self.lineEdit_localedit.text().strip() if self.checkBox_local.isChecked() else None
         }
-        for pid in self.pintura_ids:
-            atualizar_pintura(pid, 
-                            edits["titulo"], 
-                            edits["tecnica"], 
-                            edits["tamanho"], 
-                            edits["data"], 
-                            edits["local"])
+        # Todas as obras selecionadas em uma única transação (um commit só)
+        with gerenciador_conexoes.transacao():
+            for pid in self.pintura_ids:
+                atualizar_pintura(pid, 
+                                edits["titulo"], 
+                                edits["tecnica"], 
+                                edits["tamanho"], 
+                                edits["data"], 
+                                edits["local"])
         self.accept()
 
 class Pesquisa_pintura(QDialog):
     def __init__(self):
         super().__init__()
-        uic.loadUi(os.path.join(UI_DIR, "Buscar", 'Pesquisa_pintura.ui'), self)
+        carregar_ui(os.path.join(UI_DIR, "Buscar", 'Pesquisa_pintura.ui'), self)
         self.confirma_busca.clicked.connect(self.buscar)
         self.cancelar_busca.clicked.connect(self.reject)
         self.data_fin.setEnabled(False)
@@ -283,13 +293,20 @@ class Pesquisa_pintura(QDialog):
 class Abrir_pintura(QMainWindow):
     def __init__(self, pintura_id):
         super().__init__()
-        uic.loadUi(os.path.join(UI_DIR, "Abrir", "pintura.ui"), self)
+        carregar_ui(os.path.join(UI_DIR, "Abrir", "pintura.ui"), self)
         self.pintura_ids = pintura_id if isinstance(pintura_id, list) else [pintura_id]
         self.buttonBox.accepted.connect(self.accept)
         self.buttonBox.rejected.connect(self.reject)
         self.tableWidget_pintura.itemSelectionChanged.connect(self.preencher_detalhes)
         self.tableWidget_pintura.itemSelectionChanged.connect(self.mostrar_foto)
         self.tableWidget_pintura.itemSelectionChanged.connect(self.listar_fotos)
+        self.comboBox_art_photos.currentTextChanged.connect(self.mostrar_foto)
+        
+        # Carregador de imagens em segundo plano
+        self.caminho_exibido = None
+        self.carregador = CarregadorImagens(self)
+        self.carregador.imagemCarregada.connect(self.exibir_foto)
+        self.carregador.falhaCarregamento.connect(self.falha_foto)
         
         # Conectar ações do menu superior
         self._conectar_menu_superior()
@@ -303,6 +320,11 @@ class Abrir_pintura(QMainWindow):
         # Conectar seleção para habilitar botão de fotos
         self.tableWidget_pintura.itemSelectionChanged.connect(self.on_selection_changed)
         
+        # Fotos copiadas/apagadas na pasta enquanto a janela está aberta
+        from UI_Dialogs import monitor_pastas
+        if monitor_pastas.monitor_pastas is not None:
+            monitor_pastas.monitor_pastas.fotosAlteradas.connect(self.fotos_alteradas)
+        
         self.preencher_tabela()
     
     def accept(self):
@@ -313,6 +335,11 @@ class Abrir_pintura(QMainWindow):
         """Método para fechar a janela"""
         self.close()
     
+    def closeEvent(self, event):
+        """Cancelar carregamentos de fotos pendentes ao fechar"""
+        self.carregador.cancelar()
+        super().closeEvent(event)
+    
     def _conectar_menu_superior(self):
         """Conectar ações do menu superior"""
         try:
@@ -362,9 +389,9 @@ class Abrir_pintura(QMainWindow):
             QMessageBox.critical(self, "Erro", f"Erro ao abrir gestão de fotos: {str(e)}")
 
     def preencher_tabela(self):
-
-
-        rows = [buscar_pintura(pid, db_path=str(DB_PATH)) for pid in self.pintura_ids]
+        # Hidratar todas as pinturas da janela com uma única consulta
+        self.detalhes = carregar_detalhes(self.pintura_ids, db_path=str(DB_PATH))
+        rows = [d["pintura"] for d in self.detalhes.values() if d["pintura"]]
         model = QStandardItemModel(len(rows), 7, self)
         model.setHorizontalHeaderLabels(["ID", "Título", "Técnica", "Tamanho", "Data", "Preço", "Série"])
         for r, row in enumerate(rows):
@@ -373,20 +400,31 @@ class Abrir_pintura(QMainWindow):
         self.tableWidget_pintura.setModel(model)
         self.tableWidget_pintura.resizeColumnsToContents()
  
+    def obter_detalhes(self, pid):
+        """Detalhes já carregados da pintura (buscar no banco se não estiver na janela)"""
+        pid = int(pid)
+        detalhes = getattr(self, "detalhes", {})
+        if pid not in detalhes:
+            detalhes[pid] = mostrar_detalhes(pid, db_path=str(DB_PATH))
+            self.detalhes = detalhes
+        return detalhes[pid]
+
     def preencher_detalhes(self):
         items = self.tableWidget_pintura.selectedItems()
         if not items:
             return
         pid = items[0].text()
-        d = mostrar_detalhes(pid, db_path=str(DB_PATH))
+        d = self.obter_detalhes(pid)
+        if not d["pintura"]:
+            return
         self.label_art_titulo.setText(d["pintura"][1])
         self.label_art_tecnica.setText(d["pintura"][2])
         self.label_art_tamanho.setText(d["pintura"][3])
         self.label_art_data.setText(d["pintura"][4])
-        self.label_art_local.setText(d["local"][1])
-        self.label_art_serie.setText(d["serie"][1])
-        self.label_art_exposicao.setText(d["exposicoes"][1])
-        self.label_art_preco.setText(d["precos"][1])
+        self.label_art_local.setText(d["local_atual"][0] if d["local_atual"] else "Não definido")
+        self.label_art_serie.setText(", ".join(s[1] for s in d["series"]) or "Sem série")
+        self.label_art_exposicoes.setText(", ".join(e[1] for e in d["exposicoes"]) or "Nenhuma")
+        self.label_art_preco.setText(f"R$ {d['preco_atual'][0]:.2f}" if d["preco_atual"] else "Não definido")
 
 
 
@@ -397,19 +435,37 @@ class Abrir_pintura(QMainWindow):
             return
 
         pid = items[0].text()
-        detalhes = mostrar_detalhes(pid, db_path=str(DB_PATH))
+        detalhes = self.obter_detalhes(pid)
         fotos_path = detalhes.get("fotos_path")
 
         if fotos_path:
             # Procurar na pasta Fotos simples
             pasta_fotos = os.path.join(fotos_path, "Fotos")
             full_path = os.path.join(pasta_fotos, nome_foto)
-            if os.path.exists(full_path):
-                pixmap = QPixmap(full_path).scaled(300, 300, Qt.KeepAspectRatio)
-                self.label_art_foto.setPixmap(pixmap)
+            if nome_foto in indice_fotos.fotos(pid, fotos_path):
+                # Decodificar em segundo plano e adiantar as fotos vizinhas
+                self.caminho_exibido = full_path
+                self.carregador.carregar(full_path, (300, 300))
+                indice = self.comboBox_art_photos.currentIndex()
+                vizinhas = [self.comboBox_art_photos.itemText(i) for i in (indice + 1, indice - 1)
+                            if 0 <= i < self.comboBox_art_photos.count()]
+                self.carregador.pre_carregar([os.path.join(pasta_fotos, f) for f in vizinhas], (300, 300))
             else:
+                self.carregador.cancelar()
                 self.label_art_foto.setText("Foto não encontrada")
 
+    def exibir_foto(self, caminho, imagem):
+        """Exibir foto decodificada pelo carregador"""
+        if caminho != self.caminho_exibido:
+            return
+        pixmap = QPixmap.fromImage(imagem).scaled(300, 300, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+        self.label_art_foto.setPixmap(pixmap)
+
+    def falha_foto(self, caminho):
+        """Foto não pôde ser decodificada"""
+        if caminho == self.caminho_exibido:
+            self.label_art_foto.setText("Erro ao carregar foto")
+
 
 
 
@@ -418,16 +474,18 @@ class Abrir_pintura(QMainWindow):
         if not items:
             return
         pid = items[0].text()
-        d = mostrar_detalhes(pid, db_path=str(DB_PATH))
+        d = self.obter_detalhes(pid)
         self.comboBox_art_photos.clear()
         fotos_path = d.get("fotos_path")
-        if fotos_path and os.path.exists(fotos_path):
-            # Procurar na pasta Fotos simples
-            pasta_fotos = os.path.join(fotos_path, "Fotos")
-            if os.path.exists(pasta_fotos):
-                for foto in os.listdir(pasta_fotos):
-                    if foto.lower().endswith(('.png', '.jpg', '.jpeg', '.bmp', '.gif', '.tiff')):
-                        self.comboBox_art_photos.addItem(foto)
+        if fotos_path:
+            # Imagens da pasta Fotos pelo índice (sem listar o diretório a cada seleção)
+            self.comboBox_art_photos.addItems(indice_fotos.fotos(pid, fotos_path))
+
+    def fotos_alteradas(self, pintura_id):
+        """Aviso do monitor de pastas: atualizar a lista se for a pintura selecionada"""
+        items = self.tableWidget_pintura.selectedItems()
+        if items and int(items[0].text()) == pintura_id:
+            self.listar_fotos()
 
     def editar_seleção(self):
         items = self.tableWidget_pintura.selectedItems()
@@ -440,21 +498,18 @@ class Abrir_pintura(QMainWindow):
 class Excluir_pintura(QDialog):
     def __init__(self, pintura_ids):
         super().__init__()
-        uic.loadUi(os.path.join(UI_DIR, "Deletar", "confirmar_Del.ui"), self)
+        carregar_ui(os.path.join(UI_DIR, "Deletar", "confirmar_Del.ui"), self)
         self.pintura_ids = pintura_ids if isinstance(pintura_ids, list) else [pintura_ids]
         self.buttonBox.accepted.connect(self.__confirmada_exclusao)
         self.buttonBox.rejected.connect(self.reject)
         self.Categoria_item.setText("pintura atual" if len(self.pintura_ids) == 1 else "pinturas atuais")
-        titles = []
-        for pid in self.pintura_ids:
-            painting = buscar_pintura(pid, db_path=str(DB_PATH))
-            if painting:
-                titles.append(painting[1])  # Assuming index 1 contains the title
+        # Títulos de todas as obras selecionadas com uma única consulta
+        paintings = buscar_pinturas(self.pintura_ids, db_path=str(DB_PATH))
+        titles = [painting[1] for painting in paintings.values()]  # índice 1 = título
         self.Nome_pintura.setText(", ".join(titles))
 
     def __confirmada_exclusao(self):
-        for pid in self.pintura_ids:
-            remover_pintura(pid)
+        remover_pinturas(self.pintura_ids)
         self.accept()
 
 
@@ -467,6 +522,12 @@ class Busca_Avancada_Pintura(QDialog):
         self.setFixedSize(500, 600)
         self.resultados = []
         
+        # Busca enquanto o usuário digita (thread de fundo, só o último resultado)
+        from Funções.crud_pint import busca_avancada
+        self.busca = BuscaIncremental(busca_avancada, self)
+        self.busca.resultadosProntos.connect(self.exibir_resultados)
+        self.busca.falhaBusca.connect(self.falha_busca)
+        
         self.setupUI()
         self.conectar_eventos()
     
@@ -538,15 +599,21 @@ class Busca_Avancada_Pintura(QDialog):
         self.btn_buscar = QPushButton("Buscar")
         self.btn_limpar = QPushButton("Limpar")
         self.btn_selecionar = QPushButton("Selecionar")
+        self.btn_add_exposicao = QPushButton("Adicionar à Exposição")
+        self.btn_add_serie = QPushButton("Adicionar à Série")
         self.btn_cancelar = QPushButton("Cancelar")
         
         self.btn_buscar.setStyleSheet("background-color: #4CAF50; color: white; padding: 8px;")
         self.btn_selecionar.setStyleSheet("background-color: #2196F3; color: white; padding: 8px;")
         self.btn_selecionar.setEnabled(False)
+        self.btn_add_exposicao.setEnabled(False)
+        self.btn_add_serie.setEnabled(False)
         
         btn_layout.addWidget(self.btn_buscar)
         btn_layout.addWidget(self.btn_limpar)
         btn_layout.addStretch()
+        btn_layout.addWidget(self.btn_add_exposicao)
+        btn_layout.addWidget(self.btn_add_serie)
         btn_layout.addWidget(self.btn_selecionar)
         btn_layout.addWidget(self.btn_cancelar)
         
@@ -558,6 +625,7 @@ class Busca_Avancada_Pintura(QDialog):
         self.tabela_resultados.setHorizontalHeaderLabels(["ID", "Título", "Técnica", "Tamanho", "Ano", "Preço"])
         self.tabela_resultados.horizontalHeader().setStretchLastSection(True)
         self.tabela_resultados.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.tabela_resultados.setSelectionMode(QAbstractItemView.ExtendedSelection)
         self.tabela_resultados.setEditTriggers(QAbstractItemView.NoEditTriggers)
         layout.addWidget(self.tabela_resultados)
         
@@ -567,37 +635,72 @@ class Busca_Avancada_Pintura(QDialog):
         self.btn_buscar.clicked.connect(self.buscar)
         self.btn_limpar.clicked.connect(self.limpar_campos)
         self.btn_selecionar.clicked.connect(self.accept)
+        self.btn_add_exposicao.clicked.connect(self.adicionar_a_exposicao)
+        self.btn_add_serie.clicked.connect(self.adicionar_a_serie)
         self.btn_cancelar.clicked.connect(self.reject)
         self.tabela_resultados.itemSelectionChanged.connect(self.atualizar_botao_selecionar)
+        
+        # Busca incremental a cada alteração dos filtros
+        for campo in (self.edit_titulo, self.edit_tamanho, self.edit_ano, self.edit_local,
+                      self.edit_preco_min, self.edit_preco_max, self.edit_serie, self.edit_exposicao):
+            campo.textChanged.connect(self.agendar_busca)
+        self.combo_tecnica.currentTextChanged.connect(self.agendar_busca)
+    
+    def coletar_filtros(self):
+        """Filtros preenchidos (ValueError se o preço for inválido)"""
+        return {
+            'titulo': self.edit_titulo.text().strip() or None,
+            'tecnica': self.combo_tecnica.currentText().strip() or None,
+            'tamanho': self.edit_tamanho.text().strip() or None,
+            'data': self.edit_ano.text().strip() or None,
+            'local': self.edit_local.text().strip() or None,
+            'preco_min': float(self.edit_preco_min.text()) if self.edit_preco_min.text().strip() else None,
+            'preco_max': float(self.edit_preco_max.text()) if self.edit_preco_max.text().strip() else None,
+            'serie': self.edit_serie.text().strip() or None,
+            'exposicao': self.edit_exposicao.text().strip() or None,
+            'limite': LIMITE_RESULTADOS
+        }
+    
+    def agendar_busca(self):
+        """Buscar após uma pausa na digitação"""
+        try:
+            filtros = self.coletar_filtros()
+        except ValueError:
+            # Preço ainda incompleto: esperar o usuário terminar de digitar
+            return
+        
+        if any(valor for chave, valor in filtros.items() if chave != 'limite'):
+            self.busca.agendar(**filtros)
+        else:
+            self.busca.cancelar()
+            self.tabela_resultados.setRowCount(0)
+            self.resultados = []
+            self.setWindowTitle("Busca Avançada de Pinturas")
     
     def buscar(self):
         try:
-            # Coletar filtros
-            filtros = {
-                'titulo': self.edit_titulo.text().strip() or None,
-                'tecnica': self.combo_tecnica.currentText().strip() or None,
-                'tamanho': self.edit_tamanho.text().strip() or None,
-                'data': self.edit_ano.text().strip() or None,
-                'local': self.edit_local.text().strip() or None,
-                'preco_min': float(self.edit_preco_min.text()) if self.edit_preco_min.text().strip() else None,
-                'preco_max': float(self.edit_preco_max.text()) if self.edit_preco_max.text().strip() else None,
-                'serie': self.edit_serie.text().strip() or None,
-                'exposicao': self.edit_exposicao.text().strip() or None
-            }
-            
-            # Fazer busca avançada
-            from Funções.crud_pint import busca_avancada
-            self.resultados = busca_avancada(**filtros)
-            
-            # Atualizar tabela
-            self.atualizar_tabela()
-            
+            # Botão Buscar: executar sem esperar a pausa
+            self.busca.executar(**self.coletar_filtros())
         except ValueError as e:
             QMessageBox.warning(self, "Erro", "Verifique os valores de preço inseridos.")
         except Exception as e:
             QMessageBox.critical(self, "Erro", f"Erro na busca: {str(e)}")
     
+    def exibir_resultados(self, resultados):
+        """Receber resultados da busca em segundo plano"""
+        self.resultados = resultados
+        self.atualizar_tabela()
+    
+    def falha_busca(self, mensagem):
+        QMessageBox.critical(self, "Erro", f"Erro na busca: {mensagem}")
+    
+    def done(self, resultado):
+        # Interromper busca em andamento ao fechar
+        self.busca.cancelar()
+        super().done(resultado)
+    
     def atualizar_tabela(self):
+        self.tabela_resultados.setUpdatesEnabled(False)
         self.tabela_resultados.setRowCount(len(self.resultados))
         
         for row, resultado in enumerate(self.resultados):
@@ -612,9 +715,12 @@ class Busca_Avancada_Pintura(QDialog):
             preco = resultado[7] if len(resultado) > 7 and resultado[7] else None
             preco_text = f"R$ {preco:.2f}" if preco else "Não definido"
             self.tabela_resultados.setItem(row, 5, QTableWidgetItem(preco_text))
+        self.tabela_resultados.setUpdatesEnabled(True)
         
         # Status da busca
-        if self.resultados:
+        if len(self.resultados) >= LIMITE_RESULTADOS:
+            self.setWindowTitle(f"Busca Avançada - primeiros {LIMITE_RESULTADOS} resultados")
+        elif self.resultados:
             self.setWindowTitle(f"Busca Avançada - {len(self.resultados)} resultado(s)")
         else:
             self.setWindowTitle("Busca Avançada - Nenhum resultado")
@@ -629,12 +735,16 @@ class Busca_Avancada_Pintura(QDialog):
         self.edit_preco_max.clear()
         self.edit_serie.clear()
         self.edit_exposicao.clear()
+        self.busca.cancelar()
         self.tabela_resultados.setRowCount(0)
         self.resultados = []
         self.setWindowTitle("Busca Avançada de Pinturas")
     
     def atualizar_botao_selecionar(self):
-        self.btn_selecionar.setEnabled(len(self.tabela_resultados.selectedItems()) > 0)
+        tem_selecao = len(self.tabela_resultados.selectedItems()) > 0
+        self.btn_selecionar.setEnabled(tem_selecao)
+        self.btn_add_exposicao.setEnabled(tem_selecao)
+        self.btn_add_serie.setEnabled(tem_selecao)
     
     def obter_pintura_selecionada(self):
         """Retorna o ID da pintura selecionada"""
@@ -644,41 +754,67 @@ class Busca_Avancada_Pintura(QDialog):
             return int(self.tabela_resultados.item(row, 0).text())
         return None
     
+    def pinturas_selecionadas(self):
+        """IDs de todas as pinturas selecionadas nos resultados"""
+        rows = self.tabela_resultados.selectionModel().selectedRows()
+        return [int(self.tabela_resultados.item(index.row(), 0).text()) for index in rows]
+    
+    def _escolher_registro(self, titulo, rotulo, registros):
+        """Escolher um registro (id, nome, ...) em uma lista"""
+        nomes = [f"{r[0]} - {r[1]}" for r in registros]
+        escolha, ok = QInputDialog.getItem(self, titulo, rotulo, nomes, 0, False)
+        if not ok:
+            return None
+        return registros[nomes.index(escolha)][0]
+    
+    def _informar_associacao(self, resultado, destino):
+        """Mostrar quantas pinturas foram associadas e quantas já estavam"""
+        adicionadas = sum(1 for novo in resultado.values() if novo)
+        mensagem = f"{adicionadas} pintura(s) adicionada(s) à {destino}!"
+        if adicionadas < len(resultado):
+            mensagem += f"\n{len(resultado) - adicionadas} já estava(m) associada(s)."
+        QMessageBox.information(self, "Sucesso", mensagem)
+    
     def adicionar_a_exposicao(self):
-        """Adicionar pintura selecionada a uma exposição"""
-        selected_rows = self.tableWidget_pintura.selectionModel().selectedRows()
-        if not selected_rows:
+        """Adicionar pinturas selecionadas a uma exposição"""
+        pintura_ids = self.pinturas_selecionadas()
+        if not pintura_ids:
             QMessageBox.warning(self, "Aviso", "Selecione uma pintura primeiro!")
             return
         
         try:
-            from UI_Dialogs.Dialogs_expos import Selecionar_exposicao
-            dialog = Selecionar_exposicao()
-            if dialog.exec_() == QDialog.Accepted:
-                pintura_id = int(self.tableWidget_pintura.item(selected_rows[0].row(), 0).text())
-                exposicao_id = dialog.get_exposicao_selecionada()
-                
-                # Aqui você adicionaria a lógica para vincular pintura à exposição
-                QMessageBox.information(self, "Sucesso", "Pintura adicionada à exposição!")
+            from Funções.crud_exp import listar_exposicoes
+            from Funções.crud_pinturas_exposicoes import associar_pinturas_exposicoes
+            exposicoes = listar_exposicoes()
+            if not exposicoes:
+                QMessageBox.warning(self, "Aviso", "Nenhuma exposição cadastrada!")
+                return
+            
+            exposicao_id = self._escolher_registro("Adicionar à Exposição", "Exposição:", exposicoes)
+            if exposicao_id is not None:
+                resultado = associar_pinturas_exposicoes(pintura_ids, exposicao_id, db_path=str(DB_PATH))
+                self._informar_associacao(resultado, "exposição")
         except Exception as e:
             QMessageBox.critical(self, "Erro", f"Erro ao adicionar à exposição: {e}")
     
     def adicionar_a_serie(self):
-        """Adicionar pintura selecionada a uma série"""
-        selected_rows = self.tableWidget_pintura.selectionModel().selectedRows()
-        if not selected_rows:
+        """Adicionar pinturas selecionadas a uma série"""
+        pintura_ids = self.pinturas_selecionadas()
+        if not pintura_ids:
             QMessageBox.warning(self, "Aviso", "Selecione uma pintura primeiro!")
             return
         
         try:
-            from UI_Dialogs.Dialogs_series import Selecionar_serie
-            dialog = Selecionar_serie()
-            if dialog.exec_() == QDialog.Accepted:
-                pintura_id = int(self.tableWidget_pintura.item(selected_rows[0].row(), 0).text())
-                serie_id = dialog.get_serie_selecionada()
-                
-                # Aqui você adicionaria a lógica para vincular pintura à série
-                QMessageBox.information(self, "Sucesso", "Pintura adicionada à série!")
+            from Funções.crud_series import listar_series, associar_pinturas_series
+            series = listar_series(db_path=str(DB_PATH))
+            if not series:
+                QMessageBox.warning(self, "Aviso", "Nenhuma série cadastrada!")
+                return
+            
+            serie_id = self._escolher_registro("Adicionar à Série", "Série:", series)
+            if serie_id is not None:
+                resultado = associar_pinturas_series(pintura_ids, serie_id, db_path=str(DB_PATH))
+                self._informar_associacao(resultado, "série")
         except Exception as e:
             QMessageBox.critical(self, "Erro", f"Erro ao adicionar à série: {e}")
 
@@ -5,7 +5,6 @@ Classes de diálogo para buscar séries
 """
 
 from PyQt5.QtWidgets import QDialog, QTableWidgetItem, QMessageBox
-from PyQt5 import uic
 from PyQt5.QtCore import Qt
 import os
 import sys
@@ -15,6 +14,8 @@ from pathlib import Path
 sys.path.append(str(Path(__file__).parent.parent))
 
 from Funções.crud_series import listar_series, buscar_series_filtros
+from UI_Dialogs.busca_incremental import BuscaIncremental
+from UI_Dialogs.formularios import carregar_ui
 
 BASE_DIR = Path(__file__).parent.parent.resolve()
 UI_DIR   = BASE_DIR / "Interface"
@@ -23,7 +24,7 @@ UI_DIR   = BASE_DIR / "Interface"
 class Pesquisa_serie(QDialog):
     def __init__(self):
         super().__init__()
-        uic.loadUi(os.path.join(UI_DIR, "Buscar", 'Pesquisa_serie.ui'), self)
+        carregar_ui(os.path.join(UI_DIR, "Buscar", 'Pesquisa_serie.ui'), self)
         
         # ID selecionado via diálogo de busca
         self.selected_serie_id = None
@@ -37,6 +38,17 @@ class Pesquisa_serie(QDialog):
         # Conectar seleção da tabela
         self.tabelaResultados.itemSelectionChanged.connect(self.on_selection_changed)
         
+        # Busca enquanto o usuário digita (thread de fundo, só o último resultado)
+        self.busca = BuscaIncremental(buscar_series_filtros, self)
+        self.busca.resultadosProntos.connect(self.exibir_resultados)
+        self.busca.falhaBusca.connect(self.falha_busca)
+        self.avisar_vazio = False
+        
+        self.nome.textChanged.connect(self.agendar_busca)
+        self.descricao.textChanged.connect(self.agendar_busca)
+        self.anoInicio.valueChanged.connect(self.agendar_busca)
+        self.anoFim.valueChanged.connect(self.agendar_busca)
+        
         # Configurar tabela
         self.configurar_tabela()
         
@@ -58,24 +70,40 @@ class Pesquisa_serie(QDialog):
         except Exception as e:
             QMessageBox.warning(self, "Erro", f"Erro ao carregar séries: {str(e)}")
 
+    def coletar_filtros(self):
+        """Filtros preenchidos no formulário"""
+        return {
+            "nome": self.nome.text().strip() or None,
+            "descricao": self.descricao.text().strip() or None,
+            "ano_inicio": self.anoInicio.value() if self.anoInicio.value() != self.anoInicio.minimum() else None,
+            "ano_fim": self.anoFim.value() if self.anoFim.value() != self.anoFim.minimum() else None
+        }
+
+    def agendar_busca(self):
+        """Buscar após uma pausa na digitação"""
+        self.avisar_vazio = False
+        self.busca.agendar(**self.coletar_filtros())
+
     def buscar(self):
-        """Realizar busca com filtros"""
-        # Coletar filtros
-        nome = self.nome.text().strip() if self.nome.text() else None
-        descricao = self.descricao.text().strip() if self.descricao.text() else None
-        ano_inicio = self.anoInicio.value() if self.anoInicio.value() != self.anoInicio.minimum() else None
-        ano_fim = self.anoFim.value() if self.anoFim.value() != self.anoFim.minimum() else None
+        """Realizar busca com filtros (botão Buscar: sem esperar a pausa)"""
+        self.avisar_vazio = True
+        self.busca.executar(**self.coletar_filtros())
+
+    def exibir_resultados(self, resultados):
+        """Receber resultados da busca em segundo plano"""
+        self.preencher_tabela(resultados)
         
-        try:
-            # Buscar com filtros
-            resultados = buscar_series_filtros(nome, descricao, ano_inicio, ano_fim)
-            self.preencher_tabela(resultados)
-            
-            if not resultados:
-                QMessageBox.information(self, "Busca", "Nenhuma série encontrada com os filtros especificados.")
-                
-        except Exception as e:
-            QMessageBox.critical(self, "Erro", f"Erro na busca: {str(e)}")
+        if not resultados and self.avisar_vazio:
+            QMessageBox.information(self, "Busca", "Nenhuma série encontrada com os filtros especificados.")
+        self.avisar_vazio = False
+
+    def falha_busca(self, mensagem):
+        QMessageBox.critical(self, "Erro", f"Erro na busca: {mensagem}")
+
+    def done(self, resultado):
+        # Interromper busca em andamento ao fechar
+        self.busca.cancelar()
+        super().done(resultado)
 
     def preencher_tabela(self, series):
         """Preencher tabela com resultados"""
@@ -94,6 +122,7 @@ class Pesquisa_serie(QDialog):
         self.descricao.clear()
         self.anoInicio.setValue(self.anoInicio.minimum())
         self.anoFim.setValue(self.anoFim.minimum())
+        self.busca.cancelar()
         self.carregar_todas_series()
 
     def on_selection_changed(self):
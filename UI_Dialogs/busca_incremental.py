@@ -0,0 +1,139 @@
+# -*- coding: utf-8 -*-
+"""
+Busca Incremental
+Executa as buscas dos diálogos de pesquisa enquanto o usuário digita: espera
+uma pausa na digitação (debounce), roda a consulta em uma thread de fundo e
+interrompe a consulta anterior quando chega um filtro mais novo
+"""
+
+import threading
+
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, QTimer, pyqtSignal
+
+from Funções.conexao import gerenciador_conexoes
+
+# Pausa na digitação antes de disparar a consulta (ms)
+ATRASO_PADRAO_MS = 250
+
+
+class _SinaisBusca(QObject):
+    """Sinais emitidos pela tarefa (QRunnable não é QObject)"""
+    concluida = pyqtSignal(int, object, object)  # geração, resultados, erro
+
+
+class _TarefaBusca(QRunnable):
+    """Executar uma busca fora da thread da interface"""
+
+    def __init__(self, busca, geracao, filtros):
+        super().__init__()
+        self.busca = busca
+        self.geracao = geracao
+        self.filtros = filtros
+        self.conn = None
+        self.executando = False
+        self._lock = threading.Lock()
+
+    def run(self):
+        # Filtro já foi substituído antes de a tarefa começar
+        if self.geracao != self.busca.geracao:
+            return
+
+        resultados, erro = None, None
+        try:
+            # Mesma conexão (por thread) que a função de busca vai usar
+            conn = gerenciador_conexoes.obter_conexao(self.busca.db_path)
+            with self._lock:
+                self.conn = conn
+                self.executando = True
+            if self.busca.db_path is not None:
+                self.filtros["db_path"] = self.busca.db_path
+            resultados = self.busca.funcao(**self.filtros)
+        except Exception as e:
+            erro = e
+        finally:
+            with self._lock:
+                self.executando = False
+
+        try:
+            self.busca._sinais.concluida.emit(self.geracao, resultados, erro)
+        except RuntimeError:
+            # Diálogo já foi fechado
+            pass
+
+    def interromper(self):
+        """Abortar a consulta em andamento (sqlite3 Connection.interrupt)"""
+        with self._lock:
+            if self.executando and self.conn is not None:
+                self.conn.interrupt()
+
+
+class BuscaIncremental(QObject):
+    """
+    Busca disparada a cada alteração dos filtros
+
+        self.busca = BuscaIncremental(busca_exposicoes_filtros, self)
+        self.busca.resultadosProntos.connect(self.preencher_tabela)
+        self.nome.textChanged.connect(lambda: self.busca.agendar(nome=self.nome.text()))
+
+    Só o resultado do pedido mais recente é entregue; os anteriores são
+    descartados e, se ainda estiverem rodando, interrompidos.
+    """
+
+    resultadosProntos = pyqtSignal(object)  # lista de linhas
+    falhaBusca = pyqtSignal(str)  # mensagem de erro
+
+    def __init__(self, funcao, parent=None, atraso_ms=ATRASO_PADRAO_MS, db_path=None):
+        super().__init__(parent)
+        self.funcao = funcao
+        self.db_path = db_path
+        self.geracao = 0
+        self._filtros = {}
+        self._tarefa = None
+
+        # Uma única thread: uma busca nova espera a anterior ser interrompida
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(1)
+
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(atraso_ms)
+        self.timer.timeout.connect(self.executar)
+
+        self._sinais = _SinaisBusca()
+        self._sinais.concluida.connect(self._busca_concluida)
+
+    def agendar(self, **filtros):
+        """Guardar os filtros e (re)iniciar a espera da digitação"""
+        self._filtros = filtros
+        self.timer.start()
+
+    def executar(self, **filtros):
+        """Disparar a busca imediatamente (botão Buscar ou fim da espera)"""
+        self.timer.stop()
+        if filtros:
+            self._filtros = filtros
+        self.cancelar()
+
+        self._tarefa = _TarefaBusca(self, self.geracao, dict(self._filtros))
+        self.pool.start(self._tarefa)
+
+    def cancelar(self):
+        """Descartar a busca pendente e interromper a que está rodando"""
+        self.timer.stop()
+        self.geracao += 1
+        self.pool.clear()
+        if self._tarefa is not None:
+            self._tarefa.interromper()
+            self._tarefa = None
+
+    def _busca_concluida(self, geracao, resultados, erro):
+        """Receber resultado na thread da interface (só o mais recente)"""
+        if geracao != self.geracao:
+            return
+        self._tarefa = None
+
+        if erro is not None:
+            print(f"Erro na busca: {erro}")
+            self.falhaBusca.emit(str(erro))
+        else:
+            self.resultadosProntos.emit(resultados or [])
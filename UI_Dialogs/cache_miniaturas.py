@@ -0,0 +1,208 @@
+# -*- coding: utf-8 -*-
+"""
+Cache de Miniaturas
+Guarda em disco versões reduzidas das fotos das pinturas, para que os
+diálogos não precisem decodificar o arquivo original a cada seleção
+"""
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+from PyQt5.QtCore import Qt, QSize
+from PyQt5.QtGui import QImage, QImageReader, QPixmap
+
+# Tamanhos (maior lado, em pixels) gerados para cada foto
+TAMANHOS = (128, 400, 1024)
+
+# Limite padrão de espaço em disco do cache
+LIMITE_PADRAO_MB = 512
+
+
+class CacheMiniaturas:
+    """Cache LRU de miniaturas em disco, com vários tamanhos por foto"""
+
+    def __init__(self, pasta_cache=None, limite_bytes=None):
+        """Inicializar cache (a pasta só é criada ao gravar a primeira miniatura)"""
+        try:
+            from config import config_manager
+            if pasta_cache is None:
+                pasta_cache = config_manager.get_biblioteca_path() / ".miniaturas"
+            if limite_bytes is None:
+                limite_bytes = config_manager.get("thumbnail_cache_mb", LIMITE_PADRAO_MB) * 1024 * 1024
+        except ImportError:
+            # Fallback para pasta padrão se config não estiver disponível
+            if pasta_cache is None:
+                pasta_cache = Path(__file__).parent.parent / "Bibliotecas" / ".miniaturas"
+
+        self.pasta_cache = Path(pasta_cache)
+        self.limite_bytes = limite_bytes or LIMITE_PADRAO_MB * 1024 * 1024
+        self._lock = threading.Lock()
+        self._entradas = None  # arquivo -> bytes, do menos para o mais recente
+        self._total_bytes = 0
+
+    def _carregar_indice(self):
+        """Montar índice LRU a partir dos arquivos já existentes (ordem de acesso = mtime)"""
+        arquivos = []
+        if self.pasta_cache.exists():
+            for raiz, _, nomes in os.walk(self.pasta_cache):
+                for nome in nomes:
+                    caminho = os.path.join(raiz, nome)
+                    try:
+                        st = os.stat(caminho)
+                    except OSError:
+                        continue
+                    arquivos.append((st.st_mtime, caminho, st.st_size))
+
+        arquivos.sort()
+        self._entradas = OrderedDict((caminho, tamanho) for _, caminho, tamanho in arquivos)
+        self._total_bytes = sum(self._entradas.values())
+
+    def escolher_tamanho(self, largura, altura):
+        """Menor tamanho do cache que cobre a área pedida"""
+        maior_lado = max(largura, altura)
+        for tamanho in TAMANHOS:
+            if tamanho >= maior_lado:
+                return tamanho
+        return TAMANHOS[-1]
+
+    def arquivo_cache(self, caminho, tamanho):
+        """Caminho da miniatura: chave = caminho absoluto + mtime + tamanho do original"""
+        st = os.stat(caminho)
+        chave = f"{os.path.abspath(caminho)}|{st.st_mtime_ns}|{st.st_size}|{tamanho}"
+        digest = hashlib.sha1(chave.encode("utf-8")).hexdigest()
+        return str(self.pasta_cache / digest[:2] / f"{digest}_{tamanho}.jpg")
+
+    def obter_imagem(self, caminho, largura, altura):
+        """
+        Obter QImage reduzida de uma foto (pode ser chamado fora da thread da interface)
+
+        Returns:
+            QImage ou None se o arquivo não existir ou não puder ser lido
+        """
+        if not os.path.exists(caminho):
+            return None
+
+        tamanho = self.escolher_tamanho(largura, altura)
+        destino = self.arquivo_cache(caminho, tamanho)
+
+        with self._lock:
+            if self._entradas is None:
+                self._carregar_indice()
+            em_cache = destino in self._entradas
+            if em_cache:
+                self._entradas.move_to_end(destino)
+
+        if em_cache:
+            imagem = QImage(destino)
+            if not imagem.isNull():
+                # Registrar acesso no disco para manter a ordem LRU entre sessões
+                try:
+                    os.utime(destino)
+                except OSError:
+                    pass
+                return imagem
+            self._remover(destino)
+
+        imagem = self._decodificar(caminho, tamanho)
+        if imagem is not None:
+            self._gravar(destino, imagem)
+        return imagem
+
+    def obter_pixmap(self, caminho, tamanho_area):
+        """Obter QPixmap já ajustado a uma área (somente na thread da interface)"""
+        if isinstance(tamanho_area, QSize):
+            largura, altura = tamanho_area.width(), tamanho_area.height()
+        else:
+            largura, altura = tamanho_area
+
+        imagem = self.obter_imagem(caminho, largura, altura)
+        if imagem is None:
+            return QPixmap()
+
+        return QPixmap.fromImage(imagem).scaled(largura, altura, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+
+    def _decodificar(self, caminho, tamanho):
+        """Ler o original já reduzido ao tamanho do cache"""
+        leitor = QImageReader(caminho)
+        leitor.setAutoTransform(True)
+
+        original = leitor.size()
+        if original.isValid() and max(original.width(), original.height()) > tamanho:
+            leitor.setScaledSize(original.scaled(tamanho, tamanho, Qt.KeepAspectRatio))
+
+        imagem = leitor.read()
+        if imagem.isNull():
+            print(f"Erro ao ler imagem {caminho}: {leitor.errorString()}")
+            return None
+        return imagem
+
+    def _gravar(self, destino, imagem):
+        """Salvar miniatura e liberar espaço se o limite foi ultrapassado"""
+        try:
+            os.makedirs(os.path.dirname(destino), exist_ok=True)
+            if not imagem.save(destino, "JPG", 90):
+                return
+            tamanho_arquivo = os.path.getsize(destino)
+        except OSError as e:
+            print(f"Erro ao gravar miniatura: {e}")
+            return
+
+        with self._lock:
+            antigo = self._entradas.pop(destino, 0)
+            self._entradas[destino] = tamanho_arquivo
+            self._total_bytes += tamanho_arquivo - antigo
+            removidos = self._liberar_espaco()
+
+        for arquivo in removidos:
+            try:
+                os.remove(arquivo)
+            except OSError:
+                pass
+
+    def _liberar_espaco(self):
+        """Retirar do índice as miniaturas menos usadas até caber no limite"""
+        removidos = []
+        while self._total_bytes > self.limite_bytes and len(self._entradas) > 1:
+            arquivo, tamanho_arquivo = self._entradas.popitem(last=False)
+            self._total_bytes -= tamanho_arquivo
+            removidos.append(arquivo)
+        return removidos
+
+    def _remover(self, destino):
+        """Descartar uma miniatura corrompida"""
+        with self._lock:
+            self._total_bytes -= self._entradas.pop(destino, 0)
+        try:
+            os.remove(destino)
+        except OSError:
+            pass
+
+    def limpar(self):
+        """Apagar todas as miniaturas"""
+        with self._lock:
+            arquivos = list(self._entradas or [])
+            self._entradas = OrderedDict()
+            self._total_bytes = 0
+        for arquivo in arquivos:
+            try:
+                os.remove(arquivo)
+            except OSError:
+                pass
+
+    def estatisticas(self):
+        """Quantidade de miniaturas e espaço ocupado"""
+        with self._lock:
+            if self._entradas is None:
+                self._carregar_indice()
+            return {
+                "miniaturas": len(self._entradas),
+                "bytes": self._total_bytes,
+                "limite_bytes": self.limite_bytes
+            }
+
+
+# Instância global compartilhada pelos diálogos de fotos
+cache_miniaturas = CacheMiniaturas()
@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+"""
+Carregador Assíncrono de Imagens
+Decodifica as fotos em threads de fundo (QThreadPool) para que a janela
+não trave enquanto um arquivo grande é lido
+"""
+
+from collections import OrderedDict
+
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, QSize, pyqtSignal
+from PyQt5.QtGui import QImage
+
+from UI_Dialogs.cache_miniaturas import cache_miniaturas
+
+# Imagens já decodificadas mantidas em memória (foto atual + vizinhas)
+LIMITE_MEMORIA = 8
+
+# Prioridades no pool: a foto exibida passa na frente das pré-carregadas
+PRIORIDADE_EXIBIR = 1
+PRIORIDADE_PRE_CARREGAR = 0
+
+
+class _SinaisTarefa(QObject):
+    """Sinais emitidos pelas tarefas (QRunnable não é QObject)"""
+    concluida = pyqtSignal(int, str, int, object, bool)  # geração, caminho, tamanho, QImage/None, exibir
+
+
+class _TarefaImagem(QRunnable):
+    """Decodificar uma foto fora da thread da interface"""
+
+    def __init__(self, carregador, sinais, geracao, caminho, tamanho, exibir):
+        super().__init__()
+        self.carregador = carregador
+        self.sinais = sinais
+        self.geracao = geracao
+        self.caminho = caminho
+        self.tamanho = tamanho
+        self.exibir = exibir
+
+    def run(self):
+        # Seleção mudou antes de a tarefa começar: não decodificar
+        if self.exibir and self.geracao != self.carregador.geracao:
+            return
+
+        try:
+            imagem = cache_miniaturas.obter_imagem(self.caminho, self.tamanho, self.tamanho)
+        except Exception as e:
+            print(f"Erro ao carregar imagem {self.caminho}: {e}")
+            imagem = None
+
+        try:
+            self.sinais.concluida.emit(self.geracao, self.caminho, self.tamanho, imagem, self.exibir)
+        except RuntimeError:
+            # Diálogo já foi fechado
+            pass
+
+
+class CarregadorImagens(QObject):
+    """
+    Carrega fotos em segundo plano e entrega o resultado por sinais
+
+    Cada chamada a carregar() torna obsoletos os pedidos anteriores: os que
+    ainda não começaram são descartados e os que terminarem depois não são
+    entregues.
+    """
+
+    imagemCarregada = pyqtSignal(str, QImage)  # caminho, imagem
+    falhaCarregamento = pyqtSignal(str)  # caminho
+
+    def __init__(self, parent=None, max_threads=2):
+        super().__init__(parent)
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(max_threads)
+        self.geracao = 0
+        self._memoria = OrderedDict()  # (caminho, tamanho) -> QImage
+        self._sinais = _SinaisTarefa()
+        self._sinais.concluida.connect(self._tarefa_concluida)
+
+    def _tamanho(self, tamanho_area):
+        """Tamanho do cache de miniaturas adequado à área de exibição"""
+        if isinstance(tamanho_area, QSize):
+            largura, altura = tamanho_area.width(), tamanho_area.height()
+        else:
+            largura, altura = tamanho_area
+        return cache_miniaturas.escolher_tamanho(largura, altura)
+
+    def carregar(self, caminho, tamanho_area):
+        """Pedir a foto a ser exibida (cancela os pedidos anteriores)"""
+        self.cancelar()
+        tamanho = self._tamanho(tamanho_area)
+
+        imagem = self._memoria.get((caminho, tamanho))
+        if imagem is not None:
+            self._memoria.move_to_end((caminho, tamanho))
+            self.imagemCarregada.emit(caminho, imagem)
+            return
+
+        tarefa = _TarefaImagem(self, self._sinais, self.geracao, caminho, tamanho, True)
+        self.pool.start(tarefa, PRIORIDADE_EXIBIR)
+
+    def pre_carregar(self, caminhos, tamanho_area):
+        """Decodificar antecipadamente as fotos vizinhas (sem exibir)"""
+        tamanho = self._tamanho(tamanho_area)
+        for caminho in caminhos:
+            if caminho and (caminho, tamanho) not in self._memoria:
+                tarefa = _TarefaImagem(self, self._sinais, self.geracao, caminho, tamanho, False)
+                self.pool.start(tarefa, PRIORIDADE_PRE_CARREGAR)
+
+    def cancelar(self):
+        """Descartar pedidos pendentes e ignorar os que estão em andamento"""
+        self.geracao += 1
+        self.pool.clear()
+
+    def _tarefa_concluida(self, geracao, caminho, tamanho, imagem, exibir):
+        """Receber resultado na thread da interface"""
+        if imagem is not None:
+            self._memoria[(caminho, tamanho)] = imagem
+            self._memoria.move_to_end((caminho, tamanho))
+            while len(self._memoria) > LIMITE_MEMORIA:
+                self._memoria.popitem(last=False)
+
+        if not exibir or geracao != self.geracao:
+            return
+
+        if imagem is None:
+            self.falhaCarregamento.emit(caminho)
+        else:
+            self.imagemCarregada.emit(caminho, imagem)
@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+"""
+Formulários Compilados
+Substitui uic.loadUi: cada arquivo .ui é convertido uma vez em módulo Python
+(guardado em __uicache__ e recompilado quando o .ui muda), e as aberturas
+seguintes dos diálogos só executam o setupUi já compilado, sem ler o XML
+"""
+
+import hashlib
+import importlib.util
+import os
+import threading
+from pathlib import Path
+
+from PyQt5 import uic
+
+PASTA_CACHE = Path(__file__).parent / "__uicache__"
+
+# Formulários já carregados no processo: {caminho: (assinatura, classe Ui_)}
+_formularios = {}
+_lock = threading.Lock()
+
+
+def _cache_ativo():
+    try:
+        from config import config_manager
+        return config_manager.get("ui_cache_enabled", True)
+    except ImportError:
+        return True
+
+
+def _assinatura(caminho):
+    """Data de modificação e tamanho do .ui (mudam quando o formulário é editado)"""
+    estado = os.stat(caminho)
+    return f"{estado.st_mtime_ns}:{estado.st_size}"
+
+
+def _compilar(caminho, assinatura):
+    """Compilar o .ui (se o módulo em cache estiver desatualizado) e importar a classe Ui_"""
+    nome = "ui_" + hashlib.sha1(os.path.abspath(caminho).encode("utf-8")).hexdigest()[:16]
+    destino = PASTA_CACHE / f"{nome}.py"
+    cabecalho = f"# {os.path.basename(caminho)} {assinatura}\n"
+
+    try:
+        with open(destino, encoding="utf-8") as modulo:
+            atualizado = modulo.readline() == cabecalho
+    except OSError:
+        atualizado = False
+
+    if not atualizado:
+        PASTA_CACHE.mkdir(exist_ok=True)
+        temporario = destino.with_suffix(".tmp")
+        with open(temporario, "w", encoding="utf-8") as modulo:
+            modulo.write(cabecalho)
+            uic.compileUi(caminho, modulo)
+        os.replace(temporario, destino)
+
+    spec = importlib.util.spec_from_file_location(nome, destino)
+    modulo = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(modulo)
+    return next(valor for chave, valor in vars(modulo).items()
+                if chave.startswith("Ui_") and isinstance(valor, type))
+
+
+def carregar_ui(caminho, widget):
+    """
+    Montar o formulário `caminho` em `widget` (mesmo resultado de uic.loadUi)
+
+    Se o cache estiver desligado ou a compilação falhar, usa uic.loadUi.
+    """
+    caminho = str(caminho)
+    if not _cache_ativo():
+        return uic.loadUi(caminho, widget)
+
+    try:
+        assinatura = _assinatura(caminho)
+        with _lock:
+            memorizado = _formularios.get(caminho)
+            if memorizado is None or memorizado[0] != assinatura:
+                memorizado = (assinatura, _compilar(caminho, assinatura))
+                _formularios[caminho] = memorizado
+    except Exception as e:
+        print(f"Aviso: formulário {os.path.basename(caminho)} não compilado ({e}), usando loadUi")
+        return uic.loadUi(caminho, widget)
+
+    ui = memorizado[1]()
+    ui.setupUi(widget)
+    # Como no loadUi: os widgets ficam acessíveis como atributos do próprio diálogo
+    for nome, valor in vars(ui).items():
+        setattr(widget, nome, valor)
+    return widget
+
+
+def precompilar(pasta):
+    """Compilar todos os .ui de uma pasta (ex.: na instalação ou no build)"""
+    total = 0
+    for caminho in sorted(Path(pasta).rglob("*.ui")):
+        try:
+            _compilar(str(caminho), _assinatura(caminho))
+            total += 1
+        except Exception as e:
+            print(f"❌ Erro ao compilar {caminho}: {e}")
+    return total
+
+
+if __name__ == "__main__":
+    # Pré-compilar os formulários do aplicativo: python -m UI_Dialogs.formularios
+    total = precompilar(Path(__file__).parent.parent / "Interface")
+    print(f"✅ {total} formulário(s) compilado(s) em {PASTA_CACHE}")
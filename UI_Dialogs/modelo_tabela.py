@@ -0,0 +1,158 @@
+# -*- coding: utf-8 -*-
+"""
+Modelo de Tabela Paginado
+Modelo Qt que busca as linhas do banco sob demanda (canFetchMore/fetchMore)
+e mantém em memória apenas uma janela de páginas
+"""
+
+from collections import OrderedDict
+
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex
+
+# Linhas buscadas por consulta
+TAMANHO_PAGINA = 200
+
+# Páginas mantidas em memória (as menos usadas são descartadas)
+PAGINAS_EM_MEMORIA = 10
+
+
+class ModeloTabelaPaginado(QAbstractTableModel):
+    """
+    Modelo de tabela alimentado por duas funções:
+
+        contar() -> total de linhas
+        carregar_pagina(offset, limite, ordem, descendente) -> lista de linhas
+
+    A ordenação (clique no cabeçalho) é repassada para carregar_pagina,
+    ou seja, é feita pelo ORDER BY da consulta.
+    """
+
+    def __init__(self, cabecalhos, contar, carregar_pagina, parent=None,
+                 tamanho_pagina=TAMANHO_PAGINA, paginas_em_memoria=PAGINAS_EM_MEMORIA):
+        super().__init__(parent)
+        self.cabecalhos = list(cabecalhos)
+        self._contar = contar
+        self._carregar_pagina = carregar_pagina
+        self.tamanho_pagina = tamanho_pagina
+        self.paginas_em_memoria = paginas_em_memoria
+
+        # Listagem completa do banco (False para resultados de busca)
+        self.completo = True
+
+        self._ordem = 0
+        self._descendente = False
+        self._paginas = OrderedDict()  # número da página -> linhas
+        self._total = self._contar()
+        self._expostas = min(self._total, self.tamanho_pagina)
+
+    @classmethod
+    def de_linhas(cls, cabecalhos, linhas, parent=None):
+        """Modelo para resultados já carregados (buscas), ordenados em memória"""
+        linhas = list(linhas)
+        # Até o primeiro clique no cabeçalho, manter a ordem recebida (relevância)
+        ordenadas = {(0, False): linhas}
+
+        def chave(coluna):
+            def _chave(linha):
+                valor = linha[coluna] if coluna < len(linha) else None
+                if valor is None:
+                    return (1, 0, "")
+                if isinstance(valor, (int, float)):
+                    return (0, valor, "")
+                return (0, 0, str(valor).lower())
+            return _chave
+
+        def carregar_pagina(offset, limite, ordem, descendente):
+            if (ordem, descendente) not in ordenadas:
+                ordenadas.clear()
+                ordenadas[(ordem, descendente)] = sorted(linhas, key=chave(ordem), reverse=descendente)
+            return ordenadas[(ordem, descendente)][offset:offset + limite]
+
+        modelo = cls(cabecalhos, lambda: len(linhas), carregar_pagina, parent)
+        modelo.completo = False
+        return modelo
+
+    # ---- Estrutura ----
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self._expostas
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.cabecalhos)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal and section < len(self.cabecalhos):
+            return self.cabecalhos[section]
+        return super().headerData(section, orientation, role)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or role not in (Qt.DisplayRole, Qt.UserRole):
+            return None
+
+        linha = self.linha(index.row())
+        if linha is None or index.column() >= len(linha):
+            return None
+
+        valor = linha[index.column()]
+        if role == Qt.UserRole:
+            return valor
+        return "" if valor is None else str(valor)
+
+    # ---- Carregamento sob demanda ----
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and self._expostas < self._total
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid():
+            return
+        novas = min(self.tamanho_pagina, self._total - self._expostas)
+        if novas <= 0:
+            return
+        self.beginInsertRows(QModelIndex(), self._expostas, self._expostas + novas - 1)
+        self._expostas += novas
+        self.endInsertRows()
+
+    def linha(self, row):
+        """Linha completa (tupla) na posição indicada"""
+        if not 0 <= row < self._expostas:
+            return None
+
+        numero, posicao = divmod(row, self.tamanho_pagina)
+        pagina = self._paginas.get(numero)
+        if pagina is None:
+            try:
+                pagina = self._carregar_pagina(numero * self.tamanho_pagina, self.tamanho_pagina,
+                                               self._ordem, self._descendente)
+            except Exception as e:
+                print(f"Erro ao carregar página {numero}: {e}")
+                return None
+            self._paginas[numero] = pagina
+            while len(self._paginas) > self.paginas_em_memoria:
+                self._paginas.popitem(last=False)
+        else:
+            self._paginas.move_to_end(numero)
+
+        return pagina[posicao] if posicao < len(pagina) else None
+
+    # ---- Ordenação e recarga ----
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        descendente = order == Qt.DescendingOrder
+        if (column, descendente) == (self._ordem, self._descendente):
+            return
+        # Nova ordem: recomeçar da primeira página
+        self.beginResetModel()
+        self._ordem = column
+        self._descendente = descendente
+        self._paginas.clear()
+        self._expostas = min(self._total, self.tamanho_pagina)
+        self.endResetModel()
+
+    def recarregar(self):
+        """Descartar páginas e recontar linhas (após inclusões/exclusões)"""
+        self.beginResetModel()
+        self._paginas.clear()
+        self._total = self._contar()
+        self._expostas = min(self._total, max(self._expostas, self.tamanho_pagina))
+        self.endResetModel()
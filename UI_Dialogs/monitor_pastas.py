@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+"""
+Monitor das Pastas da Biblioteca
+QFileSystemWatcher sobre Bibliotecas/Pinturas e sobre a pasta Fotos de cada
+pintura que entra no índice de fotos: quando uma pasta muda (fotos copiadas
+ou apagadas pelo Explorer), o índice e a tabela fotos são atualizados só
+para aquela pintura, e os diálogos abertos recebem o sinal fotosAlteradas
+"""
+
+import os
+
+from PyQt5.QtCore import QObject, QFileSystemWatcher, QTimer, pyqtSignal
+
+from Funções.gerenciador_pastas import gerenciador_pastas
+from Funções.indice_fotos import indice_fotos
+
+# Espera após a última mudança antes de reler a pasta (cópias de várias fotos geram vários avisos)
+ATRASO_MS = 500
+
+
+class MonitorPastas(QObject):
+    """Observa as pastas indexadas e mantém o índice de fotos atualizado"""
+
+    fotosAlteradas = pyqtSignal(int)  # pintura_id
+
+    # Pastas que entram no índice (podem vir de outras threads)
+    _observar = pyqtSignal(str)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.watcher = QFileSystemWatcher(self)
+        self.watcher.directoryChanged.connect(self._pasta_alterada)
+
+        self._pendentes = set()
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(ATRASO_MS)
+        self._timer.timeout.connect(self._processar)
+
+        self._observar.connect(self._adicionar)
+        self.pasta_pinturas = str(gerenciador_pastas.pasta_pinturas)
+
+    def iniciar(self):
+        """Começar a observar a biblioteca e as pastas que já estão no índice"""
+        if self._avisar in indice_fotos.observadores:
+            return
+        indice_fotos.observadores.append(self._avisar)
+        if os.path.isdir(self.pasta_pinturas):
+            self.watcher.addPath(self.pasta_pinturas)
+        for pasta in indice_fotos.pastas_indexadas():
+            self._adicionar(pasta)
+
+    def parar(self):
+        """Parar de observar (o índice volta a conferir a data das pastas)"""
+        if self._avisar in indice_fotos.observadores:
+            indice_fotos.observadores.remove(self._avisar)
+        pastas = self.watcher.directories()
+        if pastas:
+            self.watcher.removePaths(pastas)
+        for pasta in pastas:
+            indice_fotos.marcar_observada(pasta, False)
+        self._timer.stop()
+        self._pendentes.clear()
+
+    def _avisar(self, pasta):
+        """Observador do índice: passar a pasta para a thread da interface"""
+        self._observar.emit(pasta)
+
+    def _adicionar(self, pasta):
+        if pasta in self.watcher.directories() or self.watcher.addPath(pasta):
+            indice_fotos.marcar_observada(pasta)
+
+    def _pasta_alterada(self, pasta):
+        self._pendentes.add(pasta)
+        self._timer.start()
+
+    def _processar(self):
+        """Reler as pastas que mudaram desde o último aviso"""
+        pendentes, self._pendentes = self._pendentes, set()
+        for pasta in pendentes:
+            if pasta == self.pasta_pinturas:
+                # Pastas de pinturas criadas, renomeadas ou apagadas
+                gerenciador_pastas.invalidar_indices()
+                indice_fotos.descartar_ausentes()
+                continue
+
+            pintura_id = indice_fotos.pintura_da_pasta(pasta)
+            if pintura_id is None:
+                continue
+            if not os.path.isdir(pasta):
+                # Pasta apagada: o watcher já deixou de observá-la
+                indice_fotos.descartar(pintura_id)
+            else:
+                try:
+                    indice_fotos.sincronizar(pintura_id)
+                except Exception as e:
+                    print(f"Erro ao sincronizar fotos da pintura {pintura_id}: {e}")
+                    continue
+            self.fotosAlteradas.emit(pintura_id)
+
+
+# Instância criada ao abrir a janela principal (precisa da QApplication)
+monitor_pastas = None
+
+
+def iniciar_monitor(parent=None):
+    """Criar (uma vez) e iniciar o monitor, se ligado em "photo_watcher_enabled" """
+    global monitor_pastas
+    try:
+        from config import config_manager
+        if not config_manager.get("photo_watcher_enabled", True):
+            return None
+    except ImportError:
+        pass
+
+    if monitor_pastas is None:
+        monitor_pastas = MonitorPastas(parent)
+    monitor_pastas.iniciar()
+    return monitor_pastas
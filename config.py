@@ -17,7 +17,15 @@ class ConfigManager:
             "biblioteca_path": str(Path(__file__).parent / "Bibliotecas"),
             "database_path": str(Path(__file__).parent / "Data" / "Data.db"),
             "backup_enabled": True,
+            "backup_keep": 7,
+            "backup_interval_hours": 24,
             "auto_create_folders": True,
+            "photo_store_enabled": False,
+            "photo_watcher_enabled": True,
+            "thumbnail_cache_mb": 512,
+            "detail_cache_size": 500,
+            "sql_profiling_enabled": False,
+            "slow_query_ms": 50,
             "window_size": {"width": 1200, "height": 800},
             "window_maximized": False,
             "theme": "default",
@@ -68,6 +68,19 @@ class ConfigDialog(QDialog):
         self.backup_enabled = QCheckBox("Habilitar backup automático")
         backup_layout.addRow("Backup:", self.backup_enabled)
         
+        self.backup_keep = QSpinBox()
+        self.backup_keep.setRange(1, 100)
+        backup_layout.addRow("Backups mantidos:", self.backup_keep)
+        
+        self.backup_interval = QSpinBox()
+        self.backup_interval.setRange(1, 720)
+        self.backup_interval.setSuffix(" h")
+        backup_layout.addRow("Intervalo:", self.backup_interval)
+        
+        backup_agora_btn = QPushButton("Fazer backup agora")
+        backup_agora_btn.clicked.connect(self.fazer_backup_agora)
+        backup_layout.addRow("", backup_agora_btn)
+        
         self.auto_create_folders = QCheckBox("Criar pastas automaticamente")
         backup_layout.addRow("Pastas:", self.auto_create_folders)
         
@@ -221,6 +234,8 @@ class ConfigDialog(QDialog):
         """Carregar configurações atuais nos campos"""
         # Aba Geral
         self.backup_enabled.setChecked(config_manager.get("backup_enabled", True))
+        self.backup_keep.setValue(config_manager.get("backup_keep", 7))
+        self.backup_interval.setValue(config_manager.get("backup_interval_hours", 24))
         self.auto_create_folders.setChecked(config_manager.get("auto_create_folders", True))
         
         # Aba Caminhos
@@ -247,6 +262,8 @@ class ConfigDialog(QDialog):
         try:
             # Salvar configurações gerais
             config_manager.set("backup_enabled", self.backup_enabled.isChecked())
+            config_manager.set("backup_keep", self.backup_keep.value())
+            config_manager.set("backup_interval_hours", self.backup_interval.value())
             config_manager.set("auto_create_folders", self.auto_create_folders.isChecked())
             
             # Salvar caminhos
@@ -269,12 +286,26 @@ class ConfigDialog(QDialog):
                 "height": self.window_height.value()
             })
             
+            # Ligar ou desligar o serviço de backup conforme a nova configuração
+            from Funções.backup import servico_backup
+            servico_backup.gerenciador.retencao = self.backup_keep.value()
+            if self.backup_enabled.isChecked():
+                servico_backup.iniciar()
+            else:
+                servico_backup.parar()
+            
             QMessageBox.information(self, "Sucesso", "Configurações salvas com sucesso!")
             self.accept()
             
         except Exception as e:
             QMessageBox.critical(self, "Erro", f"Erro ao salvar configurações:\n{e}")
     
+    def fazer_backup_agora(self):
+        """Pedir um backup imediato ao serviço (feito em segundo plano)"""
+        from Funções.backup import servico_backup
+        servico_backup.executar_agora()
+        QMessageBox.information(self, "Backup", "Backup iniciado em segundo plano.")
+    
     def restore_defaults(self):
         """Restaurar configurações padrão"""
         reply = QMessageBox.question(
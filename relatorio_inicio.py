@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+"""
+Relatório de Inicialização
+Mede o tempo de cada importação (tempo próprio e acumulado, como o
+`python -X importtime`) e das etapas da abertura do aplicativo
+
+Ativado com `python Main.py --relatorio-inicio` ou com a variável de
+ambiente GERENCIADOR_RELATORIO_INICIO=1; desativado, só as marcas de etapa
+são registradas.
+"""
+
+import os
+import sys
+import threading
+import time
+
+INICIO = time.perf_counter()
+
+# Etapas: [(nome, segundos desde o início)]
+_marcas = []
+
+# Importações: [(módulo, próprio, acumulado, profundidade)] na ordem em que terminaram
+_importacoes = []
+
+_local = threading.local()
+_ativo = False
+
+
+class _CarregadorCronometrado:
+    """Envolve o loader original e mede exec_module"""
+
+    def __init__(self, carregador, nome):
+        self._carregador = carregador
+        self._nome = nome
+
+    def __getattr__(self, atributo):
+        return getattr(self._carregador, atributo)
+
+    def create_module(self, spec):
+        return self._carregador.create_module(spec)
+
+    def exec_module(self, modulo):
+        pilha = getattr(_local, "pilha", None)
+        if pilha is None:
+            pilha = _local.pilha = []
+
+        # [tempo dos módulos importados por este]
+        pilha.append([0.0])
+        inicio = time.perf_counter()
+        try:
+            self._carregador.exec_module(modulo)
+        finally:
+            acumulado = time.perf_counter() - inicio
+            filhos = pilha.pop()[0]
+            if pilha:
+                pilha[-1][0] += acumulado
+            _importacoes.append((self._nome, acumulado - filhos, acumulado, len(pilha)))
+
+
+class _Cronometro:
+    """Finder que repassa a busca aos demais e cronometra o carregamento"""
+
+    def find_spec(self, nome, caminho=None, alvo=None):
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(nome, caminho, alvo)
+            if spec is not None:
+                if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+                    spec.loader = _CarregadorCronometrado(spec.loader, nome)
+                return spec
+        return None
+
+
+def ativo():
+    return _ativo
+
+
+def iniciar():
+    """Ligar a medição das importações (se pedida na linha de comando ou no ambiente)"""
+    global _ativo
+    if _ativo:
+        return
+    if "--relatorio-inicio" not in sys.argv and not os.environ.get("GERENCIADOR_RELATORIO_INICIO"):
+        return
+    _ativo = True
+    sys.meta_path.insert(0, _Cronometro())
+
+
+def marcar(etapa):
+    """Registrar o fim de uma etapa da inicialização"""
+    _marcas.append((etapa, time.perf_counter() - INICIO))
+
+
+def relatorio(limite=25):
+    """Texto do relatório: etapas e as importações mais lentas"""
+    linhas = ["⏱️ Relatório de inicialização"]
+    anterior = 0.0
+    for etapa, instante in _marcas:
+        linhas.append(f"   {etapa:<32} {instante * 1000:8.1f} ms  (+{(instante - anterior) * 1000:.1f} ms)")
+        anterior = instante
+
+    if _importacoes:
+        linhas.append("")
+        linhas.append(f"   {'próprio [us]':>12} | {'acumulado [us]':>14} | módulo "
+                      f"({len(_importacoes)} importados, {limite} mais lentos)")
+        mais_lentos = sorted(_importacoes, key=lambda i: i[2], reverse=True)[:limite]
+        for nome, proprio, acumulado, profundidade in mais_lentos:
+            linhas.append(f"   {proprio * 1e6:12.0f} | {acumulado * 1e6:14.0f} | {'  ' * profundidade}{nome}")
+    return "\n".join(linhas)
+
+
+def concluir(etapa="Primeiro ciclo de eventos"):
+    """Marcar a última etapa e imprimir o relatório (se a medição estiver ativa)"""
+    marcar(etapa)
+    if _ativo:
+        print(relatorio())
@@ -9,9 +9,13 @@ import sys
 import os
 sys.path.append('.')
 
-from Main import MainWindow
+from Main import MainWindow, _tarefas_apos_abertura
 from PyQt5.QtWidgets import QApplication
+from PyQt5.QtCore import QTimer
 from config import config_manager
+from Funções.conexao import gerenciador_conexoes
+from Funções.backup import servico_backup
+import relatorio_inicio
 
 def main():
     """Executar aplicação principal"""
@@ -20,7 +24,11 @@ def main():
     print("🚀 Iniciando aplicação completa...")
     
     # Criar aplicação
+    relatorio_inicio.marcar("Importações")
     app = QApplication(sys.argv)
+    app.aboutToQuit.connect(servico_backup.parar)
+    app.aboutToQuit.connect(gerenciador_conexoes.fechar_todas)
+    relatorio_inicio.marcar("QApplication")
     
     # Carregar configurações de janela
     window_config = config_manager.get("window_size", {"width": 1200, "height": 800})
@@ -28,6 +36,7 @@ def main():
     
     # Criar janela principal
     window = MainWindow()
+    relatorio_inicio.marcar("Janela principal montada")
     window.setWindowTitle("Gerenciador de Pinturas - Sistema Completo v2.0")
     
     # Aplicar configurações de janela
@@ -40,6 +49,9 @@ def main():
     else:
         window.show()
     
+    # Pastas, backup e relatório de inicialização depois de a janela aparecer
+    QTimer.singleShot(0, _tarefas_apos_abertura)
+    
     print("✅ Aplicação iniciada com sucesso!")
     print("📱 Janela principal visível")
     print(f"� Biblioteca: {config_manager.get_biblioteca_path()}")
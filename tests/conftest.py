@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+"""
+Configuração dos testes
+Cada teste usa um banco novo (migrado) em uma pasta temporária, nunca o
+Data.db da configuração
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from Funções.cache_detalhes import cache_detalhes
+from Funções.conexao import gerenciador_conexoes
+from Funções.gerenciador_pastas import GerenciadorPastas, gerenciador_pastas
+from Funções.indice_fotos import indice_fotos
+
+
+@pytest.fixture(autouse=True)
+def biblioteca(tmp_path):
+    """Pasta Bibliotecas temporária no lugar da configurada"""
+    original = dict(gerenciador_pastas.__dict__)
+    gerenciador_pastas.__dict__.update(GerenciadorPastas(tmp_path / "Bibliotecas").__dict__)
+    indice_fotos.descartar()
+    yield gerenciador_pastas.pasta_base
+    indice_fotos.descartar()
+    gerenciador_pastas.__dict__.clear()
+    gerenciador_pastas.__dict__.update(original)
+
+
+@pytest.fixture
+def banco(tmp_path):
+    """Caminho de um banco vazio no esquema atual, usado como padrão do pool"""
+    anterior = gerenciador_conexoes.db_path
+    db_path = tmp_path / "Data.db"
+    gerenciador_conexoes.configurar(db_path)
+    cache_detalhes.limpar()
+    with gerenciador_conexoes.conexao() as conn:
+        conn.execute("SELECT 1")
+    yield str(db_path)
+    gerenciador_conexoes.fechar_todas()
+    gerenciador_conexoes.configurar(anterior)
+    cache_detalhes.limpar()
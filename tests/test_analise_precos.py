@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+"""Testes da análise de preços"""
+
+import threading
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from Funções.analise_precos import carregar_historico
+from Funções.crud_pint import adicionar_pintura
+from Funções.crud_precos import adicionar_preco
+
+
+def _em_outra_thread(funcao):
+    resultado = []
+    thread = threading.Thread(target=lambda: resultado.append(funcao()))
+    thread.start()
+    thread.join()
+    return resultado[0]
+
+
+def test_commit_de_uma_thread_invalida_o_historico_de_outra(banco):
+    pintura_id = adicionar_pintura("Mar", "Óleo", "30x40", "2020", "Ateliê")
+    adicionar_preco(pintura_id, 1000.0, "2020-01-01")
+
+    assert len(_em_outra_thread(carregar_historico).precos) == 1
+    adicionar_preco(pintura_id, 1500.0, "2022-01-01")
+    assert len(_em_outra_thread(carregar_historico).precos) == 2
+    assert len(carregar_historico().precos) == 2
+
+
+def test_acervo_sem_precos(banco):
+    from Funções.analise_precos import (avaliar_acervo, medianas_moveis, valorizacao_pinturas,
+                                        valorizacao_por_serie, valorizacao_por_tecnica)
+
+    adicionar_pintura("Mar", "Óleo", "30x40", "2020", "Ateliê")
+
+    assert len(valorizacao_pinturas()["pintura_id"]) == 0
+    assert valorizacao_por_tecnica() == {}
+    assert valorizacao_por_serie() == {}
+    assert len(medianas_moveis()["mediana"]) == 0
+    assert avaliar_acervo(["2024-01-01"])["valores"].shape == (0, 1)
@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+"""Testes do armazém de fotos"""
+
+import os
+
+from Funções import armazem_fotos as modulo
+from Funções.armazem_fotos import ArmazemFotos, armazem_fotos, hash_arquivo
+from Funções.crud_fotos import importar_foto
+from Funções.crud_pint import adicionar_pintura
+from Funções.gerenciador_pastas import gerenciador_pastas
+
+
+def _armazem_ligado(monkeypatch, reflink):
+    monkeypatch.setattr(ArmazemFotos, "ativo", property(lambda self: True))
+    monkeypatch.setattr(armazem_fotos, "economiza_espaco", lambda pasta_destino=None: reflink)
+
+
+def _bytes_na_biblioteca(biblioteca):
+    return sum(os.path.getsize(os.path.join(raiz, nome))
+               for raiz, _, nomes in os.walk(biblioteca) for nome in nomes)
+
+
+def _pasta_nova():
+    pintura_id = adicionar_pintura("Mar", "Óleo", "30x40", "2020", "Ateliê")
+    return pintura_id, gerenciador_pastas.obter_pasta_pintura(pintura_id)
+
+
+def test_editar_foto_de_uma_obra_nao_altera_as_outras(tmp_path):
+    origem = tmp_path / "frente.jpg"
+    origem.write_bytes(b"original")
+    armazem = ArmazemFotos(tmp_path / "Bibliotecas")
+    armazem.economiza_espaco = lambda pasta_destino=None: True
+
+    primeira, resumo = armazem.vincular(origem, tmp_path / "0001" / "Fotos")
+    segunda, _ = armazem.vincular(origem, tmp_path / "0002" / "Fotos")
+    with open(primeira, "wb") as arquivo:
+        arquivo.write(b"editada")
+
+    with open(segunda, "rb") as arquivo:
+        assert arquivo.read() == b"original"
+    assert hash_arquivo(armazem.caminho_objeto(resumo, ".jpg")) == resumo
+
+
+def test_armazem_desligado_por_padrao():
+    assert armazem_fotos.ativo is False
+
+
+def test_sem_reflink_duplicata_custa_uma_copia_so(banco, biblioteca, tmp_path, monkeypatch):
+    _armazem_ligado(monkeypatch, reflink=False)
+    origem = tmp_path / "scan.jpg"
+    origem.write_bytes(b"x" * 4096)
+    primeira, pasta_primeira = _pasta_nova()
+    segunda, pasta_segunda = _pasta_nova()
+
+    importar_foto(primeira, origem, pasta_primeira)
+    assert _bytes_na_biblioteca(biblioteca) == 4096
+    assert not armazem_fotos.pasta_objetos.exists()
+
+    # Mesma pintura: nada escrito; outra pintura: só a cópia da pasta dela
+    assert importar_foto(primeira, origem, pasta_primeira)[2] is False
+    assert _bytes_na_biblioteca(biblioteca) == 4096
+    importar_foto(segunda, origem, pasta_segunda)
+    assert _bytes_na_biblioteca(biblioteca) == 8192
+
+
+def test_com_reflink_duplicata_de_outra_pintura_vem_da_biblioteca(banco, tmp_path, monkeypatch):
+    _armazem_ligado(monkeypatch, reflink=True)
+    clonados = []
+    clonar = modulo._clonar
+
+    def _espiar(origem, destino):
+        clonados.append(str(origem))
+        return clonar(origem, destino)
+
+    monkeypatch.setattr(modulo, "_clonar", _espiar)
+    origem = tmp_path / "scan.jpg"
+    origem.write_bytes(b"x" * 4096)
+    primeira, pasta_primeira = _pasta_nova()
+    segunda, pasta_segunda = _pasta_nova()
+
+    importar_foto(primeira, origem, pasta_primeira)
+    importar_foto(segunda, origem, pasta_segunda)
+
+    # A origem é lida uma vez só; a segunda pintura recebe um clone do objeto
+    assert clonados.count(str(origem)) == 1
+    assert armazem_fotos.estatisticas()["duplicados"] >= 1
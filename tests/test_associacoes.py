@@ -0,0 +1,32 @@
+# -*- coding: utf-8 -*-
+"""Testes das associações em lote de pinturas com séries e exposições"""
+
+from Funções.conexao import gerenciador_conexoes
+from Funções.crud_pint import adicionar_pintura
+from Funções.crud_pinturas_exposicoes import associar_pinturas_exposicoes
+from Funções.crud_series import adicionar_serie, associar_pinturas_series
+
+
+def test_series_ignoram_ids_inexistentes(banco):
+    p1 = adicionar_pintura("Mar", "Óleo", "30x40", "2020", "Ateliê")
+    p2 = adicionar_pintura("Rio", "Óleo", "30x40", "2021", "Ateliê")
+    serie_id = adicionar_serie("Águas", db_path=banco)
+
+    resultado = associar_pinturas_series([p1, 9999, p2], [serie_id, 8888], db_path=banco)
+
+    assert resultado[(p1, serie_id)] and resultado[(p2, serie_id)]
+    assert not resultado[(9999, serie_id)] and not resultado[(p1, 8888)]
+    with gerenciador_conexoes.conexao(banco) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM pintura_serie").fetchone()[0] == 2
+
+
+def test_exposicoes_ignoram_ids_inexistentes(banco):
+    p1 = adicionar_pintura("Mar", "Óleo", "30x40", "2020", "Ateliê")
+    with gerenciador_conexoes.conexao(banco) as conn:
+        exposicao_id = conn.execute("INSERT INTO exposicoes (nome) VALUES ('Salão')").lastrowid
+        conn.commit()
+
+    resultado = associar_pinturas_exposicoes([p1, 9999], exposicao_id, db_path=banco)
+
+    assert resultado == {(p1, exposicao_id): True, (9999, exposicao_id): False}
+    assert associar_pinturas_exposicoes(p1, exposicao_id, db_path=banco) == {(p1, exposicao_id): False}
@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+"""Testes do backup e da restauração"""
+
+import sqlite3 as sql
+
+from Funções.backup import GerenciadorBackup
+from Funções.conexao import gerenciador_conexoes
+from Funções.crud_pint import adicionar_pintura, buscar_pintura
+from Funções.indice_fotos import indice_fotos
+from Funções.migracoes import VERSAO_ATUAL
+
+
+def test_backup_ignora_cache_de_miniaturas(banco, biblioteca, tmp_path):
+    adicionar_pintura("Mar", "Óleo", "30x40", "2020", "Ateliê")
+    (biblioteca / ".miniaturas" / "ab").mkdir(parents=True)
+    (biblioteca / ".miniaturas" / "ab" / "abc.jpg").write_bytes(b"miniatura")
+    (biblioteca / "Pinturas" / "0001_Mar" / "Fotos" / "frente.jpg").write_bytes(b"foto")
+
+    gerenciador = GerenciadorBackup(tmp_path / "Backups", retencao=3)
+    nome = gerenciador.criar_backup()
+
+    assert list(gerenciador._ler_manifesto(nome)["arquivos"]) == ["Pinturas/0001_Mar/Fotos/frente.jpg"]
+
+
+def test_restaurar_migra_o_banco_e_descarta_os_caches(banco, tmp_path):
+    pintura_id = adicionar_pintura("Mar", "Óleo", "30x40", "2020", "Ateliê")
+    gerenciador = GerenciadorBackup(tmp_path / "Backups", retencao=3)
+    nome = gerenciador.criar_backup()
+
+    # Backup feito por uma versão anterior do esquema
+    copia = sql.connect(str(tmp_path / "Backups" / nome / "Data.db"))
+    copia.execute("DROP TABLE arquivos_fotos")
+    copia.execute("PRAGMA user_version = 6")
+    copia.commit()
+    copia.close()
+
+    with gerenciador_conexoes.conexao() as conn:
+        conn.execute("UPDATE pinturas SET titulo = 'Rio'")
+        conn.commit()
+    assert indice_fotos.fotos(pintura_id) == []
+    assert indice_fotos.pasta(pintura_id) is not None
+
+    gerenciador.restaurar(nome)
+
+    assert buscar_pintura(pintura_id)[1] == "Mar"
+    assert indice_fotos.pasta(pintura_id) is None
+    with gerenciador_conexoes.conexao() as conn:
+        assert conn.execute("PRAGMA user_version").fetchone()[0] == VERSAO_ATUAL
+        assert conn.execute("SELECT COUNT(*) FROM arquivos_fotos").fetchone()[0] == 0
@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+"""Testes da busca textual"""
+
+import pytest
+
+from Funções import busca_texto
+from Funções.conexao import gerenciador_conexoes
+from Funções.crud_pint import adicionar_pintura, busca_filtros
+
+
+def test_primeira_busca_dentro_da_transacao_nao_confirma_nada(banco):
+    adicionar_pintura("Mar Azul", "Óleo", "30x40", "2020", "Ateliê")
+    busca_texto._indices_verificados.clear()
+
+    with pytest.raises(RuntimeError):
+        with gerenciador_conexoes.transacao():
+            adicionar_pintura("Mar Vermelho", "Óleo", "30x40", "2021", "Ateliê")
+            assert len(busca_filtros(titulo="mar")) == 2
+            raise RuntimeError("desfazer")
+
+    assert [p[1] for p in busca_filtros(titulo="mar")] == ["Mar Azul"]
+
+
+def test_indices_disponiveis_nao_recria_o_esquema(banco):
+    busca_texto._indices_verificados.clear()
+    with gerenciador_conexoes.conexao() as conn:
+        conn.execute("DROP TABLE busca_series")
+        assert busca_texto.indices_disponiveis(conn) is False
+        assert conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'busca_series'").fetchone() is None
+    busca_texto._indices_verificados.clear()
+
+
+def test_exposicoes_por_tema_e_artistas(banco):
+    from Funções.crud_exp import buscar_exposicoes_filtros
+
+    busca_texto._indices_verificados.clear()
+    with gerenciador_conexoes.conexao() as conn:
+        conn.executemany("INSERT INTO exposicoes (nome, tema, artistas) VALUES (?, ?, ?)", [
+            ("Salão de Outono", "Abstração geométrica", "Lygia Clark, Hélio Oiticica"),
+            ("Salão de Inverno", "Retratos", "Tarsila do Amaral"),
+        ])
+        conn.commit()
+
+    assert [e[1] for e in buscar_exposicoes_filtros(tema="abstr")] == ["Salão de Outono"]
+    assert [e[1] for e in buscar_exposicoes_filtros(artistas="helio")] == ["Salão de Outono"]
+    assert [e[1] for e in buscar_exposicoes_filtros(nome="salao", artistas="tarsila")] == ["Salão de Inverno"]
@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+"""Testes do pool de conexões"""
+
+import gc
+import os
+import sqlite3 as sql
+import threading
+
+import pytest
+
+from Funções.conexao import gerenciador_conexoes
+from Funções.crud_pint import adicionar_pintura, buscar_pintura, contar_pinturas
+
+
+def test_conexoes_de_threads_encerradas_sao_fechadas(banco):
+    pintura_id = adicionar_pintura("Mar", "Óleo", "30x40", "2020", "Ateliê")
+    antes = len(gerenciador_conexoes._conexoes)
+    encontradas = []
+
+    def buscar():
+        encontradas.append(buscar_pintura(pintura_id))
+
+    for _ in range(50):
+        thread = threading.Thread(target=buscar)
+        thread.start()
+        thread.join()
+    gc.collect()
+
+    assert len(encontradas) == 50 and all(encontradas)
+    assert len(gerenciador_conexoes._conexoes) == antes
+    assert gerenciador_conexoes.obter_estatisticas()["conexoes_abertas"] == antes
+
+
+def test_funcao_aninhada_nao_desfaz_escritas_de_quem_chamou(banco):
+    pintura_id = adicionar_pintura("Mar", "Óleo", "30x40", "2020", "Ateliê")
+
+    with gerenciador_conexoes.conexao() as conn:
+        conn.execute("UPDATE pinturas SET titulo = 'Rio' WHERE id = ?", (pintura_id,))
+        assert buscar_pintura(pintura_id)[1] == "Rio"
+        assert conn.in_transaction
+        conn.commit()
+
+    assert buscar_pintura(pintura_id)[1] == "Rio"
+
+
+def test_transacao_recusa_escritas_pendentes(banco):
+    pintura_id = adicionar_pintura("Mar", "Óleo", "30x40", "2020", "Ateliê")
+
+    with gerenciador_conexoes.conexao() as conn:
+        conn.execute("UPDATE pinturas SET titulo = 'Rio' WHERE id = ?", (pintura_id,))
+        with pytest.raises(sql.ProgrammingError):
+            with gerenciador_conexoes.transacao():
+                pass
+        assert conn.in_transaction
+        conn.commit()
+
+    assert buscar_pintura(pintura_id)[1] == "Rio"
+
+
+def test_caminhos_do_mesmo_banco_usam_a_mesma_conexao(banco, monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    with gerenciador_conexoes.transacao("Data.db") as conn:
+        adicionar_pintura("Mar", "Óleo", "30x40", "2020", "Ateliê")
+        assert gerenciador_conexoes.obter_conexao(os.path.join(".", "Data.db")) is conn
+        conn.rollback()
+
+    assert contar_pinturas() == 0
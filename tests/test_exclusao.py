@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+"""Testes da exclusão em cascata e da varredura de órfãos"""
+
+import os
+import sqlite3 as sql
+
+from Funções.conexao import gerenciador_conexoes
+from Funções.crud_locais import adicionar_local
+from Funções.crud_pint import adicionar_pintura
+from Funções.crud_precos import adicionar_preco
+from Funções.crud_series import adicionar_serie, associar_pinturas_series
+from Funções.exclusao import excluir_pinturas, varrer_orfaos
+from Funções.gerenciador_pastas import gerenciador_pastas
+
+
+def _pintura_completa(banco, titulo, serie_id):
+    pintura_id = adicionar_pintura(titulo, "Óleo", "30x40", "2020", "Ateliê")
+    adicionar_preco(pintura_id, 1000.0, "2020-01-01")
+    adicionar_preco(pintura_id, 1500.0, "2022-01-01")
+    adicionar_local(pintura_id, "Ateliê", "2020-01-01")
+    associar_pinturas_series(pintura_id, serie_id, db_path=banco)
+    pasta = gerenciador_pastas.obter_pasta_pintura(pintura_id)
+    with open(os.path.join(pasta, "Fotos", "frente.jpg"), "wb") as arquivo:
+        arquivo.write(b"x" * 100)
+    with gerenciador_conexoes.conexao() as conn:
+        conn.execute("INSERT INTO fotos (pintura_id, caminho) VALUES (?, ?)",
+                     (pintura_id, os.path.join(pasta, "Fotos", "frente.jpg")))
+        conn.commit()
+    return pintura_id, pasta
+
+
+def _contar(tabela):
+    with gerenciador_conexoes.conexao() as conn:
+        return conn.execute(f"SELECT COUNT(*) FROM {tabela}").fetchone()[0]
+
+
+def test_exclusao_em_cascata_conta_e_remove_dependentes(banco):
+    serie_id = adicionar_serie("Águas", db_path=banco)
+    mar, pasta_mar = _pintura_completa(banco, "Mar", serie_id)
+    rio, pasta_rio = _pintura_completa(banco, "Rio", serie_id)
+
+    relatorio = excluir_pinturas([mar, mar, 9999])
+
+    assert relatorio["pinturas"] == 1
+    assert (relatorio["fotos"], relatorio["precos"], relatorio["locais"]) == (1, 2, 1)
+    assert (relatorio["pintura_serie"], relatorio["pintura_exposicao"]) == (1, 0)
+    assert relatorio["pastas"] == 1 and relatorio["bytes"] == 100
+    assert not os.path.exists(pasta_mar) and os.path.isdir(pasta_rio)
+    for tabela, restantes in (("pinturas", 1), ("fotos", 1), ("precos", 2), ("locais", 1),
+                              ("pintura_serie", 1), ("pintura_atual", 1)):
+        assert _contar(tabela) == restantes, tabela
+
+
+def test_exclusao_dentro_de_transacao_deixa_a_pasta(banco):
+    serie_id = adicionar_serie("Águas", db_path=banco)
+    mar, pasta_mar = _pintura_completa(banco, "Mar", serie_id)
+
+    with gerenciador_conexoes.transacao():
+        assert excluir_pinturas(mar)["pastas"] == 0
+
+    assert _contar("pinturas") == 0 and os.path.isdir(pasta_mar)
+
+
+def test_varredura_remove_orfaos_e_preserva_ids_acima_do_autoincrement(banco):
+    serie_id = adicionar_serie("Águas", db_path=banco)
+    mar, pasta_mar = _pintura_completa(banco, "Mar", serie_id)
+    rio, pasta_rio = _pintura_completa(banco, "Rio", serie_id)
+    excluir_pinturas(mar, remover_pastas=False)
+
+    # Pasta de um id que este banco nunca usou (biblioteca de outro banco)
+    pasta_alheia = gerenciador_pastas.criar_pasta_pintura(rio + 50, "Outro Banco")
+    # Registros órfãos gravados sem chaves estrangeiras (bancos antigos)
+    direta = sql.connect(banco)
+    direta.execute("INSERT INTO precos (pintura_id, preco, data) VALUES (?, 10, '2020')", (rio + 10,))
+    direta.execute("INSERT INTO locais (pintura_id, local) VALUES (NULL, 'Depósito')")
+    direta.commit()
+    direta.close()
+
+    relatorio = varrer_orfaos(vacuum=False)
+
+    # pintura_atual recebeu uma linha de cada órfão pelos triggers
+    assert relatorio["linhas"] == {"precos": 1, "locais": 1, "pintura_atual": 2}
+    assert relatorio["pastas"] == 1 and relatorio["bytes_arquivos"] == 100
+    assert not os.path.exists(pasta_mar)
+    assert os.path.isdir(pasta_rio) and os.path.isdir(pasta_alheia)
+    assert _contar("precos") == 2 and _contar("locais") == 1
+
+
+def test_varredura_com_vacuum(banco):
+    relatorio = varrer_orfaos(arquivos=False)
+    assert relatorio["linhas"] == {} and relatorio["bytes_banco"] >= 0
@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+"""Testes do importador de pinturas"""
+
+import json
+
+from Funções.conexao import gerenciador_conexoes
+from Funções.importador import ImportadorPinturas
+
+
+def _arquivo(tmp_path, registros):
+    caminho = tmp_path / "inventario.jsonl"
+    caminho.write_text("\n".join(json.dumps(r) for r in registros), encoding="utf-8")
+    return caminho
+
+
+def test_preco_zero_e_importado(banco, tmp_path):
+    importador = ImportadorPinturas(banco, progresso=lambda relatorio: None)
+    relatorio = importador.importar(_arquivo(tmp_path, [{"titulo": "Mar", "preco": 0}]))
+
+    assert relatorio["importadas"] == 1 and not relatorio["erros"]
+    with gerenciador_conexoes.conexao(banco) as conn:
+        assert conn.execute("SELECT preco FROM precos").fetchall() == [(0.0,)]
+
+
+def test_lote_desfeito_nao_deixa_series_no_cache(banco, tmp_path, monkeypatch):
+    importador = ImportadorPinturas(banco, tamanho_lote=1, progresso=lambda relatorio: None)
+    original = ImportadorPinturas._ids_por_nome
+    falhar = [True]
+
+    def ids_por_nome(self, cursor, tabela, cache, nomes):
+        novos = original(self, cursor, tabela, cache, nomes)
+        if tabela == "exposicoes" and falhar:
+            falhar.clear()
+            raise RuntimeError("falha no lote")
+        return novos
+
+    monkeypatch.setattr(ImportadorPinturas, "_ids_por_nome", ids_por_nome)
+    relatorio = importador.importar(_arquivo(tmp_path, [
+        {"titulo": "Mar", "series": "Águas", "exposicoes": "Salão"},
+        {"titulo": "Rio", "series": "Águas"},
+    ]))
+
+    assert relatorio["importadas"] == 1 and [linha for linha, _ in relatorio["erros"]] == [1]
+    with gerenciador_conexoes.conexao(banco) as conn:
+        assert conn.execute("""
+            SELECT p.titulo, s.nome FROM pintura_serie ps
+            JOIN pinturas p ON p.id = ps.pintura_id
+            JOIN series s ON s.id = ps.serie_id
+        """).fetchall() == [("Rio", "Águas")]
+
+
+def test_serie_com_maiuscula_acentuada_nao_e_duplicada(banco, tmp_path):
+    with gerenciador_conexoes.conexao(banco) as conn:
+        conn.execute("INSERT INTO series (nome) VALUES ('Água Viva')")
+        conn.commit()
+    importador = ImportadorPinturas(banco, progresso=lambda relatorio: None)
+    relatorio = importador.importar(_arquivo(tmp_path, [
+        {"titulo": "Mar", "series": "Água Viva"},
+        {"titulo": "Rio", "series": "água viva"},
+    ]))
+
+    assert relatorio["importadas"] == 2 and not relatorio["erros"]
+    with gerenciador_conexoes.conexao(banco) as conn:
+        assert conn.execute("SELECT id, nome FROM series").fetchall() == [(1, "Água Viva")]
+        assert conn.execute("SELECT DISTINCT serie_id FROM pintura_serie").fetchall() == [(1,)]
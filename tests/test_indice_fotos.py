@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+"""Testes do índice das pastas de fotos"""
+
+import os
+
+from Funções.conexao import gerenciador_conexoes
+from Funções.crud_pint import adicionar_pintura
+from Funções.gerenciador_pastas import gerenciador_pastas
+from Funções.indice_fotos import IndiceFotos, indice_fotos
+
+
+def _criar(pasta, nome):
+    with open(os.path.join(pasta, nome), "wb") as arquivo:
+        arquivo.write(b"imagem")
+
+
+def _cadastradas(pintura_id):
+    with gerenciador_conexoes.conexao() as conn:
+        return sorted(os.path.basename(linha[0]) for linha in conn.execute(
+            "SELECT caminho FROM fotos WHERE pintura_id = ?", (pintura_id,)))
+
+
+def _pintura():
+    pintura_id = adicionar_pintura("Mar", "Óleo", "30x40", "2020", "Ateliê")
+    return pintura_id, os.path.join(gerenciador_pastas.obter_pasta_pintura(pintura_id), "Fotos")
+
+
+def test_fotos_colocadas_e_apagadas_a_mao(banco):
+    pintura_id, pasta = _pintura()
+    _criar(pasta, "frente.jpg")
+    _criar(pasta, "notas.txt")
+
+    assert indice_fotos.fotos(pintura_id) == ["frente.jpg"]
+    assert _cadastradas(pintura_id) == ["frente.jpg"]
+
+    _criar(pasta, "verso.png")
+    os.remove(os.path.join(pasta, "frente.jpg"))
+
+    assert indice_fotos.fotos(pintura_id) == ["verso.png"]
+    assert _cadastradas(pintura_id) == ["verso.png"]
+    assert indice_fotos.existe(pintura_id, os.path.join(pasta, "verso.png"))
+    assert not indice_fotos.existe(pintura_id, os.path.join(pasta, "frente.jpg"))
+
+
+def test_foto_descadastrada_pelo_usuario_nao_volta(banco):
+    pintura_id, pasta = _pintura()
+    _criar(pasta, "frente.jpg")
+    indice_fotos.fotos(pintura_id)
+
+    with gerenciador_conexoes.conexao() as conn:
+        conn.execute("DELETE FROM fotos WHERE pintura_id = ?", (pintura_id,))
+        conn.commit()
+    _criar(pasta, "verso.jpg")
+
+    assert indice_fotos.fotos(pintura_id) == ["frente.jpg", "verso.jpg"]
+    assert _cadastradas(pintura_id) == ["verso.jpg"]
+
+
+def test_pasta_sem_mudancas_e_lida_do_banco(banco):
+    pintura_id, pasta = _pintura()
+    _criar(pasta, "frente.jpg")
+    indice_fotos.fotos(pintura_id)
+
+    # Outro processo (ou o próximo início do aplicativo): índice em memória vazio
+    novo = IndiceFotos()
+    assert novo.fotos(pintura_id) == ["frente.jpg"]
+    assert (novo.leituras_banco, novo.leituras_disco) == (1, 0)
+    assert _cadastradas(pintura_id) == ["frente.jpg"]
+
+
+def test_pasta_de_pintura_inexistente_no_banco(banco):
+    pasta = os.path.join(gerenciador_pastas.criar_pasta_pintura(77, "Sem Cadastro"), "Fotos")
+    _criar(pasta, "frente.jpg")
+
+    assert indice_fotos.fotos(77) == ["frente.jpg"]
+    assert _cadastradas(77) == []
@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+"""Testes do índice de locais"""
+
+import random
+import threading
+from datetime import date
+
+from Funções.crud_locais import adicionar_local
+from Funções.crud_pint import adicionar_pintura
+from Funções.indice_locais import IndiceIntervalos, IndiceLocais, carregar_indice
+
+
+def _em_outra_thread(funcao):
+    resultado = []
+    thread = threading.Thread(target=lambda: resultado.append(funcao()))
+    thread.start()
+    thread.join()
+    return resultado[0]
+
+
+def test_commit_de_uma_thread_invalida_o_indice_de_outra(banco):
+    pintura_id = adicionar_pintura("Mar", "Óleo", "30x40", "2020", "Ateliê")
+    adicionar_local(pintura_id, "Ateliê", "2020-01-01", "2021-01-01")
+
+    assert len(_em_outra_thread(carregar_indice).registros) == 1
+    adicionar_local(pintura_id, "Galeria", "2021-01-01")
+    assert len(_em_outra_thread(carregar_indice).registros) == 2
+    assert len(carregar_indice().registros) == 2
+
+
+def _intervalos_aleatorios(aleatorio, quantidade, limite):
+    intervalos = []
+    for registro in range(quantidade):
+        inicio = aleatorio.randrange(limite)
+        # Muitos curtos, alguns longos e pontas repetidas
+        fim = inicio + aleatorio.choice((1, 1, 2, 5, aleatorio.randrange(1, limite)))
+        intervalos.append((inicio, fim, registro))
+    return intervalos
+
+
+def test_arvore_confere_com_forca_bruta():
+    aleatorio = random.Random(2024)
+    for quantidade in (0, 1, 2, 7, 50, 400):
+        intervalos = _intervalos_aleatorios(aleatorio, quantidade, 200)
+        arvore = IndiceIntervalos(intervalos)
+
+        for ponto in range(-2, 410):
+            esperado = sorted(r for inicio, fim, r in intervalos if inicio <= ponto < fim)
+            assert sorted(arvore.em(ponto)) == esperado, (quantidade, ponto)
+
+        for _ in range(300):
+            inicio = aleatorio.randrange(-5, 410)
+            fim = inicio + aleatorio.randrange(1, 60)
+            esperado = sorted(r for i_inicio, i_fim, r in intervalos if i_inicio < fim and inicio < i_fim)
+            assert sorted(arvore.sobrepostos(inicio, fim)) == esperado, (quantidade, inicio, fim)
+
+
+def test_indice_locais_confere_com_forca_bruta():
+    aleatorio = random.Random(7)
+    base = date(2000, 1, 1).toordinal()
+    locais = ("Ateliê", "Galeria Central", "Galeria Norte", "Depósito")
+    linhas = []
+    for local_id, (inicio, fim, _) in enumerate(_intervalos_aleatorios(aleatorio, 300, 3000), start=1):
+        saida = None if aleatorio.random() < 0.2 else date.fromordinal(base + fim).isoformat()
+        linhas.append((local_id, aleatorio.randrange(1, 40), aleatorio.choice(locais),
+                       date.fromordinal(base + inicio).isoformat(), saida))
+    indice = IndiceLocais(linhas)
+
+    def periodo(linha):
+        inicio = date.fromisoformat(linha[3]).toordinal()
+        fim = date.fromisoformat(linha[4]).toordinal() if linha[4] else date.max.toordinal() + 1
+        return inicio, max(fim, inicio + 1)
+
+    for _ in range(200):
+        dia = date.fromordinal(base + aleatorio.randrange(-10, 3200))
+        esperado = {}
+        for linha in linhas:
+            inicio, fim = periodo(linha)
+            atual = esperado.get(linha[1])
+            if inicio <= dia.toordinal() < fim and (atual is None or (linha[3], linha[0]) > (atual[3], atual[0])):
+                esperado[linha[1]] = linha
+        assert indice.onde_estava(dia) == esperado
+
+        local = aleatorio.choice(locais + ("galeria",))
+        de = date.fromordinal(base + aleatorio.randrange(3000))
+        ate = date.fromordinal(de.toordinal() + aleatorio.randrange(400))
+        esperado = sorted(
+            linha[0] for linha in linhas
+            if local.lower() in linha[2].lower()
+            and periodo(linha)[0] <= ate.toordinal() and de.toordinal() < periodo(linha)[1]
+        )
+        assert sorted(r[0] for r in indice.sobrepostos(local, de, ate)) == esperado